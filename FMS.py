@@ -3,6 +3,22 @@
 import re
 # We will use datetime to set real date and times in the program, as is required.
 import datetime
+# Used by the memory-mapped shipment file.
+import os
+import mmap
+import zlib
+import struct
+import argparse
+import sys
+import time
+import itertools
+import bisect
+# NumPy is optional: when it is installed, status codes of many shipments
+# are computed at once instead of one character at a time.
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 # Define menu options as tuples because data is immutable
@@ -11,94 +27,665 @@ fleet_menu = ("add vehicle", "update vehicle information", "remove a vehicle", "
 shipment_menu = ("create a new shipment", "track a shipment", "view all shipments", "quit shipment management")
 delivery_menu = ("record delivery for a shipment", "view delivery status for a shipment", "quit delivery management")
 
-# Global lists to store data (in a real application, these would be in a database).
-# Critical for each app section.
-origins_list = [
-    "123 Main St, Seattle, Wa",
-    "456 Oak Ave, Portland, Or",
-    "789 Pine Blvd, San Francisco, Ca"
-]
 
-destinations_list = [
-    "321 Elm St, Miami, Fl",
-    "654 Maple Rd, Austin, Tx",
-    "987 Cedar Ln, Denver, Co"
-]
+# === Validation Rules ===
+# Patterns of the user inputs, compiled once when the program starts and
+# shared by every function that checks an input.
 
-weights_list = [
-    "25.5",
-    "12",
-    "67.8"
-]
+# Street and number and suburb of at least 3 characters, and a zipcode of 4 to
+# 10 characters as is a conventional standard worldwide
+ADDRESS_PATTERN = re.compile(r'^([a-zA-Z0-9][a-zA-Z0-9\s\-]{2,}),'
+                             r'\s*([a-zA-Z][a-zA-Z\s-]{2,}),\s*([a-zA-Z0-9]{4,10})$')
+# Digits, and . followed by more digits if it's a float
+WEIGHT_PATTERN = re.compile(r'^\d+(\.\d+)?$')
+# Starts with V and is 7 characters long
+VEHICLE_CODE_PATTERN = re.compile(r'^[Vv][A-Za-z0-9]{6}$')
+# Letters and spaces only
+VEHICLE_TYPE_PATTERN = re.compile(r'^[A-Za-z\s]+$')
 
-# Main vehicle ID list (this is the one you already have)
-vehicles_list = ["VTRUCK1", "VCAR123", "V2TRUCK"]
 
-# Additional lists to store vehicle details
-vehicle_types = ["Truck", "Car", "Truck"]
-vehicle_capacities = ["5000", "500", "3500"]
-vehicle_availability = [True, False, True]
+def is_address(value):
+    return ADDRESS_PATTERN.match(value.lower()) is not None
 
-shipment_ids_list = [
-    "A00000123456789",
-    "A00000987654321",
-    "A00000555666777"
-]
 
-vehicles_selected = [
-    "VTRUCK1",
-    "VCAR123",
-    "V2TRUCK"
-]
+def is_weight(value):
+    value = value.strip()
+    return WEIGHT_PATTERN.match(value) is not None and float(value) > 0
+
+
+def is_vehicle_code(value):
+    return VEHICLE_CODE_PATTERN.match(value.strip()) is not None
+
+
+def is_vehicle_type(value):
+    return VEHICLE_TYPE_PATTERN.match(value.strip()) is not None
+
+
+def is_capacity(value):
+    value = value.strip()
+    return value.isdecimal() and int(value) > 0
+
+
+# Rule name -> function telling whether a value (a string) is valid
+VALIDATION_RULES = {
+    "address": is_address,
+    "weight": is_weight,
+    "vehicle_code": is_vehicle_code,
+    "vehicle_type": is_vehicle_type,
+    "capacity": is_capacity,
+}
 
-# New lists for delivery management
-delivery_status = [
-    "pending",
-    "pending",
-    "pending"
-]
 
-# Initialize existing example delivery datetimes with fixed dates
-delivery_datetime = [
-    "2025-01-15 10:30:45",
-    "2025-01-16 14:22:10",
-    "2025-01-18 09:15:30"
+def is_valid(rule, value):
+    """Tell whether one value passes a validation rule."""
+    return VALIDATION_RULES[rule](value)
+
+
+def valid_mask(rule, values):
+    """
+    Check a whole list of values with a validation rule at once.
+    Returns a list with True for each valid value and False for the others.
+    """
+    return list(map(VALIDATION_RULES[rule], values))
+
+
+# === Addresses ===
+# Every valid address is parsed once, the first time it is typed. addresses
+# maps its text (in title case) to the one copy of that text kept by every
+# shipment going to or from there, and to its street, suburb and zipcode.
+# Suburbs and zipcodes are interned so the addresses of a suburb share them,
+# and shipments can be found by suburb or zipcode without parsing again.
+addresses = {}  # Address text -> (text, street, suburb, zipcode)
+
+
+def address_entry(location):
+    """Return (text, street, suburb, zipcode) of an address, or None if it is not valid."""
+    text = location.title()
+    entry = addresses.get(text)
+    if entry is None:
+        match = ADDRESS_PATTERN.match(text.lower())
+        if not match:
+            return None
+        street, suburb, zipcode = match.groups()
+        entry = addresses[text] = (text, street.title(), sys.intern(suburb.strip().title()),
+                                   sys.intern(zipcode.upper()))
+    return entry
+
+
+# Shipment statuses chosen by the status code (sum of the ID characters % 3)
+STATUS_NAMES = ("Processing", "In Transit", "Out for Delivery")
+STATUS_MESSAGES = ("Your shipment is being processed", "Your shipment is in transit",
+                   "Your shipment is out for delivery")
+
+
+def status_codes(shipment_ids):
+    """
+    Return the status code of every shipment ID in the list, computed in one go.
+    With NumPy the IDs are packed into a fixed-width byte array and the
+    characters of all of them are added up at once; small lists and IDs
+    that are not plain ASCII use the per-ID loop.
+    """
+    if np is not None and len(shipment_ids) >= 64:
+        try:
+            ids = np.array(shipment_ids, dtype=bytes)  # Padded with zero bytes
+        except UnicodeEncodeError:
+            pass
+        else:
+            sums = ids.view(np.uint8).reshape(len(ids), ids.itemsize).sum(axis=1, dtype=np.int64)
+            return (sums % len(STATUS_NAMES)).tolist()
+    return [sum(map(ord, shipment_id)) % len(STATUS_NAMES) for shipment_id in shipment_ids]
+
+
+class RecordTable:
+    """
+    Table of records stored column by column (one list per field), like the
+    parallel lists the program used before, plus a hash index from the key of
+    each record to its row number (slot).
+    Finding a record by key is O(1) instead of scanning a list, and a record is
+    removed by moving the last row into its slot (swap-remove), also O(1).
+    Columns listed in counted keep a count of rows per value so questions like
+    "is this vehicle assigned to any shipment?" do not need a scan either.
+    """
+
+    def __init__(self, key, columns, rows=(), counted=()):
+        self.key = key
+        self.columns = {name: [] for name in columns}
+        self._slots = {}  # Key -> row number
+        self._counts = {name: {} for name in counted}  # Column -> value -> rows
+        for row in rows:
+            self.add(dict(zip(columns, row)))
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def add(self, record):
+        """Add a record (a dictionary with a value for every column)."""
+        key = record[self.key]
+        if key in self._slots:
+            raise KeyError(f"{key} already exists")
+        self._slots[key] = len(self._slots)
+        for name, values in self.columns.items():
+            values.append(record[name])
+        for name, counts in self._counts.items():
+            value = record[name]
+            counts[value] = counts.get(value, 0) + 1
+
+    def get(self, key, column):
+        """Return one field of the record with the given key."""
+        return self.columns[column][self._slots[key]]
+
+    def get_record(self, key):
+        """Return the whole record with the given key as a dictionary."""
+        slot = self._slots[key]
+        return {name: values[slot] for name, values in self.columns.items()}
+
+    def set(self, key, column, value):
+        """Change one field of the record with the given key."""
+        slot = self._slots[key]
+        values = self.columns[column]
+        counts = self._counts.get(column)
+        if counts is not None:
+            self._discount(counts, values[slot])
+            counts[value] = counts.get(value, 0) + 1
+        values[slot] = value
+
+    def remove(self, key):
+        """Remove a record by moving the last row into its slot."""
+        slot = self._slots.pop(key)
+        for name, counts in self._counts.items():
+            self._discount(counts, self.columns[name][slot])
+        last = len(self._slots)
+        for values in self.columns.values():
+            if slot != last:
+                values[slot] = values[last]
+            values.pop()
+        if slot != last:
+            self._slots[self.columns[self.key][slot]] = slot
+
+    def count(self, column, value):
+        """Return how many records have the value in a counted column."""
+        return self._counts[column].get(value, 0)
+
+    def column(self, name):
+        """Return the list with every value of a column, in row order."""
+        return self.columns[name]
+
+    def records(self):
+        """Yield every record as a dictionary, in row order."""
+        names = list(self.columns)
+        for row in zip(*self.columns.values()):
+            yield dict(zip(names, row))
+
+    @staticmethod
+    def _discount(counts, value):
+        if counts[value] == 1:
+            del counts[value]
+        else:
+            counts[value] -= 1
+
+
+class MmapShipmentTable:
+    """
+    Shipment table kept in a fixed-width binary file that is memory-mapped,
+    with a sidecar hash index file (path + ".idx") from shipment ID to record.
+    Nothing is loaded into Python lists: opening the file is immediate and
+    tracking or listing works on histories of millions of shipments.
+    It offers the same methods as the in-memory shipments RecordTable.
+    """
+
+    # Record layout: ID, status flag, vehicle code, datetime, weight, origin, destination
+    # (the status flag keeps the delivery status in bit 0 and the status code above it)
+    RECORD = struct.Struct("<15sB7s19s22s96s96s")  # 256 bytes per shipment
+    HEADER = struct.Struct("<8sQQ")  # Magic, number of records, capacity
+    INDEX_HEADER = struct.Struct("<8sQQ")  # Magic, number of slots, used slots
+    SLOT = struct.Struct("<Q")  # Record number + 1 (0 means an empty slot)
+    MAGIC = b"FMSSHIP2"
+    OLD_MAGIC = b"FMSSHIP1"  # Files written before the status code was stored
+    INDEX_MAGIC = b"FMSIDX01"
+    # Records read back also carry their "status_code"
+    COLUMNS = ("id", "status", "vehicle", "datetime", "weight", "origin", "destination")
+    STATUSES = ("pending", "delivered")
+
+    def __init__(self, path, initial_capacity=1024):
+        self.path = path
+        self.index_path = path + ".idx"
+        new_file = not os.path.exists(path)
+        self._file = open(path, "w+b" if new_file else "r+b")
+        if new_file:
+            self._file.write(self.HEADER.pack(self.MAGIC, 0, initial_capacity))
+            self._file.truncate(self.HEADER.size + initial_capacity * self.RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self._count, self._capacity = self.HEADER.unpack_from(self._map, 0)
+        if magic == self.OLD_MAGIC:
+            self._store_status_codes()
+        elif magic != self.MAGIC:
+            raise ValueError(f"{path} is not a shipment file")
+        self._vehicle_counts = None  # Built the first time count() is called
+        self._open_index()
+
+    # --- Index file ---
+
+    def _open_index(self):
+        if not os.path.exists(self.index_path):
+            self._build_index(max(1024, self._count * 2))
+            return
+        self._index_file = open(self.index_path, "r+b")
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        magic, self._slots, self._used = self.INDEX_HEADER.unpack_from(self._index, 0)
+        if magic != self.INDEX_MAGIC or self._used != self._count:
+            # The index was not saved together with the records, rebuild it
+            self._index.close()
+            self._index_file.close()
+            self._build_index(max(1024, self._count * 2))
+
+    def _build_index(self, slots):
+        """Create an index with the given number of slots (a power of two) for every record."""
+        slots = 1 << (slots - 1).bit_length()
+        if getattr(self, "_index", None) is not None and not self._index.closed:
+            self._index.close()
+            self._index_file.close()
+        self._index_file = open(self.index_path, "w+b")
+        self._index_file.truncate(self.INDEX_HEADER.size + slots * self.SLOT.size)
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        self._slots = slots
+        self._used = 0
+        for record_number in range(self._count):
+            slot, _ = self._probe(self._read_id(record_number))
+            self._set_slot(slot, record_number)
+        self._write_index_header()
+
+    def _write_index_header(self):
+        self.INDEX_HEADER.pack_into(self._index, 0, self.INDEX_MAGIC, self._slots, self._used)
+
+    def _set_slot(self, slot, record_number):
+        self.SLOT.pack_into(self._index, self.INDEX_HEADER.size + slot * self.SLOT.size,
+                            record_number + 1)
+        self._used += 1
+
+    def _probe(self, key):
+        """Return (slot, record number) for a key, record number is None if absent."""
+        mask = self._slots - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            value, = self.SLOT.unpack_from(self._index, self.INDEX_HEADER.size + slot * self.SLOT.size)
+            if value == 0:
+                return slot, None
+            if self._read_id(value - 1) == key:
+                return slot, value - 1
+            slot = (slot + 1) & mask
+
+    def _record_number(self, key):
+        encoded = key.encode("utf-8")
+        if len(encoded) != 15:
+            return None
+        return self._probe(encoded)[1]
+
+    # --- Records file ---
+
+    def _offset(self, record_number):
+        return self.HEADER.size + record_number * self.RECORD.size
+
+    def _read_id(self, record_number):
+        # The ID sits at the start of the record
+        offset = self._offset(record_number)
+        return self._map[offset:offset + 15]
+
+    def _read(self, record_number):
+        values = self.RECORD.unpack_from(self._map, self._offset(record_number))
+        record = {}
+        for name, value in zip(self.COLUMNS, values):
+            if name == "status":
+                record[name] = self.STATUSES[value & 1]
+                record["status_code"] = value >> 1
+            else:
+                record[name] = value.rstrip(b"\0").decode("utf-8")
+        return record
+
+    def _pack(self, record):
+        values = []
+        for name, size in zip(self.COLUMNS, (15, None, 7, 19, 22, 96, 96)):
+            if name == "status":
+                status_code = record.get("status_code")
+                if status_code is None:
+                    status_code = status_codes([record["id"]])[0]
+                values.append(self.STATUSES.index(record[name]) | status_code << 1)
+                continue
+            encoded = str(record[name]).encode("utf-8")
+            if len(encoded) > size:
+                raise ValueError(f"The {name} is too long (maximum {size} characters)")
+            values.append(encoded)
+        return self.RECORD.pack(*values)
+
+    def _store_status_codes(self, chunk_size=65536):
+        """Add the status code to the flag of every record of an old file."""
+        for start in range(0, self._count, chunk_size):
+            numbers = range(start, min(start + chunk_size, self._count))
+            codes = status_codes([self._read_id(number).decode("utf-8") for number in numbers])
+            for number, code in zip(numbers, codes):
+                offset = self._offset(number) + 15  # The flag follows the 15-byte ID
+                self._map[offset] = self._map[offset] & 1 | code << 1
+        self.HEADER.pack_into(self._map, 0, self.MAGIC, self._count, self._capacity)
+
+    def _grow(self):
+        self._capacity *= 2
+        self._map.close()
+        self._file.truncate(self._offset(self._capacity))
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    # --- Table methods ---
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return self._record_number(key) is not None
+
+    def add(self, record):
+        """Append a shipment record (a dictionary with a value for every column)."""
+        packed = self._pack(record)
+        key = packed[:15]
+        slot, existing = self._probe(key)
+        if existing is not None:
+            raise KeyError(f"{record['id']} already exists")
+        if self._count == self._capacity:
+            self._grow()
+        self._map[self._offset(self._count):self._offset(self._count + 1)] = packed
+        self._set_slot(slot, self._count)
+        self._count += 1
+        self.HEADER.pack_into(self._map, 0, self.MAGIC, self._count, self._capacity)
+        self._write_index_header()
+        if self._vehicle_counts is not None:
+            vehicle = record["vehicle"]
+            self._vehicle_counts[vehicle] = self._vehicle_counts.get(vehicle, 0) + 1
+        # Keep the index at most half full so probes stay short
+        if self._used * 2 > self._slots:
+            self._build_index(self._slots * 2)
+
+    def get(self, key, column):
+        """Return one field of the shipment with the given ID."""
+        return self.get_record(key)[column]
+
+    def get_record(self, key):
+        """Return the shipment with the given ID as a dictionary."""
+        record_number = self._record_number(key)
+        if record_number is None:
+            raise KeyError(key)
+        return self._read(record_number)
+
+    def set(self, key, column, value):
+        """Change one field of the shipment with the given ID."""
+        record_number = self._record_number(key)
+        if record_number is None:
+            raise KeyError(key)
+        record = self._read(record_number)
+        if column == "vehicle" and self._vehicle_counts is not None:
+            RecordTable._discount(self._vehicle_counts, record["vehicle"])
+            self._vehicle_counts[value] = self._vehicle_counts.get(value, 0) + 1
+        record[column] = value
+        offset = self._offset(record_number)
+        self._map[offset:offset + self.RECORD.size] = self._pack(record)
+
+    def count(self, column, value):
+        """Return how many shipments have the value in the vehicle column."""
+        if column != "vehicle":
+            raise KeyError(column)
+        if self._vehicle_counts is None:
+            self._vehicle_counts = {}
+            for record in self.records():
+                vehicle = record["vehicle"]
+                self._vehicle_counts[vehicle] = self._vehicle_counts.get(vehicle, 0) + 1
+        return self._vehicle_counts.get(value, 0)
+
+    def records(self):
+        """Yield every shipment as a dictionary, in the order they were added."""
+        for record_number in range(self._count):
+            yield self._read(record_number)
+
+    def close(self):
+        """Write everything to disk and close both files."""
+        for mapped, file in ((self._map, self._file), (self._index, self._index_file)):
+            mapped.flush()
+            mapped.close()
+            file.close()
+
+
+class CapacityLedger:
+    """
+    Load carried by every vehicle (the weight of its shipments not delivered
+    yet) and the room left on the available vehicles.
+    The available vehicles with room are kept in a list sorted by that room,
+    so the vehicles that can still take a weight are found with a binary
+    search (bisect) instead of a scan of the fleet.
+    full holds the vehicles made unavailable because they had no room left,
+    the only ones made available again when a delivery frees room on them.
+    """
+
+    def __init__(self):
+        self.loads = {}  # Vehicle code -> kg carried
+        self.rooms = {}  # Vehicle code -> kg left, available vehicles only
+        self.full = set()
+        self._entries = []  # (kg left, vehicle code), sorted
+
+    def load(self, code):
+        """Return the weight a vehicle carries."""
+        return self.loads.get(code, 0)
+
+    def add(self, code, weight):
+        """Add weight to the load of a vehicle (a negative weight takes it off)."""
+        # Rounded so loads go back to exactly 0 after float additions and subtractions
+        load = round(self.loads.get(code, 0) + weight, 6)
+        if load > 0:
+            self.loads[code] = load
+        else:
+            self.loads.pop(code, None)
+
+    def set_room(self, code, room):
+        """Change the room an available vehicle has left (0 takes it out of the list)."""
+        previous = self.rooms.pop(code, None)
+        if previous is not None:
+            del self._entries[bisect.bisect_left(self._entries, (previous, code))]
+        if room > 0:
+            self.rooms[code] = room
+            bisect.insort(self._entries, (room, code))
+
+    def forget(self, code):
+        """Drop a removed vehicle."""
+        self.loads.pop(code, None)
+        self.full.discard(code)
+        self.set_room(code, 0)
+
+    def fitting(self, weight):
+        """Return the codes of the available vehicles that can still take weight, fullest first."""
+        index = bisect.bisect_left(self._entries, (weight,))
+        return [code for _, code in self._entries[index:]]
+
+
+def use_shipment_file(path):
+    """
+    Keep the shipments in a memory-mapped file instead of memory.
+    A new file starts with the shipments currently in the table.
+    """
+    global shipments
+    new_file = not os.path.exists(path)
+    table = MmapShipmentTable(path)
+    if new_file:
+        for record in shipments.records():
+            table.add(record)
+    shipments = table
+    build_capacity_ledger()
+
+
+# Tables to store data (in a real application, these would be in a database).
+# Critical for each app section.
+sample_shipments = [
+    ("A00000123456789", "123 Main St, Seattle, Wa", "321 Elm St, Miami, Fl",
+     "25.5", "VTRUCK1", "pending", "2025-01-15 10:30:45"),
+    ("A00000987654321", "456 Oak Ave, Portland, Or", "654 Maple Rd, Austin, Tx",
+     "12", "VCAR123", "pending", "2025-01-16 14:22:10"),
+    ("A00000555666777", "789 Pine Blvd, San Francisco, Ca", "987 Cedar Ln, Denver, Co",
+     "67.8", "V2TRUCK", "pending", "2025-01-18 09:15:30"),
 ]
 
+# The status code of each shipment is worked out once, when it is created
+shipments = RecordTable(
+    "id",
+    ("id", "origin", "destination", "weight", "vehicle", "status", "datetime", "status_code"),
+    rows=[row + (code,) for row, code in
+          zip(sample_shipments, status_codes([row[0] for row in sample_shipments]))],
+    # Used to know if a vehicle is assigned to any shipment
+    counted=("vehicle",)
+)
+
+vehicles = RecordTable(
+    "code",
+    ("code", "type", "capacity", "available"),
+    rows=[
+        ("VTRUCK1", "Truck", "5000", True),
+        ("VCAR123", "Car", "500", False),
+        ("V2TRUCK", "Truck", "3500", True),
+    ]
+)
+
+capacity_ledger = CapacityLedger()
+
+
+def refresh_vehicle(code):
+    """
+    Update the room a vehicle has left in the capacity ledger, after its
+    load or capacity changed. A vehicle with no room left is made
+    unavailable, and made available again once it has room.
+    """
+    room = int(vehicles.get(code, "capacity")) - capacity_ledger.load(code)
+    available = vehicles.get(code, "available")
+    if available and room <= 0:
+        vehicles.set(code, "available", False)
+        capacity_ledger.full.add(code)
+        available = False
+    elif not available and room > 0 and code in capacity_ledger.full:
+        vehicles.set(code, "available", True)
+        capacity_ledger.full.discard(code)
+        available = True
+    capacity_ledger.set_room(code, room if available else 0)
+
+
+def load_vehicle(code, weight):
+    """Add weight to the load of a vehicle (a negative weight takes it off)."""
+    capacity_ledger.add(code, weight)
+    if code in vehicles:
+        refresh_vehicle(code)
+
+
+def build_capacity_ledger():
+    """Work out the load of every vehicle from the shipments not delivered yet."""
+    global capacity_ledger
+    capacity_ledger = CapacityLedger()
+    for record in shipments.records():
+        if record["status"] != "delivered" and record["vehicle"]:
+            capacity_ledger.add(record["vehicle"], float(record["weight"]))
+    for code in vehicles.column("code"):
+        refresh_vehicle(code)
+
+
+build_capacity_ledger()
+
+
+# === Scripted Mode ===
+# With --script the answers are read from a file (or stdin) instead of the
+# keyboard, one per line in the order the menus ask for them; an empty line is
+# pressing Enter and lines starting with # are comments. Menus, prompts and
+# "Press Enter" pauses are not shown, and the time every menu option took is
+# reported when the script ends.
+script = None  # Lines of the script in scripted mode
+command_times = {}  # "Menu > option" -> seconds of each run, in scripted mode
+
+
+def read_input(prompt=""):
+    """Return the next answer: typed after the prompt, or the next line of the script."""
+    if script is None:
+        return input(prompt)
+    for line in script:
+        if not line.startswith("#"):
+            return line.rstrip("\r\n")
+    raise EOFError("end of the script")
+
+
+def pause(prompt="Press Enter to continue..."):
+    """Wait for Enter, except in scripted mode."""
+    if script is None:
+        input(prompt)
+
+
+def run_command(menu, name, function):
+    """Run a menu option and return its result, timing it in scripted mode."""
+    if script is None:
+        return function()
+    start = time.perf_counter()
+    try:
+        return function()
+    finally:
+        command_times.setdefault(f"{menu} > {name.title()}", []).append(time.perf_counter() - start)
+
+
+def timing_report():
+    """Return a table of the time taken by each menu option run in scripted mode."""
+    lines = [f"{'Command':<55} {'Runs':>6} {'Total ms':>10} {'Mean ms':>9} {'Max ms':>9}",
+             "=" * 93]
+    for name, seconds in sorted(command_times.items(), key=lambda item: -sum(item[1])):
+        total = sum(seconds) * 1000
+        lines.append(f"{name:<55} {len(seconds):>6} {total:>10.2f} "
+                     f"{total / len(seconds):>9.3f} {max(seconds) * 1000:>9.3f}")
+    return "\n".join(lines) + "\n"
+
+
+def menu_actions(names, functions):
+    """
+    Map the number and the name of every option of a menu to (name, function),
+    so a choice is found with one dictionary lookup.
+    The last option (and "q") quits the menu: its function is None.
+    """
+    actions = {}
+    for number, (name, function) in enumerate(zip(names, functions + (None,)), start=1):
+        actions[str(number)] = actions[name] = (name, function)
+    actions["q"] = actions[names[-1]]
+    return actions
+
 
 # General structure of the program that defines how the menus are displayed and executed.
+# The options of each menu are looked up in its *_ACTIONS dictionary, built
+# at the end of the file once every function is defined.
 
 def main():
     """
     Main function that runs the program and displays the main menu.
     """
     while True:
-        # Display main menu
-        print("Welcome!!!\n"
-              "FMS is a software that helps you to manage "
-              "your shipments and deliveries.\n")
-        print(" FMS ".center(70, "="))
-        print("")
-        # The first variable stores the index and add 1 to create a list feeling
-        # The second variable iterates the tuple
-        for i, m in enumerate(main_menu):
-            print(f"{i + 1}.- {m.title()}")
+        if script is None:
+            # Display main menu
+            print("Welcome!!!\n"
+                  "FMS is a software that helps you to manage "
+                  "your shipments and deliveries.\n")
+            print(" FMS ".center(70, "="))
+            print("")
+            # The first variable stores the index and add 1 to create a list feeling
+            # The second variable iterates the tuple
+            for i, m in enumerate(main_menu):
+                print(f"{i + 1}.- {m.title()}")
 
         # Get user input
-        choice = input("\nPlease select an option (1-4 or type the menu name): ").strip()
+        choice = read_input("\nPlease select an option (1-4 or type the menu name): ").strip()
 
         # Validate and process user input
-        if choice == "1" or choice.lower() == "fleet management":
-            fleet_management_menu()
-        elif choice == "2" or choice.lower() == "shipment management":
-            shipment_management_menu()
-        elif choice == "3" or choice.lower() == "delivery management":
-            delivery_management_menu()
-        elif choice == "4" or choice.lower() == "quit application" or choice.lower() == "q":
+        name, function = MAIN_ACTIONS.get(choice.lower(), (None, None))
+        if name is None:
+            print("Invalid option. Please try again.")
+        elif function is None:
             print("Thank you for using the Fleet Management System. Goodbye!")
             break
         else:
-            print("Invalid option. Please try again.")
+            function()
 
 
 # Fleet management menu with nested functions
@@ -108,38 +695,30 @@ def fleet_management_menu():
     Display and handle the Fleet Management submenu.
     """
     while True:
-        # Display Fleet Management submenu
-        print("")
-        print(" Fleet Management ".center(40, "="))
-        print("")
-        # The first variable stores the index and add 1 to create a list feeling
-        # The second variable iterates the tuple
-        for i, m in enumerate(fleet_menu):
-            print(f"{i + 1}.- {m.title()}")
+        if script is None:
+            # Display Fleet Management submenu
+            print("")
+            print(" Fleet Management ".center(40, "="))
+            print("")
+            # The first variable stores the index and add 1 to create a list feeling
+            # The second variable iterates the tuple
+            for i, m in enumerate(fleet_menu):
+                print(f"{i + 1}.- {m.title()}")
 
         # Get user input
-        choice = input("\nPlease select an option (1-5 or type the submenu name): ").strip()
+        choice = read_input("\nPlease select an option (1-5 or type the submenu name): ").strip()
 
         # Validate and process user input
-        if choice == "1" or choice.lower() == "add vehicle":
-            # If add_vehicle returns True, it means we should return to main menu
-            if add_vehicle():
-                print("Returning to main menu...")
-                return
-        elif choice == "2" or choice.lower() == "update vehicle information":
-            # If update_vehicle returns True, it means we should return to main menu
-            if update_vehicle():
-                print("Returning to main menu...")
-                return
-        elif choice == "3" or choice.lower() == "remove a vehicle":
-            remove_vehicle()
-        elif choice == "4" or choice.lower() == "view fleet":
-            view_fleet()
-        elif choice == "5" or choice.lower() == "quit fleet management" or choice.lower() == "q":
+        name, function = FLEET_ACTIONS.get(choice.lower(), (None, None))
+        if name is None:
+            print("Invalid option. Please try again.")
+        elif function is None:
+            print("Returning to main menu...")
+            return
+        # If add_vehicle or update_vehicle return True, it means we should return to main menu
+        elif run_command("Fleet Management", name, function):
             print("Returning to main menu...")
             return
-        else:
-            print("Invalid option. Please try again.")
 
 
 # Shipment management menu with nested functions
@@ -149,32 +728,29 @@ def shipment_management_menu():
     Display and handle the Shipment Management submenu.
     """
     while True:
-        # Display Shipment Management submenu
-        print("")
-        print(" Shipment Management ".center(40, "="))
-        print("")
-        # The first variable stores the index and add 1 to create a list feeling
-        # The second variable iterates the tuple
-        for i, m in enumerate(shipment_menu):
-            print(f"{i + 1}.- {m.title()}")
+        if script is None:
+            # Display Shipment Management submenu
+            print("")
+            print(" Shipment Management ".center(40, "="))
+            print("")
+            # The first variable stores the index and add 1 to create a list feeling
+            # The second variable iterates the tuple
+            for i, m in enumerate(shipment_menu):
+                print(f"{i + 1}.- {m.title()}")
 
         # Get user input
-        choice = input("\nPlease select an option (1-4 or type the submenu name): ").strip()
+        choice = read_input("\nPlease select an option (1-4 or type the submenu name): ").strip()
 
         # Validate and process user input
-        if choice == "1" or choice.lower() == "create a new shipment":
-            # If create_shipment returns True, it means we should return to main menu
-            if create_shipment():
-                return
-        elif choice == "2" or choice.lower() == "track a shipment":
-            track_shipment()
-        elif choice == "3" or choice.lower() == "view all shipments":
-            view_shipments()
-        elif choice == "4" or choice.lower() == "quit shipment management" or choice.lower() == "q":
+        name, function = SHIPMENT_ACTIONS.get(choice.lower(), (None, None))
+        if name is None:
+            print("Invalid option. Please try again.")
+        elif function is None:
             print("Returning to main menu...")
             return
-        else:
-            print("Invalid option. Please try again.")
+        # If create_shipment returns True, it means we should return to main menu
+        elif run_command("Shipment Management", name, function) and function is create_shipment:
+            return
 
 
 # Delivery management menu with nested functions
@@ -184,91 +760,63 @@ def delivery_management_menu():
     Display and handle the Delivery Management submenu.
     """
     while True:
-        # Display Delivery Management submenu
-        print("")
-        print(" Delivery Management ".center(40, "="))
-        print("")
-        for i, m in enumerate(delivery_menu):
-            print(f"{i + 1}.- {m.title()}")
+        if script is None:
+            # Display Delivery Management submenu
+            print("")
+            print(" Delivery Management ".center(40, "="))
+            print("")
+            for i, m in enumerate(delivery_menu):
+                print(f"{i + 1}.- {m.title()}")
 
         # Get user input
-        choice = input("\nPlease select an option (1-3 or type the submenu name): ").strip()
+        choice = read_input("\nPlease select an option (1-3 or type the submenu name): ").strip()
 
         # Validate and process user input
-        if choice == "1" or choice.lower() == "record delivery for a shipment":
-            record_delivery()
-        elif choice == "2" or choice.lower() == "view delivery status for a shipment":
-            view_delivery_status()
-        elif choice == "3" or choice.lower() == "quit delivery management" or choice.lower() == "q":
+        name, function = DELIVERY_ACTIONS.get(choice.lower(), (None, None))
+        if name is None:
+            print("Invalid option. Please try again.")
+        elif function is None:
             print("Returning to main menu...")
             return
         else:
-            print("Invalid option. Please try again.")
+            run_command("Delivery Management", name, function)
 
 # Functions nested and used in the create_shipment() function
+# Function that asks for an address and validates it with ADDRESS_PATTERN,
+# returning the shared text of the address
+def addressValidation(prompt):
+    entry = address_entry(read_input(prompt))
+    if entry:
+        location, street, suburb, zipcode = entry
+        print("Thank you for providing a valid format address!")
+        print(f"Street and number: {street}")
+        print(f"Suburb: {suburb}")
+        print(f"Zipcode: {zipcode}")
+        return location
+    print("Invalid address format. Please use: street and number, suburb, zipcode")
+    # If an invalid address is typed will return to the Shipment Management menu
+    return
+
+
 # Function that returns and validates the origin address
 def addressOriginValidation():
-    while True:
-        locationOrigin = input("Please enter the origin address.\n"
-                               "Please use: street and number, suburb, zipcode: ").lower()
-
-        # The pattern restrict the input of the street and number and the suburb at least should
-        # be 3 characters long and the zipcode is limited to 4 to 10 characters
-        # as is a conventional standard worldwide. Also validates spaces characters in the input.
-
-        pattern = (r'^([a-zA-Z0-9][a-zA-Z0-9\s\-]{2,}),'
-                   r'\s*([a-zA-Z][a-zA-Z\s-]{2,}),\s*([a-zA-Z0-9]{4,10})$')
-
-        match = re.match(pattern, locationOrigin)
-        if match:
-            street, suburb, zipcode = match.groups()
-            print("Thank you for providing a valid format address!")
-            print(f"Street and number: {street}")
-            print(f"Suburb: {suburb}")
-            print(f"Zipcode: {zipcode}")
-            return locationOrigin.title()
-        else:
-            print("Invalid address format. Please use: street and number, suburb, zipcode")
-            # If an invalid address is typed will return to the Shipment Management menu
-            return
+    return addressValidation("Please enter the origin address.\n"
+                             "Please use: street and number, suburb, zipcode: ")
+
 
 # Function that returns and validate the destination address
 def addressDestinationValidation():
-    while True:
-        locationDestination = input("Please enter the destination address: ").lower()
-
-        # The pattern restrict the input of the street and number and the suburb at least should
-        # be 3 characters long and the zipcode is limited to 4 to 10 characters
-        # as is a conventional standard worldwide. Also validates spaces characters in the input.
-
-        pattern = (r'^([a-zA-Z0-9][a-zA-Z0-9\s\-]{2,}),'
-                   r'\s*([a-zA-Z][a-zA-Z\s-]{2,}),\s*([a-zA-Z0-9]{4,10})$')
-
-        match = re.match(pattern, locationDestination)
-        if match:
-            street, suburb, zipcode = match.groups()
-            print("Thank you for providing a valid format address!")
-            print(f"Street and number: {street}")
-            print(f"Suburb: {suburb}")
-            print(f"Zipcode: {zipcode}")
-            return locationDestination.title()
-        else:
-            print("Invalid address format. Please use: street and number, suburb, zipcode")
-            # If an invalid address is typed will return to the Shipment Management menu
-            return
+    return addressValidation("Please enter the destination address: ")
 
 
 # Function that returns and validates the weight of the package
 def weightValidation():
     while True:
         # Removes all the spaces at the beginning and at the end of the input
-        weight = input("Please enter the weight of the package in kg: ").strip()
+        weight = read_input("Please enter the weight of the package in kg: ").strip()
 
-        # This pattern validates that at least one character is typed
-        # and that there are digits inputs and . if it's a float.
-        pattern = r'^\S*\d+(\.\d+)?$'
-
-        match = re.match(pattern, weight)
+        # WEIGHT_PATTERN validates that there are digits inputs and . if it's a float
+        match = is_valid("weight", weight)
 
         # Check if it's a valid number in case of weights with decimals
         if "." in weight and match:
@@ -283,7 +831,7 @@ def weightValidation():
 
         # If we get here, the input was invalid
         print("This is not a valid input. Try again.\n"
-              "Remember that only numbers are allowed")
+              "Remember that only positive numbers are allowed")
 
         # This section with the return method without argument
         # gives control to the main function controlling this function
@@ -295,12 +843,12 @@ def weightValidation():
 # Function that returns and validates the vehicle ID
 def vehicleIDValidation(vehiclesList):
     while True:
-        # Display the list of vehicles, in the variable vehicles_list, with numbering
+        # Display the list of vehicles, in the variable vehiclesList, with numbering
         for i, v in enumerate(vehiclesList):
             print(f"{i + 1}.- {v}")
 
         # Get user input
-        choice = input("\nPlease select an option (enter number or vehicle ID): ").strip()
+        choice = read_input("\nPlease select an option (enter number or vehicle ID): ").strip()
 
         # Try to handle numeric input
         if choice.isdigit():
@@ -330,6 +878,80 @@ def vehicleIDValidation(vehiclesList):
         return
 
 
+# === Listing Functions ===
+
+# Number of records shown on each page of a listing
+PAGE_SIZE = 20
+
+
+def write_listing(records, render, path, chunk_size=1000):
+    """
+    Write every record to a text file, joining a chunk of records into one
+    write at a time. Returns the number of records written.
+    """
+    count = 0
+    records = iter(records)
+    with open(path, "w", encoding="utf-8") as file:
+        for chunk in iter(lambda: list(itertools.islice(records, chunk_size)), []):
+            file.write("".join(map(render, chunk)))
+            count += len(chunk)
+    return count
+
+
+def show_pages(make_records, render, header=""):
+    """
+    Show a listing PAGE_SIZE records at a time.
+    make_records returns a fresh iterator over the records, which are read
+    only as pages are shown, so the first page appears straight away however
+    many records there are. Each page is written to the screen with a single
+    write. The pages already seen are kept so the user can go back, and the
+    whole listing can be saved to a file.
+    """
+    records = iter(make_records())
+    pages = []
+
+    def load(number):
+        # Read records until the given page exists; False if there are not enough
+        while len(pages) <= number:
+            next_page = list(itertools.islice(records, PAGE_SIZE))
+            if not next_page:
+                return False
+            pages.append(next_page)
+        return True
+
+    if not load(0):
+        return
+    page = 0
+    while True:
+        first = page * PAGE_SIZE + 1
+        sys.stdout.write(header + "".join(map(render, pages[page]))
+                         + f"Page {page + 1} (records {first}-{first + len(pages[page]) - 1})\n")
+        sys.stdout.flush()
+
+        while True:
+            has_next = load(page + 1)
+            choices = (["[n]ext"] if has_next else []) + (["[p]revious"] if page else [])
+            choice = read_input(", ".join(choices + ["[s]ave all to a file", "[q]uit"]) + ": ").strip().lower()
+            if choice in ("n", "") and has_next:
+                page += 1
+                break
+            elif choice == "p" and page:
+                page -= 1
+                break
+            elif choice == "s":
+                path = read_input("Enter the file name: ").strip()
+                try:
+                    count = write_listing(make_records(), render, path)
+                except OSError as error:
+                    print(f"Error: could not write {path}: {error}")
+                    continue
+                print(f"{count} records written to {path}")
+            elif choice in ("q", ""):
+                return
+            else:
+                print("Invalid option. Please try again.")
+
+
 # === Shipment Management Functions ===
 # Function to create a new shipment order
 
@@ -348,28 +970,33 @@ def create_shipment():
     locationOrigin = addressOriginValidation()
     if not locationOrigin:
         print("Invalid origin address. Returning to shipment menu.")
-        input("Press Enter to continue...")
+        pause("Press Enter to continue...")
         return False  # Return to shipment menu if validation fails
 
     # Get and validate destination address
     locationDestination = addressDestinationValidation()
     if not locationDestination:
         print("Invalid destination address. Returning to shipment menu.")
-        input("Press Enter to continue...")
+        pause("Press Enter to continue...")
         return False  # Return to shipment menu if validation fails
 
     # Get and validate package weight
     weight = weightValidation()
     if not weight:
         print("Invalid weight. Returning to shipment menu.")
-        input("Press Enter to continue...")
+        pause("Press Enter to continue...")
         return False  # Return to shipment menu if validation fails
 
-    # Get and validate vehicle selection
-    selected_vehicle = vehicleIDValidation(vehicles_list)
+    # Get and validate vehicle selection, among the available vehicles with room for the weight
+    available_vehicles = capacity_ledger.fitting(float(weight))
+    if not available_vehicles:
+        print(f"No available vehicle has room for {weight} kg. Returning to shipment menu.")
+        pause("Press Enter to continue...")
+        return False
+    selected_vehicle = vehicleIDValidation(available_vehicles)
     if not selected_vehicle:
         print("Invalid vehicle selection. Returning to shipment menu.")
-        input("Press Enter to continue...")
+        pause("Press Enter to continue...")
         return False  # Return to shipment menu if validation fails
 
     # Create a unique string by concatenating the inputs
@@ -391,22 +1018,40 @@ def create_shipment():
     if len(shipmentID) > 15:
         shipmentID = shipmentID[:15]
 
-    # Add all information to the lists of the shipment order
-    origins_list.append(locationOrigin)
-    destinations_list.append(locationDestination)
-    weights_list.append(weight)
-    vehicles_selected.append(selected_vehicle)
-    shipment_ids_list.append(shipmentID)
-
-    # Initialize the delivery status as pending for new shipments
-    delivery_status.append("pending")
+    # The ID is built from the inputs, so the same shipment cannot be entered twice
+    if shipmentID in shipments:
+        print(f"A shipment with the same details already exists (ID: {shipmentID}).")
+        pause("Press Enter to continue...")
+        return False
 
     # Get the current date and time using the datetime library
     current_datetime = datetime.datetime.now()
 
     # Format the datetime string in YYYY-MM-DD HH:MM:SS format
     formatted_datetime = current_datetime.strftime("%Y-%m-%d %H:%M:%S")
-    delivery_datetime.append(formatted_datetime)
+
+    # Generate initial status based on shipment ID, it is stored with the shipment
+    status_code = status_codes([shipmentID])[0]
+
+    # Add all information to the shipments table.
+    # The delivery status of new shipments starts as pending.
+    try:
+        shipments.add({
+            "id": shipmentID,
+            "origin": locationOrigin,
+            "destination": locationDestination,
+            "weight": weight,
+            "vehicle": selected_vehicle,
+            "status": "pending",
+            "datetime": formatted_datetime,
+            "status_code": status_code,
+        })
+    except ValueError as error:
+        # The shipment file has fixed-width fields
+        print(f"Error: {error}. Returning to shipment menu.")
+        pause("Press Enter to continue...")
+        return False
+    load_vehicle(selected_vehicle, float(weight))
 
     # Display confirmation to the user before returning to the main menu
     print("\n===== Shipment Created Successfully =====")
@@ -416,19 +1061,10 @@ def create_shipment():
     print(f"Weight: {weight} kg")
     print(f"Assigned Vehicle: {selected_vehicle}")
 
-    # Generate initial status based on shipment ID
-    status_code = sum(ord(char) for char in shipmentID) % 3
-    if status_code == 0:
-        status = "Processing"
-    elif status_code == 1:
-        status = "In Transit"
-    else:  # status_code == 2
-        status = "Out for Delivery"
-
-    print(f"Status: {status}")
+    print(f"Status: {STATUS_NAMES[status_code]}")
     print(f"Creation Date/Time: {formatted_datetime}")
 
-    input("\nPress Enter to return to the main menu...")
+    pause("\nPress Enter to return to the main menu...")
 
     # After a successful shipment creation, return True to signal return to main menu
     return True
@@ -438,8 +1074,8 @@ def create_shipment():
 
 def track_shipment():
     while True:
-        shipmentTracking = input("Please enter your Shipment ID.\n"
-                                 "Remember the format: Axxxxxxxxxxxxxx: ").title()
+        shipmentTracking = read_input("Please enter your Shipment ID.\n"
+                                      "Remember the format: Axxxxxxxxxxxxxx: ").title()
 
         # Condition used to validate empty inputs and keeping the loop running if is the case.
 
@@ -449,43 +1085,30 @@ def track_shipment():
 
         # Condition that generates a status for each order.
 
-        elif shipmentTracking in shipment_ids_list and len(shipmentTracking) == 15 \
+        elif shipmentTracking in shipments and len(shipmentTracking) == 15 \
                 and shipmentTracking.startswith("A"):
-            # Get the index of the shipment in the list
-            index = shipment_ids_list.index(shipmentTracking)
+            # Get the shipment record from the table
+            shipment = shipments.get_record(shipmentTracking)
 
             # Check if the shipment has been marked as delivered
-            if delivery_status[index] == "delivered":
+            if shipment["status"] == "delivered":
                 status = "Your shipment has been delivered"
-                delivery_date = delivery_datetime[index]
+                delivery_date = shipment["datetime"]
                 print(f"\nShipment Status: {status}")
                 print(f"Delivery Date/Time: {delivery_date}")
             else:
-                # Generate a tracking status based on the shipment ID
-                # A variable string is created "randomly" by using ord() function.
-                # The ord() function returns an integer representation for any character.
-                # The sum() function is like creating an incrementing variable.
-                # The iteration applies the ord() function to each character
-                # in the shipment ID.
-                # The modulus is used to return values between 0-3
-
-                status_code = sum(ord(char) for char in shipmentTracking) % 3
-
-                # Map the status code to a meaningful status message
-                if status_code == 0:
-                    status = "Your shipment is being processed"
-                elif status_code == 1:
-                    status = "Your shipment is in transit"
-                else:  # status_code == 2
-                    status = "Your shipment is out for delivery"
+                # The tracking status comes from the status code stored with the
+                # shipment: the sum of the ord() values of the ID characters,
+                # taken modulo 3 to give a value between 0 and 2.
+                status = STATUS_MESSAGES[shipment["status_code"]]
 
                 print(f"\nShipment Status: {status}")
-                print(f"Date/Time: {delivery_datetime[index]}")
+                print(f"Date/Time: {shipment['datetime']}")
 
             print(f"Tracking ID: {shipmentTracking}")
-            input("\nPress Enter to return to the shipment menu...")
+            pause("\nPress Enter to return to the shipment menu...")
             return
-        elif shipmentTracking not in shipment_ids_list and len(shipmentTracking) == 15 \
+        elif shipmentTracking not in shipments and len(shipmentTracking) == 15 \
                 and shipmentTracking.startswith("A"):
             print("The shipment ID is not in our records.")
             # If shipment is not listed will return you to the shipment management menu
@@ -496,40 +1119,53 @@ def track_shipment():
 def view_shipments():
     print("\n===== All Shipment Details =====")
 
-    if not shipment_ids_list:
+    if not len(shipments):
         print("No shipments found in the system.")
         return
 
-    for i in range(len(shipment_ids_list)):
-        print(f"Shipment ID: {shipment_ids_list[i]}")
-        print(f"Origin: {origins_list[i]}")
-        print(f"Destination: {destinations_list[i]}")
-        print(f"Weight: {weights_list[i]} kg")
-        print(f"Vehicle: {vehicles_selected[i]}")
-
-        # Check if the shipment has been marked as delivered
-        if delivery_status[i] == "delivered":
-            status = "Delivered"
-            print(f"Status: {status}")
-            print(f"Delivery Date/Time: {delivery_datetime[i]}")
-        else:
-            # Generate a tracking status based on the shipment ID
-            status_code = sum(ord(char) for char in shipment_ids_list[i]) % 3
+    show_pages(shipments.records, format_shipment)
+
 
-            if status_code == 0:
-                status = "Processing"
-            elif status_code == 1:
-                status = "In Transit"
-            else:  # status_code == 2
-                status = "Out for Delivery"
+def format_shipment(shipment):
+    """Return the text shown for one shipment in the listing."""
+    lines = [
+        f"Shipment ID: {shipment['id']}",
+        f"Origin: {shipment['origin']}",
+        f"Destination: {shipment['destination']}",
+        f"Weight: {shipment['weight']} kg",
+        f"Vehicle: {shipment['vehicle']}",
+    ]
 
-            print(f"Status: {status}")
-            print(f"Creation Date/Time: {delivery_datetime[i]}")
+    # Check if the shipment has been marked as delivered
+    if shipment["status"] == "delivered":
+        lines.append("Status: Delivered")
+        lines.append(f"Delivery Date/Time: {shipment['datetime']}")
+    else:
+        # Tracking status from the status code stored with the shipment
+        lines.append(f"Status: {STATUS_NAMES[shipment['status_code']]}")
+        lines.append(f"Creation Date/Time: {shipment['datetime']}")
 
-        print("-" * 40)
+    lines.append("-" * 40)
+    return "\n".join(lines) + "\n"
 
-    input("\nPress Enter to continue...")
-    return
+
+def shipments_in_area(suburb=None, zipcode=None, column="destination"):
+    """
+    Return the IDs of the shipments whose destination (or origin, with
+    column="origin") is in the suburb and zipcode; None matches any.
+    Addresses in no valid format (like the sample shipments) are never in an area.
+    """
+    if suburb is not None:
+        suburb = suburb.strip().title()
+    if zipcode is not None:
+        zipcode = zipcode.strip().upper()
+    found = []
+    for record in shipments.records():
+        entry = address_entry(record[column])
+        if (entry and (suburb is None or entry[2] == suburb)
+                and (zipcode is None or entry[3] == zipcode)):
+            found.append(record["id"])
+    return found
 
 # === Fleet Management Functions ===
 
@@ -547,7 +1183,7 @@ def add_vehicle():
     """
     while True:
         # Get and validate vehicle code
-        veh_code = input("Enter Vehicle Code (must start with 'V' and be 7 characters long): ").strip()
+        veh_code = read_input("Enter Vehicle Code (must start with 'V' and be 7 characters long): ").strip()
 
         # Check if input is empty
         if not veh_code:
@@ -555,12 +1191,12 @@ def add_vehicle():
             return False
 
         # Check if vehicle code format is correct (starts with V and is 7 chars long)
-        if not re.match(r"^[Vv][A-Za-z0-9]{6}$", veh_code):
+        if not is_valid("vehicle_code", veh_code):
             print("Error: Vehicle Code must start with 'V' and be exactly 7 characters long.")
             return False
 
         # Ensuring uniqueness of vehicle code
-        if veh_code.upper() in vehicles_list:
+        if veh_code.upper() in vehicles:
             print("Error: Vehicle Code already exists. Please enter a different code.")
             return False
 
@@ -569,7 +1205,7 @@ def add_vehicle():
 
     while True:
         # Get and validate vehicle type
-        veh_type = input("Enter Vehicle Type (letters and spaces only): ").strip()
+        veh_type = read_input("Enter Vehicle Type (letters and spaces only): ").strip()
 
         # Check if input is empty
         if not veh_type:
@@ -577,7 +1213,7 @@ def add_vehicle():
             return False
 
         # Check if vehicle type contains only letters and spaces
-        if not re.match(r"^[A-Za-z\s]+$", veh_type):
+        if not is_valid("vehicle_type", veh_type):
             print("Error: Vehicle Type must contain only letters and spaces.")
             return False
 
@@ -586,7 +1222,7 @@ def add_vehicle():
 
     while True:
         # Get and validate capacity
-        cap_veh = input("Enter Load Capacity (kg, positive integer only): ").strip()
+        cap_veh = read_input("Enter Load Capacity (kg, positive integer only): ").strip()
 
         # Check if input is empty
         if not cap_veh:
@@ -594,21 +1230,19 @@ def add_vehicle():
             return False
 
         # Validate load capacity input (must be a positive integer)
-        if not cap_veh.isdigit() or int(cap_veh) <= 0:
+        if not is_valid("capacity", cap_veh):
             print("Error: Load Capacity must be a positive integer.")
             return False
 
         # Input validation passed for capacity
         break
 
-    # All inputs are valid, add vehicle details to the lists
+    # All inputs are valid, add vehicle details to the table
     veh_code = veh_code.upper()
     veh_type = veh_type.title()
 
-    vehicles_list.append(veh_code)
-    vehicle_types.append(veh_type)
-    vehicle_capacities.append(cap_veh)
-    vehicle_availability.append(True)
+    vehicles.add({"code": veh_code, "type": veh_type, "capacity": cap_veh, "available": True})
+    refresh_vehicle(veh_code)
 
     # Display the newly registered vehicle information
     print("\n===== Vehicle Successfully Registered =====")
@@ -618,7 +1252,7 @@ def add_vehicle():
     print(f"Available: Yes")
     print("=" * 40)
 
-    input("\nPress Enter to return to the main menu...")
+    pause("\nPress Enter to return to the main menu...")
 
     # Return True to signal successful completion and return to main menu
     return True
@@ -633,35 +1267,35 @@ def update_vehicle():
     Returns to main menu on successful update, fleet management menu otherwise.
     """
     # Get vehicle code to update
-    veh_code = input("Enter Vehicle Code to update: ").strip()
+    veh_code = read_input("Enter Vehicle Code to update: ").strip()
 
     # Check if the vehicle exists
-    if veh_code not in vehicles_list:
+    if veh_code not in vehicles:
         print("Error: No matching vehicle found.")
         return False
 
-    # Get the index of the vehicle
-    index = vehicles_list.index(veh_code)
+    # Get the vehicle record
+    vehicle = vehicles.get_record(veh_code)
 
     # Display current vehicle information
     print("\nCurrent Vehicle Information:")
-    print(f"Vehicle Code: {vehicles_list[index]}")
-    print(f"Vehicle Type: {vehicle_types[index]}")
-    print(f"Load Capacity: {vehicle_capacities[index]} kg")
-    print(f"Available: {'Yes' if vehicle_availability[index] else 'No'}")
+    print(f"Vehicle Code: {vehicle['code']}")
+    print(f"Vehicle Type: {vehicle['type']}")
+    print(f"Load Capacity: {vehicle['capacity']} kg")
+    print(f"Available: {'Yes' if vehicle['available'] else 'No'}")
     print("\nEnter new details (leave blank to keep current value):")
 
     # Get and validate new type
     while True:
-        new_type = input("Enter new Vehicle Type (letters and spaces only): ").strip()
+        new_type = read_input("Enter new Vehicle Type (letters and spaces only): ").strip()
 
         # If empty, keep current value
         if not new_type:
-            new_type = vehicle_types[index]
+            new_type = vehicle["type"]
             break
 
         # Validate type format
-        if not re.match(r"^[A-Za-z\s]+$", new_type):
+        if not is_valid("vehicle_type", new_type):
             print("Error: Vehicle Type must contain only letters and spaces.")
             return
 
@@ -669,52 +1303,51 @@ def update_vehicle():
 
     # Get and validate new capacity
     while True:
-        new_cap = input("Enter new Load Capacity (kg, positive integer only): ").strip()
+        new_cap = read_input("Enter new Load Capacity (kg, positive integer only): ").strip()
 
         # If empty, keep current value
         if not new_cap:
-            new_cap = vehicle_capacities[index]
+            new_cap = vehicle["capacity"]
             break
 
         # Validate capacity format
-        if not new_cap.isdigit() or int(new_cap) <= 0:
+        if not is_valid("capacity", new_cap):
             print("Error: Load Capacity must be a positive integer.")
             return
 
         break
 
     # Apply the changes
-    vehicle_types[index] = new_type.title()
-    vehicle_capacities[index] = new_cap
+    vehicles.set(veh_code, "type", new_type.title())
+    vehicles.set(veh_code, "capacity", new_cap)
+    refresh_vehicle(veh_code)  # A smaller capacity can fill the vehicle
+    vehicle = vehicles.get_record(veh_code)
 
     # Display updated information
     print("\nVehicle Updated Successfully!")
     print("\nUpdated Vehicle Information:")
-    print(f"Vehicle Code: {vehicles_list[index]}")
-    print(f"Vehicle Type: {vehicle_types[index]}")
-    print(f"Load Capacity: {vehicle_capacities[index]} kg")
-    print(f"Available: {'Yes' if vehicle_availability[index] else 'No'}")
+    print(f"Vehicle Code: {vehicle['code']}")
+    print(f"Vehicle Type: {vehicle['type']}")
+    print(f"Load Capacity: {vehicle['capacity']} kg")
+    print(f"Available: {'Yes' if vehicle['available'] else 'No'}")
 
     # Return to main menu
     return True
 
 def remove_vehicle():
     """Remove a vehicle record."""
-    veh_code = input("Enter Vehicle Code to delete: ").upper()  # Identify vehicle to delete
-    if veh_code in vehicles_list:
-        index = vehicles_list.index(veh_code)
-        confirmation = input("Confirm deletion? (yes/no): ").strip().lower()
+    veh_code = read_input("Enter Vehicle Code to delete: ").upper()  # Identify vehicle to delete
+    if veh_code in vehicles:
+        confirmation = read_input("Confirm deletion? (yes/no): ").strip().lower()
         if confirmation == "yes" or confirmation == "y":
             # Check if vehicle is assigned to any shipments
-            if veh_code in vehicles_selected:
+            if shipments.count("vehicle", veh_code):
                 print("Error: Cannot remove vehicle as it is assigned to shipments.")
                 return
 
-            # Remove from all vehicle lists
-            vehicles_list.pop(index)
-            vehicle_types.pop(index)
-            vehicle_capacities.pop(index)
-            vehicle_availability.pop(index)
+            # Remove the vehicle record from the table
+            vehicles.remove(veh_code)
+            capacity_ledger.forget(veh_code)
             print("Vehicle record successfully removed.")
         else:
             print("Deletion canceled.")
@@ -724,14 +1357,18 @@ def remove_vehicle():
 
 def view_fleet():
     """Display all registered vehicles."""
-    if not vehicles_list:
+    if not len(vehicles):
         print("No vehicles have been added yet.")
     else:
         print("\nFleet Inventory:")
-        print(f"{'Code':<10} {'Type':<15} {'Capacity (kg)':<15}")
-        print("=" * 50)
-        for i in range(len(vehicles_list)):
-            print(f"{vehicles_list[i]:<10} {vehicle_types[i]:<15} {vehicle_capacities[i]:<15}")
+        header = (f"{'Code':<10} {'Type':<15} {'Capacity (kg)':<15} {'Load (kg)':<12} {'Available':<10}\n"
+                  + "=" * 65 + "\n")
+        show_pages(lambda: zip(vehicles.column("code"), vehicles.column("type"),
+                               vehicles.column("capacity"), vehicles.column("available")),
+                   lambda vehicle: (f"{vehicle[0]:<10} {vehicle[1]:<15} {vehicle[2]:<15} "
+                                    f"{capacity_ledger.load(vehicle[0]):<12g} "
+                                    f"{'Yes' if vehicle[3] else 'No':<10}\n"),
+                   header)
 
 # === Delivery Management Functions ===
 
@@ -743,33 +1380,31 @@ def record_delivery():
     print("\n===== Record Shipment Delivery =====")
 
     # Get shipment ID from user
-    shipment_id = input("Enter Shipment ID to mark as delivered: ").strip().upper()
+    shipment_id = read_input("Enter Shipment ID to mark as delivered: ").strip().upper()
 
     # Check if shipment ID exists
-    if shipment_id not in shipment_ids_list:
+    if shipment_id not in shipments:
         print("Error: Shipment ID not found. Please try again!")
-        input("Press Enter to continue...")
+        pause("Press Enter to continue...")
         return False
 
-    # Get index of the shipment
-    shipment_index = shipment_ids_list.index(shipment_id)
-
     # Check if the shipment is already delivered
-    if delivery_status[shipment_index] == "delivered":
+    if shipments.get(shipment_id, "status") == "delivered":
         print(f"Shipment {shipment_id} has already been marked as delivered.")
-        input("Press Enter to continue...")
+        pause("Press Enter to continue...")
         return False
 
-    # Update the delivery status
-    delivery_status[shipment_index] = "delivered"
+    # Update the delivery status; the vehicle has room for the weight again
+    shipments.set(shipment_id, "status", "delivered")
+    load_vehicle(shipments.get(shipment_id, "vehicle"), -float(shipments.get(shipment_id, "weight")))
 
     # Record the current datetime for the delivery
     current_datetime = datetime.datetime.now()
     formatted_datetime = current_datetime.strftime("%Y-%m-%d %H:%M:%S")
-    delivery_datetime[shipment_index] = formatted_datetime
+    shipments.set(shipment_id, "datetime", formatted_datetime)
 
     print(f"\nShipment {shipment_id} has been marked as delivered at {formatted_datetime}.")
-    input("Press Enter to continue...")
+    pause("Press Enter to continue...")
     return True
 
 
@@ -780,20 +1415,17 @@ def view_delivery_status():
     print("\n===== View Shipment Delivery Status =====")
 
     # Get shipment ID from user
-    shipment_id = input("Enter Shipment ID to check delivery status: ").strip().upper()
+    shipment_id = read_input("Enter Shipment ID to check delivery status: ").strip().upper()
 
     # Check if shipment ID exists
-    if shipment_id not in shipment_ids_list:
+    if shipment_id not in shipments:
         print("Error: Shipment ID not found. Please try again!")
-        input("Press Enter to continue...")
+        pause("Press Enter to continue...")
         return False
 
-    # Get index of the shipment
-    shipment_index = shipment_ids_list.index(shipment_id)
-
     # Display delivery status
-    status = delivery_status[shipment_index]
-    datetime_str = delivery_datetime[shipment_index]
+    status = shipments.get(shipment_id, "status")
+    datetime_str = shipments.get(shipment_id, "datetime")
 
     print(f"\nShipment ID: {shipment_id}")
     print(f"Delivery Status: {status.title()}")
@@ -804,8 +1436,43 @@ def view_delivery_status():
         print("This shipment has not been delivered yet.")
         print("Select 'Record Delivery for a Shipment' from the menu to mark it as delivered.")
 
-    input("Press Enter to continue...")
+    pause("Press Enter to continue...")
     return True
 
-# Start the program by directly calling the main function
-main()
\ No newline at end of file
+# Options of every menu, in the order of the menu tuples
+MAIN_ACTIONS = menu_actions(main_menu, (fleet_management_menu, shipment_management_menu,
+                                        delivery_management_menu))
+FLEET_ACTIONS = menu_actions(fleet_menu, (add_vehicle, update_vehicle, remove_vehicle, view_fleet))
+SHIPMENT_ACTIONS = menu_actions(shipment_menu, (create_shipment, track_shipment, view_shipments))
+DELIVERY_ACTIONS = menu_actions(delivery_menu, (record_delivery, view_delivery_status))
+
+
+# Start the program by calling the main function (only when run as a script,
+# so the tables and functions can be imported by other tools)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fleet Management System")
+    parser.add_argument("--shipments-file",
+                        help="keep the shipments in this memory-mapped file")
+    parser.add_argument("--script", metavar="FILE",
+                        help="read the answers from FILE ('-' for stdin), one per line, "
+                             "without prompts or pauses, and report the time of each command")
+    args = parser.parse_args()
+    if args.shipments_file:
+        use_shipment_file(args.shipments_file)
+    if args.script:
+        script = sys.stdin if args.script == "-" else open(args.script, encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        main()
+    except EOFError:
+        if script is None:
+            raise
+        # The script ended without quitting
+    finally:
+        if script is not None and script is not sys.stdin:
+            script.close()
+        if hasattr(shipments, "close"):
+            shipments.close()
+    if script is not None:
+        sys.stderr.write(timing_report())
+        sys.stderr.write(f"Script finished in {time.perf_counter() - start:.3f} s\n")
\ No newline at end of file
@@ -9,10 +9,33 @@ including fleet, customers, shipments, and deliveries.
 Data Storage: This system uses dictionaries to store and manage data, which offers
 fast lookups by ID and flexible storage of varying data structures.
 """
-import random
 import string
 import datetime
 import re
+import os
+import json
+import time
+import argparse
+import threading
+import queue
+import sqlite3
+import multiprocessing
+import multiprocessing.connection
+import signal
+import contextlib
+import csv
+import bisect
+import zlib
+import sys
+import itertools
+import functools
+import math
+
+# NumPy is optional; with it, status codes of many shipments are computed at once
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Library needed for the signature displayed at the end of the program.
 
@@ -51,88 +74,1381 @@ def display_signature():
     print("║    Code crafted with ♥ by Jael & Patrick    ║")
     print("╚═════════════════════════════════════════════╝\n")
 
+# Fsync policies for the write-ahead log, from the safest to the fastest
+FSYNC_ALWAYS = "always"      # fsync after every add/update/remove
+FSYNC_INTERVAL = "interval"  # fsync at most every N milliseconds
+FSYNC_ON_CLOSE = "close"     # only fsync when the store is closed
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_ON_CLOSE)
+
+
+class WriteAheadLog:
+    """Append-only log that makes DataStore changes survive a restart
+
+    Every change is written as one JSON line tagged with a sequence number.
+    From time to time the whole store is compacted into a snapshot file and
+    the log is truncated, so startup only has to read the snapshot plus the
+    short log tail written after it.
+    """
+
+    def __init__(self, path, fsync_policy=FSYNC_ALWAYS, fsync_interval_ms=100):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy}")
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval_ms / 1000
+        self.sequence = 0  # Sequence number of the last record written
+        self.records_since_snapshot = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._dirty = False  # True when there are writes not yet fsynced
+        self._stop = threading.Event()
+        self._flusher = None
+
+    def replay(self):
+        """Yield (operation, item_id, record) for the snapshot and then the log tail
+
+        A half-written last line (the process died in the middle of a write)
+        is dropped and cut off the file so new records start on a clean line.
+        """
+        snapshot_sequence = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as snapshot:
+                header = json.loads(snapshot.readline())
+                snapshot_sequence = header["sequence"]
+                for line in snapshot:
+                    entry = json.loads(line)
+                    yield "add", entry["id"], entry["item"]
+        self.sequence = snapshot_sequence
+
+        if not os.path.exists(self.path):
+            return
+        valid_size = 0
+        with open(self.path, "rb") as log:
+            for raw in log:
+                if not raw.endswith(b"\n"):
+                    break  # Torn write at the end of the log
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    break
+                valid_size += len(raw)
+                # Records already folded into the snapshot are skipped (this
+                # happens if we crashed between writing the snapshot and
+                # truncating the log)
+                if entry["seq"] <= snapshot_sequence:
+                    continue
+                self.sequence = entry["seq"]
+                self.records_since_snapshot += 1
+                yield entry["op"], entry["id"], entry.get("item")
+        if valid_size < os.path.getsize(self.path):
+            with open(self.path, "r+b") as log:
+                log.truncate(valid_size)
+
+    def open(self):
+        """Open the log for appending (call after replay)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "ab")
+        if self.fsync_policy == FSYNC_INTERVAL:
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+    def append(self, operation, item_id, record):
+        """Append one change to the log, syncing it according to the fsync policy"""
+        with self._lock:
+            self.sequence += 1
+            entry = {"seq": self.sequence, "op": operation, "id": item_id}
+            if record is not None:
+                entry["item"] = record
+            self._file.write(json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n")
+            self.records_since_snapshot += 1
+            if self.fsync_policy == FSYNC_ALWAYS:
+                self._sync()
+            else:
+                self._dirty = True
+
+    def write_snapshot(self, records):
+        """Write every (item_id, record) pair to a new snapshot and truncate the log
+
+        The snapshot is written to a temporary file and renamed over the old
+        one, so a crash halfway through never leaves a broken snapshot.
+        """
+        with self._lock:
+            temp_path = self.snapshot_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as snapshot:
+                snapshot.write(json.dumps({"sequence": self.sequence}) + "\n")
+                for item_id, record in records:
+                    snapshot.write(json.dumps({"id": item_id, "item": record},
+                                              separators=(",", ":")) + "\n")
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(temp_path, self.snapshot_path)
+            self._sync_directory()
+
+            # Everything in the log is now part of the snapshot
+            self._file.flush()
+            self._file.seek(0)
+            self._file.truncate()
+            self._sync()
+            self.records_since_snapshot = 0
+
+    def close(self):
+        """Flush and fsync pending writes and close the log file"""
+        self._stop.set()
+        if self._flusher:
+            self._flusher.join()
+        with self._lock:
+            if self._file and not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._dirty = False
+
+    def _sync_directory(self):
+        # Make the rename itself durable (not possible on Windows)
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.fsync_interval):
+            with self._lock:
+                if self._dirty and not self._file.closed:
+                    self._sync()
+
+
+# Characters used in IDs, in sorting order so IDs sort like their counters
+ID_ALPHABET = string.digits + string.ascii_uppercase
+ID_BODY_LENGTH = 7  # Characters after the type prefix
+NODE_LENGTH = 2  # Characters of the node field, at the start of the body
+DEFAULT_NODE = "00"  # Node of the processes not given one
+NODES_FILE = "nodes"  # Nodes that have used a data directory, one per line
+
+
+class IdAllocator:
+    """Hands out unique IDs in the format used everywhere in the program
+
+    An ID is a type prefix (V, C, S, D or I) followed by 7 characters: a
+    2-character node field and a base-36 counter. Counters never repeat, and
+    processes given different nodes can allocate IDs at the same time without
+    talking to each other: the node field has a fixed width, so no node's IDs
+    can be read as another node's. The default node is 00, which gives the
+    same IDs as a bare counter.
+
+    Counter values are reserved in blocks under a lock, so concurrent writers
+    only contend once per block and bulk inserts can reserve all the IDs they
+    need in one call.
+    """
+
+    def __init__(self, node="", block_size=1024):
+        node = node.upper()
+        if len(node) > NODE_LENGTH or any(char not in ID_ALPHABET for char in node):
+            raise ValueError(f"The node must be 1-{NODE_LENGTH} letters or digits")
+        if node and node.rjust(NODE_LENGTH, "0") == DEFAULT_NODE:
+            raise ValueError(f"Node {DEFAULT_NODE} is the default node, choose another one")
+        self.node = node.rjust(NODE_LENGTH, "0")
+        self.block_size = block_size
+        self._width = ID_BODY_LENGTH - NODE_LENGTH  # Characters left for the counter
+        self._limit = 36 ** self._width
+        self._lock = threading.Lock()
+        self._high_water = {}  # Type prefix -> first counter value never reserved
+        self._blocks = {}  # Type prefix -> [next value, end of the reserved block]
+
+    def allocate(self, prefix):
+        """Return a new ID for the given type prefix"""
+        with self._lock:
+            block = self._blocks.get(prefix)
+            if block is None or block[0] >= block[1]:
+                block = list(self._reserve(prefix, self.block_size))
+                self._blocks[prefix] = block
+            value = block[0]
+            block[0] += 1
+        return self._format(prefix, value)
+
+    def allocate_block(self, prefix, count):
+        """Return count new IDs reserved together in a single call"""
+        with self._lock:
+            start, end = self._reserve(prefix, count)
+        return [self._format(prefix, value) for value in range(start, end)]
+
+    def observe(self, item_id):
+        """Make sure an ID that already exists (for example loaded from disk) is never handed out"""
+        if len(item_id) != ID_BODY_LENGTH + 1 or not item_id.startswith(item_id[0] + self.node):
+            return
+        counter = item_id[1 + NODE_LENGTH:]
+        if any(char not in ID_ALPHABET for char in counter):
+            return
+        prefix = item_id[0]
+        with self._lock:
+            value = int(counter, 36) + 1
+            if value > self._high_water.get(prefix, 0):
+                self._high_water[prefix] = value
+                # Drop the current block, it may now contain used values
+                self._blocks.pop(prefix, None)
+
+    def _reserve(self, prefix, count):
+        start = self._high_water.get(prefix, 0)
+        end = start + count
+        if end > self._limit:
+            raise RuntimeError(f"No more IDs available for prefix {prefix}{self.node}")
+        self._high_water[prefix] = end
+        return start, end
+
+    def _format(self, prefix, value):
+        digits = []
+        for _ in range(self._width):
+            value, remainder = divmod(value, 36)
+            digits.append(ID_ALPHABET[remainder])
+        return prefix + self.node + "".join(reversed(digits))
+
+
+def claim_node(data_dir, node):
+    """Record that a node uses a data directory, and refuse the default node once others do
+
+    Two processes left on the default node would hand out the same IDs, so
+    once any process has used the data with its own node, every process has
+    to be given one.
+    """
+    path = os.path.join(data_dir, NODES_FILE)
+    try:
+        with open(path, encoding="utf-8") as file:
+            nodes = {line.strip() for line in file if line.strip()}
+    except FileNotFoundError:
+        nodes = set()
+    if node == DEFAULT_NODE and nodes - {DEFAULT_NODE}:
+        raise ValueError(f"{data_dir} is shared by the nodes {', '.join(sorted(nodes))}; "
+                         "start this process with its own --node")
+    if node not in nodes:
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(node + "\n")
+
+
+class ReadWriteLock:
+    """Lets many threads read at the same time, or a single thread write
+
+    Writers come first: once a writer is waiting, new readers wait too, so a
+    steady flow of reads cannot keep changes out forever. The lock is
+    reentrant. The writing thread may read and write again (stores sharing a
+    lock are used inside one write), and a reading thread may read again. A
+    thread only reading cannot start writing, as two readers doing so would
+    wait for each other forever: operations that read and then write take
+    the write lock from the start.
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        # Waits on the same mutex; only used when a thread has to wait
+        self._condition = threading.Condition(self._mutex)
+        self._readers = {}  # Thread ident -> how many times it holds the read lock
+        self._writer = None  # Ident of the thread holding the write lock
+        self._write_depth = 0
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self._mutex:
+            if me not in self._readers and self._writer != me:
+                while self._writer is not None or self._writers_waiting:
+                    self._condition.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+
+    def release_read(self):
+        me = threading.get_ident()
+        with self._mutex:
+            depth = self._readers[me] - 1
+            if depth:
+                self._readers[me] = depth
+            else:
+                del self._readers[me]
+                if not self._readers and self._writers_waiting:
+                    self._condition.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._mutex:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("A thread holding the read lock cannot take the write lock")
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        with self._mutex:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextlib.contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+
 class DataStore:
     """Base class for data storage
 
     This class provides a foundation for storing, retrieving, and managing data
     using dictionaries. It offers methods to add, update, remove, and find items.
+
+    When a wal_path is given the store becomes persistent: every change is
+    appended to a write-ahead log, the log is compacted into a snapshot every
+    snapshot_every changes, and the snapshot plus log tail are replayed when
+    the store is created again with the same path.
+
+    The fields listed in indexes get a hash index (value -> item IDs) that is
+    kept up to date on every change, so find_by on those fields does not scan
+    the whole store.
+
+    The store can be used from many threads: scans and index lookups share a
+    ReadWriteLock and changes take it alone. Stores given the same lock can be changed together
+    as one unit by holding its write lock (see LogisticsService.writing).
     """
 
-    def __init__(self):
+    def __init__(self, wal_path=None, fsync_policy=FSYNC_ALWAYS,
+                 fsync_interval_ms=100, snapshot_every=10000, indexes=(),
+                 id_allocator=None, lock=None):
         self.data = {}  # Dictionary to store items with their IDs as keys
         self.__last_id = 0  # Private attribute to track the last assigned ID (not used for random IDs)
+        # Source of new IDs (can be shared between stores or processes)
+        self.id_allocator = id_allocator or IdAllocator()
+        # Guards the items and indexes (can be shared between stores)
+        self.lock = lock or ReadWriteLock()
+        self.snapshot_every = snapshot_every
+        # Secondary indexes: field -> value -> item IDs (a dict used as an ordered set)
+        self.indexes = {field: {} for field in indexes}
+        # Indexed values of each item when it was stored. Menus change items
+        # before calling update, so the old values cannot be read from the item.
+        self._indexed_values = {}
+        self.wal = None
+        if wal_path:
+            self.wal = WriteAheadLog(wal_path, fsync_policy, fsync_interval_ms)
+            self._recover()
 
     def add(self, item):
         """Add an item to the data store with auto-generated ID
 
-        The ID will be randomly generated, 8 characters long, and prefixed with
-        a letter indicating the type of the object (V, C, S, D, or I).
+        The ID is 8 characters long, prefixed with a letter indicating the
+        type of the object (V, C, S, D, or I) and guaranteed to be unique.
         """
-        # Determine the prefix based on item type
-        if isinstance(item, Vehicle):
-            prefix = "V"
-        elif isinstance(item, Customer):
-            prefix = "C"
-        elif isinstance(item, Shipment):
-            prefix = "S"
-        elif isinstance(item, Delivery):
-            prefix = "D"
-        else:
-            prefix = "I"  # For any other item types
+        self.lock.acquire_write()
+        try:
+            item_id = self._generate_id(item)
 
-        # Generate random alphanumeric part (7 characters to make total length 8 with prefix)
-        alphabet = string.ascii_uppercase + string.digits
-        random_part = ''.join(random.choices(alphabet, k=7))
+            # Set the ID on the item and store it
+            item.id = item_id
+            self.data[item_id] = item
+            self._index_item(item_id, item)
+            self._log("add", item_id, item)
+            return item_id
+        finally:
+            self.lock.release_write()
+
+    def _generate_id(self, item):
+        """Create a new, unused ID for an item based on its type"""
+        prefix = id_prefix(type(item))
+        item_id = self.id_allocator.allocate(prefix)
+        # The allocator never repeats itself, but IDs written by an older
+        # version of the program (random IDs) could still be in the store
+        while self._id_exists(item_id):
+            item_id = self.id_allocator.allocate(prefix)
+        return item_id
 
-        # Create the full ID
-        item_id = f"{prefix}{random_part}"
+    def _id_exists(self, item_id):
+        return item_id in self.data
 
-        # Set the ID on the item and store it
-        item.id = item_id
-        self.data[item_id] = item
-        return item_id
+    def add_many(self, items):
+        """Add several items at once and return their IDs
+
+        The IDs come from one block reserved in a single allocator call.
+        """
+        items = list(items)
+        self.lock.acquire_write()
+        try:
+            for item in self._assign_ids(items):
+                self.data[item.id] = item
+                self._index_item(item.id, item)
+                self._log("add", item.id, item)
+        finally:
+            self.lock.release_write()
+        return [item.id for item in items]
+
+    def _assign_ids(self, items):
+        """Give every item a new ID taken from one reserved block; return the items"""
+        if not items:
+            return items
+        prefix = id_prefix(type(items[0]))
+        block = self.id_allocator.allocate_block(prefix, len(items))
+        for item, item_id in zip(items, block):
+            if id_prefix(type(item)) != prefix or self._id_exists(item_id):
+                item_id = self._generate_id(item)
+            item.id = item_id
+        return items
+
+    def put_many(self, items):
+        """Store items under the IDs they already have, replacing the items with those IDs
+
+        Used by the shards of a ShardedDataStore, whose IDs are handed out by
+        the client.
+        """
+        self.lock.acquire_write()
+        try:
+            for item in items:
+                operation = "update" if item.id in self.data else "add"
+                self._unindex_item(item.id)
+                self.data[item.id] = item
+                self._index_item(item.id, item)
+                self._log(operation, item.id, item)
+        finally:
+            self.lock.release_write()
 
     def update(self, item_id, item):
         """Update an existing item"""
-        if item_id in self.data:
-            self.data[item_id] = item
-            return True
-        return False
+        self.lock.acquire_write()
+        try:
+            if item_id in self.data:
+                self.data[item_id] = item
+                self._unindex_item(item_id)
+                self._index_item(item_id, item)
+                self._log("update", item_id, item)
+                return True
+            return False
+        finally:
+            self.lock.release_write()
 
     def remove(self, item_id):
         """Remove an item by ID"""
-        if item_id in self.data:
-            del self.data[item_id]
-            return True
-        return False
+        self.lock.acquire_write()
+        try:
+            if item_id in self.data:
+                del self.data[item_id]
+                self._unindex_item(item_id)
+                self._log("remove", item_id, None)
+                return True
+            return False
+        finally:
+            self.lock.release_write()
 
     def find(self, item_id):
         """Find an item by ID"""
+        # A single dictionary lookup is atomic, it needs no lock; reads that
+        # must agree with each other hold the read lock around them
         return self.data.get(item_id)
 
     def find_all(self):
         """Return all items"""
-        return list(self.data.values())
+        self.lock.acquire_read()
+        try:
+            return list(self.data.values())
+        finally:
+            self.lock.release_read()
+
+    def iter_all(self, chunk_size=500):
+        """Yield every item of the store as it is now
+
+        Only the references to the items are copied (under the read lock), so
+        other threads can keep changing the store while they are being read.
+        chunk_size is only used by stores backed by a database.
+        """
+        return iter(self.find_all())
+
+    def find_by(self, field, value):
+        """Return the items whose field equals value
+
+        Uses the secondary index when the field is indexed and falls back to
+        scanning every item otherwise.
+        """
+        index = self.indexes.get(field)
+        self.lock.acquire_read()
+        try:
+            if index is None:
+                return [item for item in self.data.values() if getattr(item, field, None) == value]
+            return [self.data[item_id] for item_id in index.get(value, ())]
+        finally:
+            self.lock.release_read()
+
+    def _index_item(self, item_id, item):
+        """Add an item to every secondary index"""
+        if not self.indexes:
+            return
+        values = tuple(getattr(item, field, None) for field in self.indexes)
+        for (field, index), value in zip(self.indexes.items(), values):
+            index.setdefault(value, {})[item_id] = None
+        self._indexed_values[item_id] = values
+
+    def _unindex_item(self, item_id):
+        """Remove an item from every secondary index"""
+        values = self._indexed_values.pop(item_id, None)
+        if values is None:
+            return
+        for index, value in zip(self.indexes.values(), values):
+            bucket = index[value]
+            del bucket[item_id]
+            if not bucket:
+                del index[value]
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group several writes together (only stores backed by a database need this)"""
+        yield self
+
+    def compact(self):
+        """Fold the write-ahead log into a fresh snapshot of the whole store"""
+        if self.wal:
+            with self.lock.write():
+                self.wal.write_snapshot((item_id, item.to_dict())
+                                        for item_id, item in self.data.items())
+
+    def close(self):
+        """Make every pending change durable and release the log file"""
+        if self.wal:
+            self.wal.close()
+
+    def _log(self, operation, item_id, item):
+        """Record a change in the write-ahead log (persistent stores only)"""
+        if self.wal is None:
+            return
+        self.wal.append(operation, item_id, item.to_dict() if item is not None else None)
+        if self.snapshot_every and self.wal.records_since_snapshot >= self.snapshot_every:
+            self.compact()
+
+    def _recover(self):
+        """Rebuild the dictionary from the snapshot and log tail on disk"""
+        for operation, item_id, record in self.wal.replay():
+            self._unindex_item(item_id)
+            if operation == "remove":
+                self.data.pop(item_id, None)
+            else:
+                item = item_from_dict(record)
+                self.data[item_id] = item
+                self._index_item(item_id, item)
+                self.id_allocator.observe(item_id)
+        self.wal.open()
+
+
+class SQLiteDataStore(DataStore):
+    """DataStore kept in an SQLite database instead of a dictionary
+
+    Each entity type lives in its own table (Vehicle, Customer, Shipment,
+    Delivery) with one column per attribute, so the data does not have to fit
+    in memory and queries run on disk without building every object.
+
+    The database uses WAL journal mode so readers never wait for the writer.
+    All writes go through one connection guarded by a lock, while reads borrow
+    a connection from a small pool. Bulk writes can be grouped into a single
+    transaction with add_many or the batch() context manager. SQLite does
+    the locking of single operations itself; lock is only held by units of
+    work changing several stores (LogisticsService.writing).
+    """
+
+    # Columns of each table (besides the id primary key)
+    SCHEMAS = {
+        "Vehicle": ("type", "capacity", "status", "created_at"),
+        "Customer": ("name", "dob", "address", "email", "phone", "shipment_ids"),
+        "Shipment": ("customer_id", "origin", "destination", "weight",
+                     "vehicle_id", "status", "delivery_id"),
+        "Delivery": ("shipment_id", "delivery_date", "status"),
+    }
+    # Columns holding lists, stored as JSON text
+    JSON_COLUMNS = {"shipment_ids"}
+
+    def __init__(self, path, entity, pool_size=4, indexes=(), id_allocator=None, lock=None):
+        super().__init__(id_allocator=id_allocator, lock=lock)
+        if entity not in self.SCHEMAS:
+            raise ValueError(f"Unknown entity type: {entity}")
+        self.path = path
+        self.entity = entity
+        self.columns = self.SCHEMAS[entity]
+        self._batch_depth = 0
+        self._write_lock = threading.RLock()
+
+        # The writer connection also creates the schema
+        self._writer = self._connect()
+        self._writer.execute(
+            f"CREATE TABLE IF NOT EXISTS {entity} "
+            f"(id TEXT PRIMARY KEY, {', '.join(self.columns)})")
+        for field in indexes:
+            if field not in self.columns:
+                raise ValueError(f"Unknown column for {self.entity}: {field}")
+            self._writer.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{entity}_{field} ON {entity} ({field})")
+
+        # An in-memory database only exists on its own connection
+        self._readers = queue.Queue()
+        if path != ":memory:":
+            for _ in range(pool_size):
+                self._readers.put(self._connect())
+
+        # SQL is built once; sqlite3 keeps the prepared statements cached
+        column_list = ", ".join(self.columns)
+        self._select_sql = f"SELECT id, {column_list} FROM {entity}"
+        self._insert_sql = (f"INSERT INTO {entity} (id, {column_list}) "
+                            f"VALUES ({', '.join('?' * (len(self.columns) + 1))})")
+        self._update_sql = (f"UPDATE {entity} SET "
+                            f"{', '.join(f'{column} = ?' for column in self.columns)} "
+                            f"WHERE id = ?")
+        self._delete_sql = f"DELETE FROM {entity} WHERE id = ?"
+        self._find_sql = f"{self._select_sql} WHERE id = ?"
+        self._seed_id_allocator()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, isolation_level=None,
+                                     check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextlib.contextmanager
+    def _reader(self):
+        """Borrow a read connection from the pool"""
+        if self.path == ":memory:":
+            with self._write_lock:
+                yield self._writer
+            return
+        connection = self._readers.get()
+        try:
+            yield connection
+        finally:
+            self._readers.put(connection)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group every write made inside the block into one transaction"""
+        with self._write_lock:
+            if self._batch_depth == 0:
+                self._writer.execute("BEGIN IMMEDIATE")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._writer.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._writer.execute("COMMIT")
+
+    def _write(self, sql, parameters):
+        with self._write_lock:
+            return self._writer.execute(sql, parameters).rowcount
+
+    def _row_values(self, item):
+        record = item.to_dict()
+        return [json.dumps(record[column]) if column in self.JSON_COLUMNS else record[column]
+                for column in self.columns]
+
+    def _item_from_row(self, row):
+        record = {"entity": self.entity, "id": row[0]}
+        for column, value in zip(self.columns, row[1:]):
+            record[column] = json.loads(value) if column in self.JSON_COLUMNS else value
+        return item_from_dict(record)
+
+    def _id_exists(self, item_id):
+        # The primary key already refuses duplicates, and the allocator was
+        # seeded with the highest ID in the table when the store was opened
+        return False
+
+    def _seed_id_allocator(self):
+        """Let the allocator know about the highest ID already in the table"""
+        node = self.id_allocator.node
+        low = id_prefix(ENTITY_TYPES[self.entity]) + node
+        with self._reader() as connection:
+            row = connection.execute(
+                f"SELECT MAX(id) FROM {self.entity} WHERE id >= ? AND id < ? AND length(id) = ?",
+                (low, low + "~", ID_BODY_LENGTH + 1)).fetchone()
+        if row[0]:
+            self.id_allocator.observe(row[0])
+
+    def add(self, item):
+        """Add an item to the table with an auto-generated ID"""
+        item.id = self._generate_id(item)
+        self._write(self._insert_sql, [item.id] + self._row_values(item))
+        return item.id
+
+    def add_many(self, items):
+        """Add several items in a single transaction and return their IDs"""
+        rows = [[item.id] + self._row_values(item) for item in self._assign_ids(list(items))]
+        with self.batch():
+            self._writer.executemany(self._insert_sql, rows)
+        return [row[0] for row in rows]
+
+    def update(self, item_id, item):
+        """Update an existing item"""
+        return self._write(self._update_sql, self._row_values(item) + [item_id]) > 0
+
+    def remove(self, item_id):
+        """Remove an item by ID"""
+        return self._write(self._delete_sql, (item_id,)) > 0
+
+    def find(self, item_id):
+        """Find an item by ID"""
+        with self._reader() as connection:
+            row = connection.execute(self._find_sql, (item_id,)).fetchone()
+        return self._item_from_row(row) if row else None
+
+    def find_all(self):
+        """Return all items"""
+        return list(self.iter_all())
+
+    def iter_all(self, chunk_size=500):
+        """Yield every item in ID order, reading the table a chunk of rows at a time
+
+        Each chunk continues after the last ID of the previous one (keyset
+        pagination), so no connection is held between chunks and the first
+        items are returned without reading the rest of the table.
+        """
+        sql = f"{self._select_sql} WHERE id > ? ORDER BY id LIMIT ?"
+        last_id = ""
+        while True:
+            with self._reader() as connection:
+                rows = connection.execute(sql, (last_id, chunk_size)).fetchall()
+            for row in rows:
+                yield self._item_from_row(row)
+            if len(rows) < chunk_size:
+                break
+            last_id = rows[-1][0]
+
+    def find_where(self, **conditions):
+        """Return the items whose columns equal the given values
+
+        Example: shipment_store.find_where(vehicle_id="V1234567")
+        """
+        unknown = set(conditions) - set(self.columns)
+        if unknown:
+            raise ValueError(f"Unknown columns for {self.entity}: {', '.join(sorted(unknown))}")
+        sql = self._select_sql
+        if conditions:
+            sql += " WHERE " + " AND ".join(f"{column} = ?" for column in conditions)
+        with self._reader() as connection:
+            rows = connection.execute(sql, list(conditions.values())).fetchall()
+        return [self._item_from_row(row) for row in rows]
+
+    def find_by(self, field, value):
+        """Return the items whose field equals value (using the SQLite index)"""
+        return self.find_where(**{field: value})
+
+    def count(self):
+        """Return the number of items in the table"""
+        with self._reader() as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM {self.entity}").fetchone()[0]
+
+    def compact(self):
+        """Move the SQLite write-ahead log back into the database file"""
+        with self._write_lock:
+            self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """Close every connection of the store"""
+        while not self._readers.empty():
+            self._readers.get().close()
+        with self._write_lock:
+            self._writer.close()
+
+
+def shard_of(item_id, shards):
+    """Return the shard (0 to shards - 1) an ID belongs to, the same in every process"""
+    return zlib.crc32(item_id.encode("utf-8")) % shards
+
+
+def group_totals(store, field, value_field=None):
+    """Return {value of field: [items, total of value_field]} for the items of a store"""
+    totals = {}
+    for item in store.iter_all():
+        entry = totals.setdefault(getattr(item, field, None), [0, 0])
+        entry[0] += 1
+        if value_field:
+            entry[1] += getattr(item, value_field, None) or 0
+    return totals
+
+
+class ShardWorker:
+    """One shard of a ShardedDataStore: a DataStore served from its own process
+
+    Requests are (operation, arguments) tuples read from any of the
+    connections, one per client, and answered on the same connection with
+    (True, result) or (False, exception). Items travel as to_dict()
+    dictionaries.
+    """
+
+    def __init__(self, connections, wal_path=None, indexes=(), fsync_policy=FSYNC_ALWAYS,
+                 fsync_interval_ms=100):
+        self.connections = list(connections)
+        self.store = DataStore(wal_path, fsync_policy, fsync_interval_ms, indexes=indexes)
+        self._cursors = {}  # Cursor number -> iterator over a snapshot of the items
+        self._next_cursor = 0
+
+    def serve(self):
+        """Answer requests until a client sends "close" (or every client has gone)"""
+        while self.connections:
+            for connection in multiprocessing.connection.wait(self.connections):
+                try:
+                    operation, arguments = connection.recv()
+                except EOFError:
+                    self.connections.remove(connection)
+                    continue
+                if operation == "close":
+                    self.store.close()
+                    connection.send((True, None))
+                    return
+                try:
+                    result = (True, getattr(self, f"_{operation}")(*arguments))
+                except Exception as error:
+                    result = (False, error)
+                connection.send(result)
+        self.store.close()
+
+    def _put(self, records):
+        self.store.put_many([item_from_dict(record) for record in records])
+        return len(records)
+
+    def _update(self, item_id, record):
+        return self.store.update(item_id, item_from_dict(record))
+
+    def _remove(self, item_id):
+        return self.store.remove(item_id)
+
+    def _find(self, item_id):
+        item = self.store.find(item_id)
+        return item.to_dict() if item else None
+
+    def _find_all(self):
+        return [item.to_dict() for item in self.store.iter_all()]
+
+    def _find_where(self, conditions):
+        # An indexed condition narrows the items down first
+        indexed = [field for field in conditions if field in self.store.indexes]
+        items = (self.store.find_by(indexed[0], conditions[indexed[0]]) if indexed
+                 else self.store.iter_all())
+        return [item.to_dict() for item in items
+                if all(getattr(item, field, None) == value for field, value in conditions.items())]
+
+    def _scan(self, cursor, chunk_size):
+        if cursor is None:
+            cursor = self._next_cursor
+            self._next_cursor += 1
+            self._cursors[cursor] = self.store.iter_all()
+        chunk = [item.to_dict() for item in itertools.islice(self._cursors[cursor], chunk_size)]
+        if len(chunk) < chunk_size:
+            del self._cursors[cursor]
+            cursor = None
+        return cursor, chunk
+
+    def _count(self):
+        return len(self.store.data)
+
+    def _map(self, function, arguments):
+        return function(self.store, *arguments)
+
+    def _highest_id(self, prefix):
+        ids = [item_id for item_id in self.store.data
+               if item_id.startswith(prefix) and len(item_id) == ID_BODY_LENGTH + 1]
+        return max(ids) if ids else None
+
+    def _compact(self):
+        self.store.compact()
+
+
+def _run_shard_worker(connections, *arguments):
+    # Ctrl+C is for the main process, which then closes the shards
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ShardWorker(connections, *arguments).serve()
+
+
+def check_shard_count(data_dir, name, shards):
+    """Refuse to open the items of an entity with another number of shards than they were saved with
+
+    0 shards is a single store, name.wal. The number of shards is saved in
+    name.shards the first time the items are sharded, and items already
+    saved in a single store cannot be sharded afterwards: the program would
+    not see them.
+    """
+    path = os.path.join(data_dir, f"{name}.shards")
+    wal_path = os.path.join(data_dir, f"{name}.wal")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            saved = int(file.read().strip())
+        if saved != shards and shards:
+            raise ValueError(f"The data was split into {saved} shards; "
+                             f"it must be opened with {saved} shards")
+        if saved != shards:
+            raise ValueError(f"The {name} in {data_dir} were split into {saved} shards; "
+                             f"open them with --shards {saved}")
+    elif shards:
+        if os.path.exists(wal_path + ".snapshot") or (os.path.exists(wal_path)
+                                                      and os.path.getsize(wal_path)):
+            raise ValueError(f"The {name} in {data_dir} were saved without shards; "
+                             f"open them without --shards")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"{shards}\n")
+
+
+class ShardPool:
+    """Worker processes each holding one shard of the items of an entity
+
+    Every worker has a connection for each of the clients numbers, so that
+    several processes (each with its own ShardedDataStore) can use the same
+    shards at the same time. With a data directory each shard keeps its own
+    write-ahead log, name-<shard>.wal, and the number of shards is saved
+    next to them: IDs are placed by hashing them, so the data can only be
+    opened again with the same number of shards.
+    """
+
+    def __init__(self, shards=None, clients=1, data_dir=None, name="shipments", indexes=(),
+                 fsync_policy=FSYNC_ALWAYS, fsync_interval_ms=100):
+        self.shards = shards or os.cpu_count() or 1
+        if data_dir:
+            check_shard_count(data_dir, name, self.shards)
+        self._clients = [[] for _ in range(clients)]  # Client -> its connection to each shard
+        self._processes = []
+        for shard in range(self.shards):
+            worker_ends = []
+            for connections in self._clients:
+                client_end, worker_end = multiprocessing.Pipe()
+                connections.append(client_end)
+                worker_ends.append(worker_end)
+            wal_path = os.path.join(data_dir, f"{name}-{shard}.wal") if data_dir else None
+            process = multiprocessing.Process(
+                target=_run_shard_worker, daemon=True,
+                args=(worker_ends, wal_path, indexes, fsync_policy, fsync_interval_ms))
+            process.start()
+            for worker_end in worker_ends:
+                worker_end.close()
+            self._processes.append(process)
+
+    def connections(self, client=0):
+        """Return the connections of a client to every shard, in shard order"""
+        return self._clients[client]
+
+    def close(self):
+        """Make the workers close their shards and wait for them to stop"""
+        for connection in self._clients[0]:
+            try:
+                connection.send(("close", ()))
+                connection.recv()
+            except (EOFError, OSError):
+                pass  # The worker already stopped
+        for process in self._processes:
+            process.join(timeout=10)
+
+
+class ShardedDataStore(DataStore):
+    """DataStore whose items are split between the worker processes of a ShardPool
+
+    Each item lives in one shard, chosen from a hash of its ID (shard_of),
+    so add, find, update and remove only talk to the process owning the
+    item. Scans (find_all, find_by, find_where) and aggregates (count,
+    group_totals, map_shards) are sent to every shard at once, run in the
+    shards in parallel, and their results are merged.
+
+    Items are copies: change an item and call update to save it, as with
+    SQLiteDataStore. IDs are handed out by this client, so processes using
+    the same pool need different nodes in their IdAllocator. Store
+    number client of the pool is one of those processes; client 0 started
+    the pool and closes it. Throughput only grows with the shards when
+    several clients use them at once: a single client waits for each answer.
+    """
+
+    def __init__(self, pool, client=0, id_allocator=None, lock=None):
+        super().__init__(id_allocator=id_allocator, lock=lock)
+        self.pool = pool
+        self.client = client
+        self._connections = pool.connections(client)
+        # One request at a time on each connection
+        self._connection_locks = [threading.Lock() for _ in self._connections]
+        self._seed_id_allocator()
+
+    def _id_exists(self, item_id):
+        # The allocator was told the highest ID of every shard when the store opened
+        return False
+
+    def _seed_id_allocator(self):
+        """Let the allocator know about the highest IDs already in the shards"""
+        for entity in ENTITY_TYPES.values():
+            prefix = id_prefix(entity) + self.id_allocator.node
+            for item_id in self._everywhere("highest_id", prefix):
+                if item_id:
+                    self.id_allocator.observe(item_id)
+
+    def _call(self, shard, operation, *arguments):
+        """Send one request to a shard and return its result"""
+        with self._connection_locks[shard]:
+            connection = self._connections[shard]
+            connection.send((operation, arguments))
+            succeeded, result = connection.recv()
+        if not succeeded:
+            raise result
+        return result
+
+    def _scatter(self, requests):
+        """Send {shard: (operation, arguments)} to the shards at once; return {shard: result}
+
+        Every request is sent before any answer is read, so the shards work in
+        parallel. Connections are locked in shard order, as _call does.
+        """
+        shards = sorted(requests)
+        for shard in shards:
+            self._connection_locks[shard].acquire()
+        try:
+            for shard in shards:
+                self._connections[shard].send(requests[shard])
+            answers = {shard: self._connections[shard].recv() for shard in shards}
+        finally:
+            for shard in shards:
+                self._connection_locks[shard].release()
+        for succeeded, result in answers.values():
+            if not succeeded:
+                raise result
+        return {shard: result for shard, (_, result) in answers.items()}
+
+    def _everywhere(self, operation, *arguments):
+        """Run a request in every shard at once and return the results in shard order"""
+        results = self._scatter({shard: (operation, arguments)
+                                 for shard in range(len(self._connections))})
+        return [results[shard] for shard in range(len(self._connections))]
+
+    def _shard(self, item_id):
+        return shard_of(item_id, len(self._connections))
+
+    def add(self, item):
+        """Add an item to its shard with an auto-generated ID"""
+        item.id = self._generate_id(item)
+        self._call(self._shard(item.id), "put", [item.to_dict()])
+        return item.id
+
+    def add_many(self, items):
+        """Add several items at once, one request per shard, and return their IDs"""
+        items = self._assign_ids(list(items))
+        records = {}
+        for item in items:
+            records.setdefault(self._shard(item.id), []).append(item.to_dict())
+        if records:
+            self._scatter({shard: ("put", (shard_records,))
+                           for shard, shard_records in records.items()})
+        return [item.id for item in items]
+
+    def update(self, item_id, item):
+        """Update an existing item"""
+        return self._call(self._shard(item_id), "update", item_id, item.to_dict())
+
+    def remove(self, item_id):
+        """Remove an item by ID"""
+        return self._call(self._shard(item_id), "remove", item_id)
+
+    def find(self, item_id):
+        """Find an item by ID"""
+        record = self._call(self._shard(item_id), "find", item_id)
+        return item_from_dict(record) if record else None
+
+    def find_all(self):
+        """Return all items, read from every shard at once"""
+        return [item_from_dict(record) for records in self._everywhere("find_all")
+                for record in records]
+
+    def iter_all(self, chunk_size=500):
+        """Yield every item, reading one shard after the other a chunk of items at a time"""
+        for shard in range(len(self._connections)):
+            cursor = None
+            while True:
+                cursor, records = self._call(shard, "scan", cursor, chunk_size)
+                for record in records:
+                    yield item_from_dict(record)
+                if cursor is None:
+                    break
+
+    def find_by(self, field, value):
+        """Return the items whose field equals value (using the indexes of the shards)"""
+        return self.find_where(**{field: value})
+
+    def find_where(self, **conditions):
+        """Return the items whose fields equal the given values, searched in every shard at once
+
+        Example: shipment_store.find_where(vehicle_id="V1234567", status="Pending")
+        """
+        return [item_from_dict(record) for records in self._everywhere("find_where", conditions)
+                for record in records]
+
+    def count(self):
+        """Return the number of items in every shard"""
+        return sum(self._everywhere("count"))
+
+    def map_shards(self, function, *arguments):
+        """Run function(store of the shard, *arguments) in every shard at once; return the results
+
+        function must be defined at the top level of a module so that it can
+        be sent to the worker processes.
+        """
+        return self._everywhere("map", function, arguments)
+
+    def group_totals(self, field, value_field=None):
+        """Return {value of field: [items, total of value_field]} over every shard
+
+        Example: shipment_store.group_totals("status", "weight")
+        """
+        totals = {}
+        for shard_totals in self.map_shards(group_totals, field, value_field):
+            for value, (count, total) in shard_totals.items():
+                entry = totals.setdefault(value, [0, 0])
+                entry[0] += count
+                entry[1] += total
+        return totals
+
+    def compact(self):
+        """Fold the write-ahead log of every shard into a fresh snapshot"""
+        self._everywhere("compact")
+
+    def close(self):
+        """Close the shards, when this store is the client that started them"""
+        if self.client == 0:
+            self.pool.close()
+
+
+class ScriptInput:
+    """Answers read from a script (a file or stdin) instead of the keyboard
+
+    One answer per line, in the order the menus ask for them; an empty line
+    is pressing Enter and lines starting with # are comments. Reading past
+    the last line raises EOFError, which ends the program like quitting.
+    """
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self.answers = 0
+
+    def __call__(self, prompt=""):
+        for line in self._lines:
+            if not line.startswith("#"):
+                self.answers += 1
+                return line.rstrip("\r\n")
+        raise EOFError("end of the script")
+
+
+# Source of the answers in scripted mode (a ScriptInput), None when they are
+# typed at the keyboard
+script_input = None
+
+
+def read_input(prompt=""):
+    """Return the next answer: typed after the prompt, or the next line of the script"""
+    if script_input is None:
+        return input(prompt)
+    return script_input(prompt)
+
+
+def pause(prompt="Press Enter to continue..."):
+    """Wait for Enter, except in scripted mode"""
+    if script_input is None:
+        input(prompt)
+
+
+def format_timings(timings):
+    """Return a table of the time taken by each menu option run (name -> seconds of each run)."""
+    lines = [f"{'Command':<60} {'Runs':>6} {'Total ms':>10} {'Mean ms':>9} {'Max ms':>9}",
+             "=" * 98]
+    for name, seconds in sorted(timings.items(), key=lambda item: -sum(item[1])):
+        total = sum(seconds) * 1000
+        lines.append(f"{name:<60} {len(seconds):>6} {total:>10.2f} "
+                     f"{total / len(seconds):>9.3f} {max(seconds) * 1000:>9.3f}")
+    return "\n".join(lines) + "\n"
+
+
+class LatencyHistogram:
+    """Durations counted per bucket, with their sum, as Prometheus histograms keep them
+
+    counts[i] is the number of durations up to BUCKETS[i] seconds (and above
+    the previous bucket); the last count is for longer durations.
+    """
+
+    __slots__ = ("counts", "total", "count")
+
+    BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+               0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, fraction):
+        """Return the upper bound of the bucket holding the given fraction of the durations"""
+        wanted = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.BUCKETS, self.counts):
+            seen += count
+            if seen >= wanted:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    """Latency histograms and counters of the menu actions and data store operations
+
+    Nothing is measured until enable() is called (main --metrics). Menus
+    then time every action they run, and the stores made afterwards are
+    wrapped by instrument_store(). Stores made while metrics are off are
+    left untouched, so they cost nothing. to_prometheus() returns everything
+    in the Prometheus text format.
+    """
+
+    HELP = {
+        "lms_menu_action_seconds": ("histogram", "Time taken by the actions of the menus."),
+        "lms_menu_action_errors_total": ("counter", "Menu actions that ended with an error."),
+        "lms_store_operation_seconds": ("histogram", "Time taken by the data store operations."),
+        "lms_store_operation_errors_total": ("counter", "Data store operations that raised an error."),
+    }
+    STORE_OPERATIONS = ("add", "add_many", "update", "remove", "find", "find_all", "find_by",
+                        "compact")
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None  # File written by write()
+        self.histograms = {}  # (metric, labels) -> LatencyHistogram
+        self.counters = {}  # (metric, labels) -> count
+
+    def enable(self, path=None):
+        self.enabled = True
+        self.path = path
+
+    def observe(self, metric, labels, seconds):
+        """Add a duration to the histogram of a metric; labels is a tuple of (name, value)"""
+        histogram = self.histograms.get((metric, labels))
+        if histogram is None:
+            histogram = self.histograms[(metric, labels)] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def increment(self, metric, labels, amount=1):
+        self.counters[(metric, labels)] = self.counters.get((metric, labels), 0) + amount
+
+    def timed(self, function, metric, errors, labels):
+        """Return function wrapped to record its duration, and its errors in the errors counter"""
+        histogram = self.histograms.setdefault((metric, labels), LatencyHistogram())
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            except Exception:
+                self.increment(errors, labels)
+                raise
+            finally:
+                histogram.observe(clock() - start)
+        return wrapper
+
+    def instrument_store(self, store, entity):
+        """Time the operations of a store when metrics are enabled; return the store"""
+        if self.enabled:
+            for operation in self.STORE_OPERATIONS:
+                setattr(store, operation, self.timed(
+                    getattr(store, operation), "lms_store_operation_seconds",
+                    "lms_store_operation_errors_total", (("store", entity), ("operation", operation))))
+        return store
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = []
+        for name, value in labels + extra:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs.append(f'{name}="{value}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def to_prometheus(self):
+        """Return every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric, (kind, help_text) in self.HELP.items():
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            for (name, labels), value in sorted(self.counters.items()):
+                if name == metric:
+                    lines.append(f"{metric}{self._labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                if name != metric:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{self._labels(labels, (('le', bound),))} {cumulative}")
+                lines.append(f"{metric}_sum{self._labels(labels)} {histogram.total:.9f}")
+                lines.append(f"{metric}_count{self._labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path=None):
+        """Write the metrics to a file at once (written aside, then renamed); return the path"""
+        path = path or self.path
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
+        os.replace(temporary, path)
+        return path
+
+
+# Metrics of this process, off unless main is started with --metrics
+metrics = Metrics()
 
 
 class Menu:
     """Base Menu class that all submenus will inherit from
 
     This is the foundation for all menus in the system.
+    Choices are found with a dictionary lookup by number or by name. When
+    timings is a dictionary (scripted mode) the time of every option run is
+    added to it, except for options that open another menu. The same runs
+    are recorded in the metrics when they are enabled.
     """
 
+    page_size = 20  # Records per page in listings
+    timings = None  # "Menu > option" -> seconds of each run
+
     def __init__(self, title):
         self.title = title
         self.options = []
         self.quit_options = ['q', 'Q', 'quit', 'Quit', '0']
+        self._numbers = {}  # Option number -> option
+        self._descriptions = {}  # Lower-case description -> option
 
     def add_option(self, option_num, description, function):
         """Add an option to the menu"""
-        self.options.append({
+        option = {
             'number': option_num,
             'description': description,
-            'function': function
-        })
+            'function': function,
+            # Opening another menu is not a command of its own
+            'timed': getattr(function, '__func__', None) is not Menu.execute,
+        }
+        self.options.append(option)
+        self._numbers.setdefault(str(option_num), option)
+        self._descriptions.setdefault(description.lower(), option)
 
     def display(self):
         """Display the menu options"""
@@ -143,34 +1459,792 @@ class Menu:
     def execute(self):
         """Execute the menu and handle user input"""
         while True:
-            self.display()
-            choice = input("\nSelect the menu to display (You can choose either the name "
-                           "or the number of the desired menu): ")
+            if script_input is None:
+                self.display()
+            choice = read_input("\nSelect the menu to display (You can choose either the name "
+                                "or the number of the desired menu): ")
 
             # Check if user wants to quit
             if choice in self.quit_options:
                 print(f"Exiting {self.title}...")
                 break
 
-            # Find the selected option
-            selected = None
-            for option in self.options:
-                # Check for number match
-                if choice == str(option['number']) or choice == option['number']:
-                    selected = option
-                    break
-                # Check for text match (case insensitive)
-                elif option['description'].lower() == choice.lower():
-                    selected = option
-                    break
+            # Find the selected option by number, or by name (case insensitive)
+            selected = self._numbers.get(choice) or self._descriptions.get(choice.lower())
 
             # Execute the selected function or display error
-            if selected:
+            if not selected:
+                print("Invalid option. Please try again.")
+            elif not selected['timed'] or (self.timings is None and not metrics.enabled):
                 selected['function']()
+            else:
+                self._run_timed(selected)
+
+    def _run_timed(self, option):
+        labels = (("menu", self.title), ("action", option['description']))
+        start = time.perf_counter()
+        try:
+            option['function']()
+        except Exception:
+            if metrics.enabled:
+                metrics.increment("lms_menu_action_errors_total", labels)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.timings is not None:
+                self.timings.setdefault(f"{self.title} > {option['description']}", []).append(elapsed)
+            if metrics.enabled:
+                metrics.observe("lms_menu_action_seconds", labels, elapsed)
+
+    def browse(self, make_records, render, empty_message):
+        """Show a listing page by page and offer to save all of it to a file
+
+        make_records returns a fresh lazy iterator over the records and
+        render turns one record into the text shown for it.
+        """
+        pager = Pager(make_records(), render, self.page_size)
+        if not pager.next_page():
+            print(empty_message)
+            return
+
+        while True:
+            choices = []
+            if pager.has_next():
+                choices.append("[n]ext")
+            if pager.has_previous():
+                choices.append("[p]revious")
+            choices += ["[s]ave all to a file", "[q]uit"]
+            choice = read_input(f"{', '.join(choices)}: ").strip().lower()
+
+            if choice in ('n', '') and pager.has_next():
+                pager.next_page()
+            elif choice == 'p' and pager.has_previous():
+                pager.previous_page()
+            elif choice == 's':
+                path = read_input("Enter the file name: ").strip()
+                try:
+                    count = write_listing(make_records(), render, path)
+                except OSError as error:
+                    print(f"Error: could not write {path}: {error}")
+                    continue
+                print(f"{count} records written to {path}")
+            elif choice in ('q', ''):
+                break
             else:
                 print("Invalid option. Please try again.")
 
 
+class Pager:
+    """Shows records a page at a time, reading them from a lazy iterator
+
+    Only the pages already shown are kept (so going back is possible), so
+    the first page appears after reading page_size records, whatever the
+    size of the store. Each page is rendered into a single string and
+    written to the output with one call.
+    """
+
+    def __init__(self, records, render, page_size=20, output=None):
+        self._records = iter(records)
+        self.render = render
+        self.page_size = page_size
+        self.output = output or sys.stdout
+        self.pages = []
+        self.page = -1  # Index of the page on screen
+        self._exhausted = False
+
+    def _load(self, page):
+        while len(self.pages) <= page and not self._exhausted:
+            records = list(itertools.islice(self._records, self.page_size))
+            if records:
+                self.pages.append(records)
+            self._exhausted = len(records) < self.page_size
+
+    def has_next(self):
+        self._load(self.page + 1)
+        return self.page + 1 < len(self.pages)
+
+    def has_previous(self):
+        return self.page > 0
+
+    def next_page(self):
+        """Show the next page; return False when there is none."""
+        if not self.has_next():
+            return False
+        self.page += 1
+        self.show()
+        return True
+
+    def previous_page(self):
+        """Show the previous page; return False when there is none."""
+        if not self.has_previous():
+            return False
+        self.page -= 1
+        self.show()
+        return True
+
+    def show(self):
+        records = self.pages[self.page]
+        first = self.page * self.page_size + 1
+        footer = f"Page {self.page + 1} (records {first}-{first + len(records) - 1})\n"
+        self.output.write("".join(map(self.render, records)) + footer)
+        self.output.flush()
+
+
+def write_listing(records, render, path, chunk_size=1000):
+    """Write every record to a text file with one write per chunk; return the number written"""
+    count = 0
+    records = iter(records)
+    with open(path, "w", encoding="utf-8") as file:
+        for chunk in iter(lambda: list(itertools.islice(records, chunk_size)), []):
+            file.write("".join(map(render, chunk)))
+            count += len(chunk)
+    return count
+
+
+# Validation patterns shared by the menus, the service layer and the importer,
+# compiled once when the module is loaded
+
+# Names and vehicle types: letters and spaces only
+LETTERS_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z\s]*$')
+
+# Australian street address (the named groups are kept by Address)
+AU_ADDRESS_PATTERN = re.compile(r"""
+    ^
+    (?:(?:Unit|Apt|Apartment|Flat)\s*\d+[a-zA-Z]?[/\-\s]+)?  # Optional unit
+    \d+[a-zA-Z]?(?:\s*-\s*\d+[a-zA-Z]?)?                     # Street number
+    \s+
+    (?:[A-Za-z][A-Za-z']+(?:\s+[A-Za-z][A-Za-z']+)*)         # Street name
+    \s+
+    (?P<street_type>Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Court|Ct|Place|Pl|Parade|Pde|Boulevard|Blvd|Terrace|Tce|Way|Highway|Hwy|Crescent|Cres|Circuit|Cct|Square|Sq|Close|Cl)\.?
+    \s*,?\s*
+    (?P<suburb>[A-Za-z][A-Za-z\s'-]+)                        # Suburb
+    \s+
+    (?P<state>NSW|VIC|QLD|SA|WA|TAS|NT|ACT)                 # State
+    \s+
+    (?P<postcode>\d{4})                                      # Postcode
+    $
+""", re.VERBOSE | re.IGNORECASE)
+
+# Birthday: dd-mm-yyyy (the day and month can have one digit, as strptime allows)
+BIRTHDAY_PATTERN = re.compile(r'^(\d{1,2})-(\d{1,2})-(\d{4})$')
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Australian phone patterns (checked after removing PHONE_SEPARATORS)
+PHONE_SEPARATORS = re.compile(r'[\s\-\(\)]')
+MOBILE_PATTERN = re.compile(r'^(?:\+?61|0)4\d{8}$')  # Mobile: 04XX XXX XXX or +614XX XXX XXX
+LANDLINE_PATTERN = re.compile(r'^(?:\+?61|0)[2378]\d{8}$')  # Landline: 02/03/07/08 XXXX XXXX
+
+# Shipment origin/destination: street and number, suburb, zipcode
+SHIPMENT_ADDRESS_PATTERN = re.compile(r'^([a-zA-Z0-9][a-zA-Z0-9\s\-]{2,}),'
+                                      r'\s*([a-zA-Z][a-zA-Z\s-]{2,}),\s*([a-zA-Z0-9]{4,10})$')
+
+WEIGHT_PATTERN = re.compile(r'^\d+(\.\d+)?')
+
+
+# Field checks: each one tells whether a value is valid, without raising,
+# so whole columns can be checked quickly (see ValidatorRegistry.mask).
+
+def is_vehicle_type(value):
+    """Tell whether a value is a valid vehicle type."""
+    vehicle_type = str(value).strip()
+    return LETTERS_PATTERN.match(vehicle_type) is not None and len(vehicle_type) >= 3
+
+
+def is_capacity(value):
+    """Tell whether a value is a positive, finite capacity."""
+    try:
+        capacity = float(value)
+        return capacity > 0 and math.isfinite(capacity)
+    except (TypeError, ValueError):
+        return False
+
+
+def is_customer_name(value):
+    """Tell whether a value is a first and last name."""
+    name = str(value).strip()
+    return LETTERS_PATTERN.match(name) is not None and len(name) >= 6 and len(name.split()) >= 2
+
+
+def is_birthday(value):
+    """Tell whether a value is a dd-mm-yyyy birthday of someone between 18 and 120 years old."""
+    match = BIRTHDAY_PATTERN.match(str(value).strip())
+    if match is None:
+        return False
+    day, month, year = map(int, match.groups())
+    try:
+        born = datetime.date(year, month, day)
+    except ValueError:
+        return False
+    today = datetime.date.today()
+    age = today.year - year - ((today.month, today.day) < (month, day))
+    return born <= today and 18 <= age <= 120
+
+
+def is_au_address(value):
+    """Tell whether a value is an Australian street address."""
+    address = str(value).strip()
+    return AU_ADDRESS_PATTERN.match(address) is not None and len(address.split()) >= 5
+
+
+def is_email(value):
+    """Tell whether a value is an email address."""
+    email = str(value).strip()
+    return EMAIL_PATTERN.match(email) is not None and len(email) >= 6 and email.count('@') == 1
+
+
+def is_phone(value):
+    """Tell whether a value is an Australian mobile or landline number."""
+    # Remove spaces, dashes, and parentheses for validation
+    cleaned_phone = PHONE_SEPARATORS.sub('', str(value).strip())
+    return (MOBILE_PATTERN.match(cleaned_phone) is not None
+            or LANDLINE_PATTERN.match(cleaned_phone) is not None)
+
+
+def normalize_phone(value):
+    """Return the digits of a phone number, with +61 replaced by the leading 0."""
+    digits = PHONE_SEPARATORS.sub('', str(value).strip())
+    if digits.startswith('+61'):
+        return '0' + digits[3:]
+    if digits.startswith('61') and len(digits) == 11:
+        return '0' + digits[2:]
+    return digits
+
+
+def is_shipment_address(value):
+    """Tell whether a value is a 'street and number, suburb, zipcode' address."""
+    return SHIPMENT_ADDRESS_PATTERN.match(str(value)) is not None
+
+
+def is_weight(value):
+    """Tell whether a value is a positive, finite weight."""
+    weight_input = str(value).strip()
+    if WEIGHT_PATTERN.match(weight_input) is None:
+        return False
+    try:
+        weight = float(weight_input)
+        return weight > 0 and math.isfinite(weight)
+    except ValueError:
+        return False
+
+
+class Address:
+    """A validated address, parsed once into the parts region queries need
+
+    text is the address exactly as it was validated and is shown. suburb,
+    state, postcode and street_type are interned (sys.intern), so all the
+    addresses of a suburb share a single copy of each part. Addresses are
+    canonical while they are among the ADDRESS_CACHE_SIZE most recently
+    used: as_address() then returns the same object for the same text, so
+    every shipment going to or from one place, or using its customer's
+    address, points at one Address instead of holding its own string.
+
+    street_type is only set for Australian street addresses. "street and
+    number, suburb, zipcode" shipment addresses have no state of their own,
+    so theirs comes from the postcode. Text in neither format (saved by
+    older versions) has no street type, suburb or postcode.
+    """
+
+    __slots__ = ("text", "street_type", "suburb", "state", "postcode")
+
+    def __init__(self, text, street_type=None, suburb=None, state=None, postcode=None):
+        self.text = text
+        self.street_type = street_type
+        self.suburb = suburb
+        self.state = state
+        self.postcode = postcode
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"Address({self.text!r})"
+
+    def __format__(self, spec):
+        return format(self.text, spec)
+
+    def __eq__(self, other):
+        # Equal to another Address or a plain string with the same text
+        if isinstance(other, Address):
+            return self.text == other.text
+        if isinstance(other, str):
+            return self.text == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.text)
+
+    def in_region(self, state=None, suburb=None, postcode=None):
+        """Tell whether the address is in the given state, suburb and postcode (None matches any)"""
+        return ((state is None or self.state == state.upper())
+                and (suburb is None or self.suburb == suburb.strip().title())
+                and (postcode is None or self.postcode == str(postcode).strip().upper()))
+
+
+# Addresses kept canonical, the least recently used dropped first, so that
+# a long run over mostly different addresses does not grow without bound
+ADDRESS_CACHE_SIZE = 65_536
+
+
+def _intern(value):
+    return None if value is None else sys.intern(value)
+
+
+@functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _canonical_address(text):
+    """Return the Address of a text; one in no known format only has its text and state
+
+    The text is matched against the patterns only when it is not cached.
+    lru_cache is safe to call from several threads.
+    """
+    # The two formats never match the same text; shipment addresses are the
+    # most common, so they are tried first
+    match = SHIPMENT_ADDRESS_PATTERN.match(text.lower())
+    if match:
+        _, suburb, zipcode = match.groups()
+        return Address(text, None, _intern(suburb.strip().title()),
+                       _intern(address_state(text)), _intern(zipcode.upper()))
+    match = AU_ADDRESS_PATTERN.match(text.strip())
+    if not match or len(text.split()) < 5:
+        return Address(text, state=_intern(address_state(text)))
+    return Address(text, _intern(match["street_type"].title()),
+                   _intern(match["suburb"].strip().title()),
+                   _intern(match["state"].upper()), _intern(match["postcode"]))
+
+
+def parse_address(text):
+    """Return the canonical Address of a valid address text, or None if it is in no known format"""
+    address = _canonical_address(text)
+    # Both formats have a suburb
+    return address if address.suburb is not None else None
+
+
+def as_address(value):
+    """Return value as a canonical Address; None stays None
+
+    Used for addresses read back from storage, which were validated when
+    they were entered. Text in no known format still gets an Address, with
+    only its text and the state found in it.
+    """
+    if value is None or isinstance(value, Address):
+        return value
+    return _canonical_address(str(value))
+
+
+def address_text(address):
+    """Return the text of an address for storage (None stays None)."""
+    return None if address is None else str(address)
+
+
+# Field validators used by the service layer, the menus and the importer.
+# Each one returns the cleaned value or raises ValueError with the message
+# the menus show to the user.
+
+def clean_vehicle_type(value):
+    """Return the vehicle type in title case."""
+    if is_vehicle_type(value):
+        return str(value).strip().title()
+    raise ValueError("The vehicle type must contain only "
+                     "letters or spaces and be at least 3 characters long.")
+
+
+def clean_capacity(value):
+    """Return a positive, finite capacity, as an int when it has no decimals."""
+    try:
+        capacity = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("Please validate your input. Only numbers are allowed.") from None
+    if not capacity > 0:
+        raise ValueError("Please validate your input, no zero values are allowed.")
+    if not math.isfinite(capacity):
+        raise ValueError("Please validate your input. The capacity is too large.")
+    return int(capacity) if capacity.is_integer() else capacity
+
+
+def clean_customer_name(value):
+    """Return a first and last name in title case."""
+    if is_customer_name(value):
+        return str(value).strip().title()
+    raise ValueError("The customer name must contain at least two words "
+                     "(first and last name), only letters or spaces, "
+                     "and be at least 6 characters long.")
+
+
+def clean_birthday(value):
+    """Return a dd-mm-yyyy birthday of a customer between 18 and 120 years old."""
+    try:
+        d = datetime.datetime.strptime(str(value).strip(), '%d-%m-%Y')
+    except ValueError:
+        raise ValueError("Invalid date format! Please use dd-mm-yyyy format.") from None
+    today = datetime.datetime.now()
+
+    # Check if date is in the future
+    if d > today:
+        raise ValueError("Birthday cannot be in the future!")
+
+    # Check if age is reasonable (not over 120 years)
+    age = today.year - d.year - ((today.month, today.day) < (d.month, d.day))
+    if age > 120:
+        raise ValueError("Please enter a valid birthday (age cannot exceed 120 years).")
+    if age < 18:
+        raise ValueError("You are under 18 years. You need to be over 18 years to use the program.")
+    return d.strftime('%d-%m-%Y')
+
+
+def clean_au_address(value):
+    """Return the Address of an Australian street address, in title case."""
+    address = parse_address(str(value).title().strip())
+    if address is not None and address.street_type is not None:
+        return address
+    raise ValueError("Please enter a valid Australian address.\n"
+                     "Format: [Unit/]Number Street Name, Suburb STATE Postcode\n"
+                     "Example: 123 Smith Street, Surry Hills NSW 2000\n"
+                     "Example: Unit 5/123 Park Road, Melbourne VIC 3000")
+
+
+def clean_email(value):
+    """Return the email address in lower case."""
+    if is_email(value):
+        return str(value).strip().lower()
+    raise ValueError("Please enter a valid email address.\n"
+                     "Format: username@domain.com\n"
+                     "Example: john.smith@email.com")
+
+
+def clean_phone(value):
+    """Return an Australian mobile or landline number as it was typed."""
+    if is_phone(value):
+        return str(value).strip()
+    raise ValueError("Please enter a valid Australian phone number.\n"
+                     "Mobile format: 04XX XXX XXX or +614XX XXX XXX\n"
+                     "Landline format: (0X) XXXX XXXX or +61X XXXX XXXX\n"
+                     "Examples: 0412 345 678, (02) 1234 5678, +61 412 345 678")
+
+
+def split_shipment_address(value):
+    """Return the (street and number, suburb, zipcode) parts of a shipment address."""
+    match = SHIPMENT_ADDRESS_PATTERN.match(str(value).lower())
+    if not match:
+        raise ValueError("Invalid address format. Please use: street and number, suburb, zipcode")
+    return match.groups()
+
+
+def clean_shipment_address(value):
+    """Return the Address of a 'street and number, suburb, zipcode' address, in title case."""
+    address = parse_address(str(value).lower().title())
+    if address is None or address.street_type is not None:
+        # Raises the error message
+        split_shipment_address(value)
+    return address
+
+
+def clean_weight(value):
+    """Return a positive, finite weight in kg, as an int when it has no decimals."""
+    weight_input = str(value).strip()
+    if not weight_input:
+        raise ValueError("Weight cannot be empty. Please enter a valid weight.")
+    try:
+        if not WEIGHT_PATTERN.match(weight_input):
+            raise ValueError
+        weight = float(weight_input)
+    except ValueError:
+        raise ValueError("This is not a valid input. Try again.\n"
+                         "Remember that only positive numbers are allowed") from None
+    if weight <= 0:
+        raise ValueError("Weight must be greater than zero. Please enter a positive weight.")
+    if not math.isfinite(weight):
+        raise ValueError("This weight is too large. Please enter a valid weight.")
+    return int(weight) if weight.is_integer() else weight
+
+
+class ValidatorRegistry:
+    """Field validation rules by name, for single values and for whole columns
+
+    Each rule has a clean function (returns the cleaned value or raises
+    ValueError with the message for the user) and a check function (returns
+    True or False without raising). mask() runs the check over a list of
+    values, which is how bulk imports and API calls can test millions of
+    fields without building an exception for every bad one.
+    """
+
+    def __init__(self):
+        self.rules = {}
+
+    def register(self, name, clean, check=None):
+        """Add a rule; without a check, a value is valid when clean accepts it"""
+        if check is None:
+            def check(value):
+                try:
+                    clean(value)
+                except ValueError:
+                    return False
+                return True
+        self.rules[name] = (clean, check)
+
+    def names(self):
+        """Return the names of the rules"""
+        return list(self.rules)
+
+    def _rule(self, name):
+        try:
+            return self.rules[name]
+        except KeyError:
+            raise ValueError(f"Unknown validation rule: {name}") from None
+
+    def clean(self, name, value):
+        """Return the cleaned value, or raise ValueError with the reason"""
+        return self._rule(name)[0](value)
+
+    def is_valid(self, name, value):
+        """Tell whether one value passes a rule"""
+        return self._rule(name)[1](value)
+
+    def mask(self, name, values):
+        """Return a list with True for each value that passes a rule and False for the others"""
+        return list(map(self._rule(name)[1], values))
+
+
+VALIDATORS = ValidatorRegistry()
+VALIDATORS.register("vehicle_type", clean_vehicle_type, is_vehicle_type)
+VALIDATORS.register("capacity", clean_capacity, is_capacity)
+VALIDATORS.register("customer_name", clean_customer_name, is_customer_name)
+VALIDATORS.register("birthday", clean_birthday, is_birthday)
+VALIDATORS.register("au_address", clean_au_address, is_au_address)
+VALIDATORS.register("email", clean_email, is_email)
+VALIDATORS.register("phone", clean_phone, is_phone)
+VALIDATORS.register("shipment_address", clean_shipment_address, is_shipment_address)
+VALIDATORS.register("weight", clean_weight, is_weight)
+
+
+# Tracking status chosen by the status code of a shipment ID
+# (the sum of its characters modulo the number of messages)
+SHIPMENT_STATUS_MESSAGES = (
+    "Your shipment is being processed",
+    "Your shipment is in transit",
+    "Your shipment is out for delivery",
+    "Your shipment is at the destination facility",
+)
+
+
+def shipment_status_codes(shipment_ids):
+    """Return the status code of each shipment ID, all computed in one pass
+
+    With NumPy the IDs are packed into a fixed-width byte array (shorter IDs
+    are padded with zero bytes, which add nothing) and summed row by row.
+    Short lists, IDs that are not ASCII or a missing NumPy use the plain loop.
+    """
+    if np is not None and len(shipment_ids) >= 64:
+        try:
+            ids = np.array(shipment_ids, dtype=bytes)
+        except UnicodeEncodeError:
+            pass
+        else:
+            sums = ids.view(np.uint8).reshape(len(ids), ids.itemsize).sum(axis=1, dtype=np.int64)
+            return (sums % len(SHIPMENT_STATUS_MESSAGES)).tolist()
+    return [sum(map(ord, shipment_id)) % len(SHIPMENT_STATUS_MESSAGES)
+            for shipment_id in shipment_ids]
+
+
+# Australian public holidays used for delivery estimates. Each rule is one of:
+#   ("date", month, day, observed)   fixed date; when observed is True a date
+#                                     on a weekend moves to the next working day
+#   ("weekday", month, weekday, n)    nth weekday of the month (0 = Monday,
+#                                     n = -1 for the last one)
+#   ("after", month, day, weekday)    first weekday on or after the date
+#   ("easter", days)                  days from Easter Sunday
+# "AU" holds the national holidays, the other keys the extra ones of each state.
+AU_HOLIDAY_RULES = {
+    "AU": (
+        ("date", 1, 1, True),     # New Year's Day
+        ("date", 1, 26, True),    # Australia Day
+        ("easter", -2),           # Good Friday
+        ("easter", 1),            # Easter Monday
+        ("date", 4, 25, False),   # Anzac Day
+        ("date", 12, 25, True),   # Christmas Day
+        ("date", 12, 26, True),   # Boxing Day
+    ),
+    "NSW": (("weekday", 6, 0, 2), ("weekday", 10, 0, 1)),
+    "VIC": (("weekday", 3, 0, 2), ("weekday", 6, 0, 2), ("weekday", 11, 1, 1)),
+    "QLD": (("weekday", 5, 0, 1), ("weekday", 10, 0, 1)),
+    "SA": (("weekday", 3, 0, 2), ("weekday", 6, 0, 2), ("weekday", 10, 0, 1)),
+    "WA": (("weekday", 3, 0, 1), ("weekday", 6, 0, 1), ("weekday", 9, 0, -1)),
+    "TAS": (("weekday", 3, 0, 2), ("weekday", 6, 0, 2)),
+    "NT": (("weekday", 5, 0, 1), ("weekday", 6, 0, 2), ("weekday", 8, 0, 1)),
+    "ACT": (("weekday", 3, 0, 2), ("after", 5, 27, 0), ("weekday", 6, 0, 2),
+            ("weekday", 10, 0, 1)),
+}
+
+STATE_PATTERN = re.compile(r'\b(NSW|VIC|QLD|SA|WA|TAS|NT|ACT)\b', re.IGNORECASE)
+POSTCODE_PATTERN = re.compile(r'\b\d{4}\b')
+
+# Postcode ranges of each state, for addresses that only give a postcode
+POSTCODE_STATES = (
+    (200, 299, "ACT"), (800, 999, "NT"), (1000, 2599, "NSW"), (2600, 2618, "ACT"),
+    (2619, 2899, "NSW"), (2900, 2920, "ACT"), (2921, 2999, "NSW"), (3000, 3999, "VIC"),
+    (4000, 4999, "QLD"), (5000, 5999, "SA"), (6000, 6999, "WA"), (7000, 7999, "TAS"),
+    (8000, 8999, "VIC"), (9000, 9999, "QLD"),
+)
+
+
+def address_state(address):
+    """Return the state of an Australian address from its state or postcode, or None."""
+    match = STATE_PATTERN.search(str(address))
+    if match:
+        return match.group(1).upper()
+    postcodes = POSTCODE_PATTERN.findall(str(address))
+    if postcodes:
+        postcode = int(postcodes[-1])
+        for first, last, state in POSTCODE_STATES:
+            if first <= postcode <= last:
+                return state
+    return None
+
+
+def easter_sunday(year):
+    """Return the date of Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def holiday_dates(rules, year):
+    """Return the set of holiday dates the rules give for one year."""
+    holidays, observed = set(), []
+    for rule in rules:
+        kind = rule[0]
+        if kind == "date":
+            day = datetime.date(year, rule[1], rule[2])
+            if rule[3] and day.weekday() >= 5:
+                observed.append(day)
+            else:
+                holidays.add(day)
+        elif kind == "weekday":
+            _, month, weekday, n = rule
+            if n > 0:
+                first = datetime.date(year, month, 1)
+                day = first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+            else:
+                last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+                day = last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+            holidays.add(day)
+        elif kind == "after":
+            _, month, day_of_month, weekday = rule
+            start = datetime.date(year, month, day_of_month)
+            holidays.add(start + datetime.timedelta(days=(weekday - start.weekday()) % 7))
+        elif kind == "easter":
+            holidays.add(easter_sunday(year) + datetime.timedelta(days=rule[1]))
+        else:
+            raise ValueError(f"Unknown holiday rule: {rule}")
+
+    # Weekend holidays move to the next working day that is not already a holiday
+    for day in sorted(observed):
+        while day.weekday() >= 5 or day in holidays:
+            day += datetime.timedelta(days=1)
+        holidays.add(day)
+    return holidays
+
+
+def add_weekdays(start, days):
+    """Return the date that is days weekdays (Monday to Friday) after start, in O(1)."""
+    weekday = start.weekday()
+    if weekday >= 5:
+        # Counting from a weekend is the same as counting from the Friday before
+        start -= datetime.timedelta(days=weekday - 4)
+        weekday = 4
+    weeks, rest = divmod(days, 5)
+    return start + datetime.timedelta(days=7 * weeks + rest + (2 if weekday + rest > 4 else 0))
+
+
+class BusinessCalendar:
+    """Working days of one region: Monday to Friday except its public holidays
+
+    Holidays come from rules in the AU_HOLIDAY_RULES format and are worked
+    out per year the first time a date in that year is needed. Adding
+    working days is closed-form weekday arithmetic plus one correction per
+    holiday crossed (found by binary search), instead of a day-by-day walk.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = tuple(rules)
+        self._years = set()
+        self._holidays = []  # Sorted ordinals of the holidays falling on weekdays
+        self._numpy_calendar = None
+
+    def _cover(self, first_year, last_year):
+        years = set(range(first_year, last_year + 1)) - self._years
+        if not years:
+            return
+        for year in years:
+            self._holidays.extend(day.toordinal() for day in holiday_dates(self.rules, year)
+                                  if day.weekday() < 5)
+        self._holidays.sort()
+        self._years |= years
+        self._numpy_calendar = None
+
+    def _holidays_between(self, after, until):
+        """Count the weekday holidays in the interval (after, until]."""
+        return (bisect.bisect_right(self._holidays, until.toordinal())
+                - bisect.bisect_right(self._holidays, after.toordinal()))
+
+    def holidays(self, year):
+        """Return the sorted holiday dates of a year."""
+        return sorted(holiday_dates(self.rules, year))
+
+    def is_business_day(self, day):
+        """Tell whether a date is a working day."""
+        self._cover(day.year, day.year)
+        ordinal = day.toordinal()
+        index = bisect.bisect_left(self._holidays, ordinal)
+        return day.weekday() < 5 and not (index < len(self._holidays)
+                                          and self._holidays[index] == ordinal)
+
+    def add_business_days(self, start, days):
+        """Return the date that is days working days after start (start itself not counted)."""
+        if days <= 0:
+            return start
+        end = add_weekdays(start, days)
+        self._cover(start.year, end.year + 1)
+        extra = self._holidays_between(start, end)
+        while extra:
+            previous, end = end, add_weekdays(end, extra)
+            self._cover(end.year, end.year + 1)
+            extra = self._holidays_between(previous, end)
+        return end
+
+    def add_business_days_batch(self, start, days):
+        """Return start plus each number of working days in days, as YYYY-MM-DD strings
+
+        Uses a single numpy.busday_offset call when NumPy is installed.
+        """
+        if not days:
+            return []
+        if np is None:
+            return [self.add_business_days(start, count).strftime('%Y-%m-%d') for count in days]
+        # Cover every year the furthest date can reach
+        self._cover(start.year, add_weekdays(start, 2 * max(days) + 30).year)
+        if self._numpy_calendar is None:
+            epoch = datetime.date(1970, 1, 1).toordinal()
+            self._numpy_calendar = np.busdaycalendar(
+                holidays=(np.array(self._holidays, dtype=np.int64) - epoch).astype('datetime64[D]'))
+        start = np.datetime64(start, 'D')
+        days = np.asarray(days, dtype=np.int64)
+        ends = np.busday_offset(start, days, roll='backward', busdaycal=self._numpy_calendar)
+        ends = np.where(days > 0, ends, start)
+        return np.datetime_as_string(ends, unit='D').tolist()
+
+
+def format_timestamp(timestamp):
+    """Format a Unix timestamp as YYYY-MM-DD HH:MM:SS in local time."""
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
 # Base data classes
 '''
 ** @author Jael **
@@ -179,44 +2253,91 @@ class Vehicle:
     """Class representing a vehicle in the fleet.
 
     This class stores all information related to a vehicle in the logistics system.
+    The registration time is kept as a Unix timestamp and only turned into a
+    date string when it is displayed.
     """
 
-    def __init__(self, vehicle_id=None, type=None, capacity=None, status="Available"):
+    # Fixed attributes: no per-instance dictionary, much less memory per vehicle
+    __slots__ = ("id", "type", "capacity", "status", "created_at")
+
+    def __init__(self, vehicle_id=None, type=None, capacity=None, status="Available",
+                 created_at=None):
         self.id = vehicle_id  # This will be set by the DataStore when added
         self.type = type
         self.capacity = capacity
         self.status = status
-        self.date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.created_at = int(time.time()) if created_at is None else created_at
+
+    @property
+    def date(self):
+        """Registration date formatted as YYYY-MM-DD HH:MM:SS."""
+        return format_timestamp(self.created_at)
 
     def display_info(self):
         """Display vehicle information."""
-        print(f"Vehicle ID: {self.id}\n"
-              f"Type: {self.type}\n"
-              f"Capacity: {self.capacity}\n"
-              f"Status: {self.status}\n"
-              f"Date: {self.date}")
+        print(self.format_info())
+
+    def format_info(self):
+        """Return the vehicle information as displayed."""
+        return (f"Vehicle ID: {self.id}\n"
+                f"Type: {self.type}\n"
+                f"Capacity: {self.capacity}\n"
+                f"Status: {self.status}\n"
+                f"Date: {self.date}")
+
+    def to_dict(self):
+        """Return the vehicle as a plain dictionary (used for persistence)."""
+        return {"entity": "Vehicle", "id": self.id, "type": self.type,
+                "capacity": self.capacity, "status": self.status,
+                "created_at": self.created_at}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a vehicle from a dictionary created by to_dict."""
+        return cls(data["id"], data["type"], data["capacity"], data["status"],
+                   data["created_at"])
 
 class Customer:
     """Class representing a customer."""
 
+    __slots__ = ("id", "name", "dob", "address", "email", "phone", "shipment_ids")
+
     def __init__(self, customer_id=None, name=None, birthday=None,
                  address=None, email=None, phone=None):
         self.id = customer_id  # This will be set by the DataStore when added
         self.name = name
         self.dob = birthday
-        self.address = address
+        self.address = as_address(address)
         self.email = email
         self.phone = phone
         self.shipment_ids = []  # Store IDs of shipments instead of objects
 
     def display_info(self):
         """Display customer information."""
-        print(f"Customer ID: {self.id}\n"
-              f"Name: {self.name}\n"
-              f"Birthday: {self.dob}\n"
-              f"Address: {self.address}\n"
-              f"Email: {self.email}\n"
-              f"Phone: {self.phone}\n")
+        print(self.format_info())
+
+    def format_info(self):
+        """Return the customer information as displayed."""
+        return (f"Customer ID: {self.id}\n"
+                f"Name: {self.name}\n"
+                f"Birthday: {self.dob}\n"
+                f"Address: {self.address}\n"
+                f"Email: {self.email}\n"
+                f"Phone: {self.phone}\n")
+
+    def to_dict(self):
+        """Return the customer as a plain dictionary (used for persistence)."""
+        return {"entity": "Customer", "id": self.id, "name": self.name,
+                "dob": self.dob, "address": address_text(self.address), "email": self.email,
+                "phone": self.phone, "shipment_ids": list(self.shipment_ids)}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a customer from a dictionary created by to_dict."""
+        customer = cls(data["id"], data["name"], data["dob"],
+                       data["address"], data["email"], data["phone"])
+        customer.shipment_ids = list(data["shipment_ids"])
+        return customer
 
 
 '''
@@ -225,12 +2346,15 @@ class Customer:
 class Shipment:
     """Class representing a shipment."""
 
+    __slots__ = ("id", "customer_id", "origin", "destination", "weight",
+                 "vehicle_id", "status", "delivery_id")
+
     def __init__(self, shipment_id=None, customer_id=None,
                  origin=None, destination=None, weight=None, vehicle_id=None):
         self.id = shipment_id  # This will be set by the DataStore when added
         self.customer_id = customer_id
-        self.origin = origin
-        self.destination = destination
+        self.origin = as_address(origin)
+        self.destination = as_address(destination)
         self.weight = weight
         self.vehicle_id = vehicle_id
         self.status = "Pending"  # Initial status
@@ -238,18 +2362,41 @@ class Shipment:
 
     def display_info(self, customer_name=None, vehicle_type=None):
         """Display shipment information."""
-        print(f"Shipment ID: {self.id}")
-        print(f"Customer: {customer_name if customer_name else self.customer_id}")
-        print(f"Origin: {self.origin}")
-        print(f"Destination: {self.destination}")
-        print(f"Weight: {self.weight}")
-        print(f"Vehicle: {vehicle_type if vehicle_type else self.vehicle_id}")
-        print(f"Status: {self.status}")
+        print(self.format_info(customer_name, vehicle_type))
+
+    def format_info(self, customer_name=None, vehicle_type=None):
+        """Return the shipment information as displayed."""
+        return (f"Shipment ID: {self.id}\n"
+                f"Customer: {customer_name if customer_name else self.customer_id}\n"
+                f"Origin: {self.origin}\n"
+                f"Destination: {self.destination}\n"
+                f"Weight: {self.weight}\n"
+                f"Vehicle: {vehicle_type if vehicle_type else self.vehicle_id}\n"
+                f"Status: {self.status}")
+
+    def to_dict(self):
+        """Return the shipment as a plain dictionary (used for persistence)."""
+        return {"entity": "Shipment", "id": self.id, "customer_id": self.customer_id,
+                "origin": address_text(self.origin),
+                "destination": address_text(self.destination),
+                "weight": self.weight, "vehicle_id": self.vehicle_id,
+                "status": self.status, "delivery_id": self.delivery_id}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a shipment from a dictionary created by to_dict."""
+        shipment = cls(data["id"], data["customer_id"], data["origin"],
+                       data["destination"], data["weight"], data["vehicle_id"])
+        shipment.status = data["status"]
+        shipment.delivery_id = data["delivery_id"]
+        return shipment
 
 
 class Delivery:
     """Class representing a delivery."""
 
+    __slots__ = ("id", "shipment_id", "delivery_date", "status")
+
     def __init__(self, delivery_id=None, shipment_id=None, delivery_date=None, status="Scheduled"):
         self.id = delivery_id  # This will be set by the DataStore when added
         self.shipment_id = shipment_id
@@ -265,6 +2412,1195 @@ class Delivery:
         print(f"Delivery Date: {self.delivery_date}")
         print(f"Status: {self.status}")
 
+    def to_dict(self):
+        """Return the delivery as a plain dictionary (used for persistence)."""
+        return {"entity": "Delivery", "id": self.id, "shipment_id": self.shipment_id,
+                "delivery_date": self.delivery_date, "status": self.status}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a delivery from a dictionary created by to_dict."""
+        return cls(data["id"], data["shipment_id"], data["delivery_date"], data["status"])
+
+
+# Entity classes by the name stored in their dictionaries
+ENTITY_TYPES = {
+    "Vehicle": Vehicle,
+    "Customer": Customer,
+    "Shipment": Shipment,
+    "Delivery": Delivery,
+}
+
+
+def id_prefix(item_type):
+    """Return the ID prefix letter for an entity class (V, C, S, D, or I)."""
+    if issubclass(item_type, Vehicle):
+        return "V"
+    elif issubclass(item_type, Customer):
+        return "C"
+    elif issubclass(item_type, Shipment):
+        return "S"
+    elif issubclass(item_type, Delivery):
+        return "D"
+    return "I"  # For any other item types
+
+
+def item_from_dict(data):
+    """Rebuild any entity from the dictionary produced by its to_dict method."""
+    return ENTITY_TYPES[data["entity"]].from_dict(data)
+
+class TrackingRecord:
+    """What track_shipment shows for one shipment, with every name already resolved."""
+    __slots__ = ("id", "customer_id", "vehicle_id", "customer", "origin", "destination",
+                 "weight", "vehicle", "status_code", "status", "date_type", "date", "stage")
+
+    def __init__(self, shipment, customer, vehicle, status_code, date_type=None, date=None,
+                 stage=None):
+        self.id = shipment.id
+        self.customer_id = shipment.customer_id
+        self.vehicle_id = shipment.vehicle_id
+        self.customer = customer
+        self.origin = shipment.origin
+        self.destination = shipment.destination
+        self.weight = shipment.weight
+        self.vehicle = vehicle
+        self.status_code = status_code
+        self.status = SHIPMENT_STATUS_MESSAGES[status_code]
+        self.date_type = date_type
+        self.date = date
+        self.stage = stage
+
+
+class TrackingView:
+    """Materialized tracking information of every shipment
+
+    Holds one TrackingRecord per shipment ID, so tracking a shipment is a
+    single dictionary lookup instead of a customer, vehicle and delivery
+    lookup plus the status computation. LogisticsService updates the records
+    whenever a shipment is created or delivered, a customer is renamed or
+    removed, or a vehicle changes type or is removed. The view keeps its own
+    customer and vehicle to shipment maps for those updates.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self._by_customer = {}
+        self._by_vehicle = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, shipment_id):
+        """Return the TrackingRecord of a shipment, or None"""
+        return self.records.get(shipment_id)
+
+    def put(self, record):
+        """Add or replace the record of a shipment"""
+        self.remove(record.id)
+        self.records[record.id] = record
+        self._by_customer.setdefault(record.customer_id, {})[record.id] = None
+        if record.vehicle_id:
+            self._by_vehicle.setdefault(record.vehicle_id, {})[record.id] = None
+
+    def remove(self, shipment_id):
+        """Forget the record of a shipment"""
+        record = self.records.pop(shipment_id, None)
+        if record is None:
+            return
+        for links, key in ((self._by_customer, record.customer_id),
+                           (self._by_vehicle, record.vehicle_id)):
+            shipment_ids = links.get(key)
+            if shipment_ids is not None:
+                shipment_ids.pop(shipment_id, None)
+                if not shipment_ids:
+                    del links[key]
+
+    def vehicle_shipments(self, vehicle_id):
+        """Return the IDs of the shipments carried by a vehicle"""
+        return list(self._by_vehicle.get(vehicle_id, ()))
+
+    def set_customer(self, customer_id, name):
+        """Show a new customer name on every shipment of the customer"""
+        for shipment_id in self._by_customer.get(customer_id, ()):
+            self.records[shipment_id].customer = name
+
+    def set_vehicle(self, vehicle_id, vehicle_type):
+        """Show a new vehicle type on every shipment carried by the vehicle"""
+        for shipment_id in self._by_vehicle.get(vehicle_id, ()):
+            self.records[shipment_id].vehicle = vehicle_type
+
+    def set_delivery(self, shipment_id, status, date_type, date, stage=None):
+        """Show the delivery of a shipment"""
+        record = self.records[shipment_id]
+        record.status = status
+        record.date_type = date_type
+        record.date = date
+        record.stage = stage
+
+
+class EtaCache:
+    """Simulated delivery dates of shipments, worked out for the current day
+
+    Estimates only depend on the shipment (weight, vehicle type, ID and
+    destination) and on the day they are counted from, so they are kept
+    until one of those inputs changes: LogisticsService invalidates a
+    shipment when its weight or vehicle changes or its vehicle changes
+    type, and the whole cache starts again when the date changes.
+    """
+
+    def __init__(self):
+        self.base_date = None
+        self.dates = {}
+
+    def __len__(self):
+        return len(self.dates)
+
+    def for_date(self, base_date):
+        """Return the {shipment ID: estimate} dictionary of estimates counted from base_date"""
+        if base_date != self.base_date:
+            self.dates.clear()
+            self.base_date = base_date
+        return self.dates
+
+    def invalidate(self, shipment_ids):
+        """Forget the estimates of the given shipments"""
+        for shipment_id in shipment_ids:
+            self.dates.pop(shipment_id, None)
+
+
+class CapacityIndex:
+    """Vehicles ordered by the capacity they have left
+
+    Kept as a sorted list of (remaining kg, vehicle ID) pairs, so the vehicle
+    with the least room that still fits a weight is found by binary search
+    and a vehicle's entry is moved with one removal and one insertion.
+    Vehicles with no room left are dropped from the list.
+    """
+
+    def __init__(self, remaining=()):
+        self.remaining = {vehicle_id: kg for vehicle_id, kg in remaining if kg > 0}
+        self._entries = sorted((kg, vehicle_id) for vehicle_id, kg in self.remaining.items())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def best_fit(self, weight):
+        """Return the ID of the vehicle with the least room left that can carry weight, or None"""
+        index = bisect.bisect_left(self._entries, (weight,))
+        return self._entries[index][1] if index < len(self._entries) else None
+
+    def set(self, vehicle_id, kg):
+        """Change the capacity a vehicle has left"""
+        previous = self.remaining.pop(vehicle_id, None)
+        if previous is not None:
+            del self._entries[bisect.bisect_left(self._entries, (previous, vehicle_id))]
+        if kg > 0:
+            self.remaining[vehicle_id] = kg
+            bisect.insort(self._entries, (kg, vehicle_id))
+
+    def place(self, weight):
+        """Put weight on the best fitting vehicle and return its ID, or None if none fits"""
+        vehicle_id = self.best_fit(weight)
+        if vehicle_id is not None:
+            self.set(vehicle_id, self.remaining[vehicle_id] - weight)
+        return vehicle_id
+
+    def fitting(self, weight):
+        """Return the IDs of the vehicles that can carry weight, the fullest first"""
+        index = bisect.bisect_left(self._entries, (weight,))
+        return [vehicle_id for _, vehicle_id in self._entries[index:]]
+
+
+class CapacityLedger:
+    """Load carried by every vehicle and the room left on the available ones
+
+    loads holds the weight of the undelivered shipments on each vehicle.
+    Vehicles whose status is "Available" are also kept in a CapacityIndex by
+    the room they have left, so the vehicles that can still carry a weight
+    are a range of that index instead of a scan of the fleet.
+    LogisticsService debits the ledger when it puts a shipment on a vehicle
+    and credits it when the shipment is delivered or moved.
+    """
+
+    def __init__(self):
+        self.loads = {}
+        self.available = CapacityIndex()
+
+    def load(self, vehicle_id):
+        """Return the weight a vehicle carries"""
+        return self.loads.get(vehicle_id, 0)
+
+    def room(self, vehicle):
+        """Return the weight a vehicle can still take"""
+        return vehicle.capacity - self.loads.get(vehicle.id, 0)
+
+    def add(self, vehicle_id, weight):
+        """Add weight to the load of a vehicle (a negative weight takes it off)"""
+        # Rounded so loads go back to exactly 0 after float additions and subtractions
+        load = round(self.loads.get(vehicle_id, 0) + weight, 6)
+        if load > 0:
+            self.loads[vehicle_id] = load
+        else:
+            self.loads.pop(vehicle_id, None)
+
+    def refresh(self, vehicle):
+        """Put a vehicle at its place in the index after its load, capacity or status changed"""
+        self.available.set(vehicle.id, self.room(vehicle) if vehicle.status == "Available" else 0)
+
+    def forget(self, vehicle_id):
+        """Drop a removed vehicle"""
+        self.loads.pop(vehicle_id, None)
+        self.available.set(vehicle_id, 0)
+
+    def fitting(self, weight):
+        """Return the IDs of the available vehicles that can still carry weight, the fullest first"""
+        return self.available.fitting(weight)
+
+
+def pack_best_fit_decreasing(items, capacity_index):
+    """Assign (ID, weight) items to the vehicles of a CapacityIndex
+
+    Heaviest items are placed first, each on the vehicle it fills the most
+    (best-fit decreasing bin packing). Returns ({item ID: vehicle ID}, [IDs
+    of the items that fit nowhere]); capacity_index is left with the room
+    that remains.
+    """
+    assignments = {}
+    unplaced = []
+    for item_id, weight in sorted(items, key=lambda item: item[1], reverse=True):
+        vehicle_id = capacity_index.place(weight)
+        if vehicle_id is None:
+            unplaced.append(item_id)
+        else:
+            assignments[item_id] = vehicle_id
+    return assignments, unplaced
+
+
+class CustomerIndex:
+    """Search index of the customers by name prefix, email and phone number
+
+    Names (in lower case) are kept in a list of (name, customer ID) sorted
+    by name, so the customers whose name starts with a prefix are found with
+    a binary search (bisect) and come out in name order. A trie would answer
+    the same question, but with a dictionary per letter it takes several
+    times the memory of one sorted list for a million names.
+    Names added one at a time go to a short sorted pending list first, that
+    searches also look into. It is merged into the main list, by copying the
+    slices between the places of the pending names, when it reaches MERGE_AT
+    names or 1/64 of the main list. Adding a customer does not move the
+    whole list each time, and searching the pending list is a binary search
+    too.
+    Emails (lower case) and phone numbers (normalize_phone) map to the ID of
+    their customer, or to a tuple of IDs when several customers share one.
+    """
+
+    MERGE_AT = 1024
+
+    def __init__(self, customers=()):
+        self._names = []
+        self._pending = []
+        self.emails = {}
+        self.phones = {}
+        self.add_many(customers)
+
+    def __len__(self):
+        return len(self._names) + len(self._pending)
+
+    @staticmethod
+    def name_key(name):
+        """Return the searchable form of a name: lower case, single spaces."""
+        return " ".join(str(name or "").lower().split())
+
+    @staticmethod
+    def email_key(email):
+        return str(email or "").strip().lower()
+
+    def add(self, customer):
+        """Index one customer"""
+        bisect.insort(self._pending, (self.name_key(customer.name), customer.id))
+        if len(self._pending) >= max(self.MERGE_AT, len(self._names) >> 6):
+            self._merge()
+        self._link_contacts(customer)
+
+    def add_many(self, customers):
+        """Index several customers with a single merge"""
+        for customer in customers:
+            self._pending.append((self.name_key(customer.name), customer.id))
+            self._link_contacts(customer)
+        self._merge()
+
+    def remove(self, customer):
+        """Forget a customer, indexed with its current name, email and phone"""
+        entry = (self.name_key(customer.name), customer.id)
+        for names in (self._pending, self._names):
+            position = bisect.bisect_left(names, entry)
+            if position < len(names) and names[position] == entry:
+                del names[position]
+                break
+        self._unlink(self.emails, self.email_key(customer.email), customer.id)
+        self._unlink(self.phones, normalize_phone(customer.phone or ""), customer.id)
+
+    def by_name(self, prefix, limit=20):
+        """Return the IDs of up to limit customers whose name starts with prefix, in name order"""
+        prefix = self.name_key(prefix)
+        if not prefix:
+            return []
+        found = []
+        for names in (self._names, self._pending):
+            position = bisect.bisect_left(names, (prefix,))
+            end = min(position + limit, len(names))
+            while position < end and names[position][0].startswith(prefix):
+                found.append(names[position])
+                position += 1
+        if self._pending:
+            found.sort()
+        return [customer_id for _, customer_id in found[:limit]]
+
+    def by_email(self, email):
+        """Return the IDs of the customers with the email (any case)"""
+        return self._ids(self.emails, self.email_key(email))
+
+    def by_phone(self, phone):
+        """Return the IDs of the customers with the phone number, however it is written"""
+        return self._ids(self.phones, normalize_phone(phone))
+
+    def _merge(self):
+        if len(self._pending) * 8 > len(self._names):
+            self._names += self._pending
+            self._names.sort()
+        else:
+            # Few names into many: copy the slices of the main list between
+            # the places of the pending names, found by binary search
+            names = self._names
+            merged = []
+            start = 0
+            for entry in self._pending:
+                position = bisect.bisect_left(names, entry, start)
+                merged += names[start:position]
+                merged.append(entry)
+                start = position
+            merged += names[start:]
+            self._names = merged
+        self._pending = []
+
+    def _link_contacts(self, customer):
+        for keys, key in ((self.emails, self.email_key(customer.email)),
+                          (self.phones, normalize_phone(customer.phone or ""))):
+            if not key:
+                continue
+            ids = keys.get(key)
+            if ids is None:
+                keys[key] = customer.id
+            elif isinstance(ids, tuple):
+                keys[key] = ids + (customer.id,)
+            else:
+                keys[key] = (ids, customer.id)
+
+    @staticmethod
+    def _unlink(keys, key, customer_id):
+        ids = keys.get(key)
+        if ids == customer_id:
+            del keys[key]
+        elif isinstance(ids, tuple):
+            ids = tuple(other for other in ids if other != customer_id)
+            keys[key] = ids[0] if len(ids) == 1 else ids
+
+    @staticmethod
+    def _ids(keys, key):
+        ids = keys.get(key)
+        if ids is None:
+            return []
+        return list(ids) if isinstance(ids, tuple) else [ids]
+
+
+def atomic(method):
+    """Run a LogisticsService method as one unit of work
+
+    The stores are write-locked for the whole method, so other threads see
+    either none or all of the changes it makes to the stores, the tracking
+    view, the capacity ledger and the customer index.
+    """
+    @functools.wraps(method)
+    def unit(self, *args, **kwargs):
+        with self.writing():
+            return method(self, *args, **kwargs)
+    return unit
+
+
+def consistent(method):
+    """Run a LogisticsService method reading several stores while no unit of work is running"""
+    @functools.wraps(method)
+    def reader(self, *args, **kwargs):
+        with self.reading():
+            return method(self, *args, **kwargs)
+    return reader
+
+
+class ServiceError(ValueError):
+    """Raised by LogisticsService when a request cannot be carried out."""
+
+
+class LogisticsService:
+    """Business operations of the logistics system, without read_input() or print()
+
+    Every operation takes and returns plain data (IDs, strings, numbers and the
+    entity objects), checks its arguments with the same rules as the menus and
+    raises ServiceError when something is wrong. The menus, the bulk importer
+    and any other front end all go through this class, which keeps the
+    tracking view, the capacity ledger and the customer search index in step
+    with every change.
+
+    Operations can be called from many threads. Those that change anything
+    are @atomic and those reading several stores @consistent, so they never
+    see half of another operation.
+    """
+
+    def __init__(self, vehicle_store, customer_store, shipment_store, delivery_store,
+                 holiday_rules=None):
+        self.vehicle_store = vehicle_store
+        self.customer_store = customer_store
+        self.shipment_store = shipment_store
+        self.delivery_store = delivery_store
+        # Locks of the stores, each one once (stores can share one), always
+        # taken in this order so that two operations cannot wait for each other
+        locks = {}
+        for store in (vehicle_store, customer_store, shipment_store, delivery_store):
+            locks.setdefault(id(store.lock), store.lock)
+        self._locks = list(locks.values())
+
+        # Public holidays skipped by delivery estimates, one calendar per state
+        self.holiday_rules = holiday_rules or AU_HOLIDAY_RULES
+        self._calendars = {}
+        self.eta_cache = EtaCache()
+
+        # Build the tracking view from the shipments already stored
+        shipments = shipment_store.find_all()
+        self.tracking = TrackingView()
+        self._track_all(shipments)
+
+        # Load of every vehicle, from the shipments not delivered yet
+        self.ledger = CapacityLedger()
+        for shipment in shipments:
+            if shipment.vehicle_id and shipment.status != "Delivered":
+                self.ledger.add(shipment.vehicle_id, shipment.weight)
+        for vehicle in vehicle_store.find_all():
+            self._settle_vehicle(vehicle)
+
+        # Customers by name prefix, email and phone number
+        self.customer_index = CustomerIndex(customer_store.iter_all())
+
+    @contextlib.contextmanager
+    def writing(self):
+        """Hold the write lock of every store: no other thread reads or changes them meanwhile"""
+        taken = []
+        try:
+            for lock in self._locks:
+                lock.acquire_write()
+                taken.append(lock)
+            yield self
+        finally:
+            for lock in reversed(taken):
+                lock.release_write()
+
+    @contextlib.contextmanager
+    def reading(self):
+        """Hold the read lock of every store: no unit of work changes them meanwhile"""
+        taken = []
+        try:
+            for lock in self._locks:
+                lock.acquire_read()
+                taken.append(lock)
+            yield self
+        finally:
+            for lock in reversed(taken):
+                lock.release_read()
+
+    # --- Vehicles ---
+
+    def build_vehicle(self, vehicle_type, capacity, status="Available"):
+        """Return a checked, not yet stored, Vehicle"""
+        return Vehicle(type=self._clean(clean_vehicle_type, vehicle_type),
+                       capacity=self._clean(clean_capacity, capacity),
+                       status=str(status or "Available").strip())
+
+    @atomic
+    def add_vehicle(self, vehicle_type, capacity, status="Available"):
+        """Register a vehicle and return it"""
+        vehicle = self.build_vehicle(vehicle_type, capacity, status)
+        self.vehicle_store.add(vehicle)
+        self.ledger.refresh(vehicle)
+        return vehicle
+
+    @atomic
+    def add_vehicles(self, vehicles):
+        """Store several vehicles built with build_vehicle at once"""
+        ids = self.vehicle_store.add_many(vehicles)
+        for vehicle in vehicles:
+            self.ledger.refresh(vehicle)
+        return ids
+
+    def get_vehicle(self, vehicle_id):
+        """Return the vehicle with the given ID, or None"""
+        return self.vehicle_store.find(vehicle_id)
+
+    @atomic
+    def update_vehicle(self, vehicle_id, vehicle_type=None, capacity=None, status=None):
+        """Change the given details of a vehicle and return it"""
+        vehicle = self._require(self.vehicle_store, vehicle_id, "vehicle")
+        previous_type = vehicle.type
+        if vehicle_type is not None:
+            vehicle.type = self._clean(clean_vehicle_type, vehicle_type)
+        if capacity is not None:
+            vehicle.capacity = self._clean(clean_capacity, capacity)
+        if status:
+            vehicle.status = status
+        self.vehicle_store.update(vehicle_id, vehicle)
+        self._settle_vehicle(vehicle)
+        if vehicle.type != previous_type:
+            # The vehicle type changes the transit time of its shipments
+            self.tracking.set_vehicle(vehicle_id, vehicle.type)
+            self.eta_cache.invalidate(self.tracking.vehicle_shipments(vehicle_id))
+        return vehicle
+
+    @atomic
+    def remove_vehicle(self, vehicle_id):
+        """Remove a vehicle and return it"""
+        vehicle = self._require(self.vehicle_store, vehicle_id, "vehicle")
+        self.vehicle_store.remove(vehicle_id)
+        self.ledger.forget(vehicle_id)
+        self.tracking.set_vehicle(vehicle_id, "Not assigned")
+        self.eta_cache.invalidate(self.tracking.vehicle_shipments(vehicle_id))
+        return vehicle
+
+    def list_vehicles(self):
+        """Return every vehicle"""
+        return self.vehicle_store.find_all()
+
+    def iter_vehicles(self):
+        """Yield every vehicle, reading the store lazily"""
+        return self.vehicle_store.iter_all()
+
+    @consistent
+    def available_vehicles(self, weight):
+        """Return the available vehicles with room left for the weight, the fullest first"""
+        return [self.vehicle_store.find(vehicle_id) for vehicle_id in self.ledger.fitting(weight)]
+
+    @consistent
+    def remaining_capacity(self, vehicle_id):
+        """Return the weight a vehicle can still take on top of its undelivered shipments"""
+        return self.ledger.room(self._require(self.vehicle_store, vehicle_id, "vehicle"))
+
+    def _load_vehicles(self, weights):
+        """Add {vehicle ID: weight} to the vehicle loads (negative weights take load off)"""
+        for vehicle_id, weight in weights.items():
+            self.ledger.add(vehicle_id, weight)
+            vehicle = self.vehicle_store.find(vehicle_id)
+            if vehicle:
+                self._settle_vehicle(vehicle)
+
+    def _settle_vehicle(self, vehicle):
+        """Mark a vehicle "Full" when it has no room left and "Available" again when it has"""
+        room = self.ledger.room(vehicle)
+        if vehicle.status == "Available" and room <= 0:
+            vehicle.status = "Full"
+            self.vehicle_store.update(vehicle.id, vehicle)
+        elif vehicle.status == "Full" and room > 0:
+            vehicle.status = "Available"
+            self.vehicle_store.update(vehicle.id, vehicle)
+        self.ledger.refresh(vehicle)
+
+    # --- Customers ---
+
+    def build_customer(self, name, birthday, address, email, phone):
+        """Return a checked, not yet stored, Customer"""
+        return Customer(name=self._clean(clean_customer_name, name),
+                        birthday=self._clean(clean_birthday, birthday),
+                        address=self._clean(clean_au_address, address),
+                        email=self._clean(clean_email, email),
+                        phone=self._clean(clean_phone, phone))
+
+    @atomic
+    def add_customer(self, name, birthday, address, email, phone):
+        """Register a customer and return it"""
+        customer = self.build_customer(name, birthday, address, email, phone)
+        self.customer_store.add(customer)
+        self.customer_index.add(customer)
+        return customer
+
+    @atomic
+    def add_customers(self, customers):
+        """Store several customers built with build_customer at once"""
+        customers = list(customers)
+        ids = self.customer_store.add_many(customers)
+        self.customer_index.add_many(customers)
+        return ids
+
+    def get_customer(self, customer_id):
+        """Return the customer with the given ID, or None"""
+        return self.customer_store.find(customer_id)
+
+    @atomic
+    def update_customer(self, customer_id, name=None, birthday=None, address=None,
+                        email=None, phone=None):
+        """Change the given details of a customer and return it"""
+        customer = self._require(self.customer_store, customer_id, "customer")
+        # Indexed again with whatever details the customer ends up with
+        self.customer_index.remove(customer)
+        try:
+            if name is not None:
+                customer.name = self._clean(clean_customer_name, name)
+            if birthday is not None:
+                customer.dob = self._clean(clean_birthday, birthday)
+            if address is not None:
+                customer.address = self._clean(clean_au_address, address)
+            if email is not None:
+                customer.email = self._clean(clean_email, email)
+            if phone is not None:
+                customer.phone = self._clean(clean_phone, phone)
+        finally:
+            self.customer_index.add(customer)
+        self.customer_store.update(customer_id, customer)
+        self.tracking.set_customer(customer_id, customer.name)
+        return customer
+
+    @atomic
+    def remove_customer(self, customer_id):
+        """Remove a customer and return it"""
+        customer = self._require(self.customer_store, customer_id, "customer")
+        self.customer_store.remove(customer_id)
+        self.customer_index.remove(customer)
+        self.tracking.set_customer(customer_id, "Unknown")
+        return customer
+
+    @consistent
+    def find_customers(self, query, limit=20):
+        """Return the customers matching an email, a phone number or the start of a name
+
+        A query with an @ is an email, one that is a phone number once its
+        separators are removed is a phone number, anything else a name prefix.
+        """
+        query = str(query).strip()
+        if "@" in query:
+            ids = self.customer_index.by_email(query)
+        elif normalize_phone(query).isdigit():
+            ids = self.customer_index.by_phone(query)
+        else:
+            ids = self.customer_index.by_name(query, limit)
+        customers = (self.customer_store.find(customer_id) for customer_id in ids[:limit])
+        return [customer for customer in customers if customer is not None]
+
+    def list_customers(self):
+        """Return every customer"""
+        return self.customer_store.find_all()
+
+    def iter_customers(self):
+        """Yield every customer, reading the store lazily"""
+        return self.customer_store.iter_all()
+
+    @consistent
+    def customer_shipments(self, customer_id):
+        """Return (shipment ID, shipment or None if missing) for each shipment of a customer"""
+        customer = self._require(self.customer_store, customer_id, "customer")
+        return [(shipment_id, self.shipment_store.find(shipment_id))
+                for shipment_id in customer.shipment_ids]
+
+    def customers_in_region(self, state=None, suburb=None, postcode=None):
+        """Return the customers whose address is in the given state, suburb and postcode"""
+        # The parts were parsed when the addresses were validated
+        return [customer for customer in self.customer_store.iter_all()
+                if customer.address is not None
+                and customer.address.in_region(state, suburb, postcode)]
+
+    # --- Shipments ---
+
+    @consistent
+    def build_shipment(self, customer_id, origin, destination, weight, vehicle_id=None,
+                       reserved=0):
+        """Return a checked, not yet stored, Shipment
+
+        Origin and destination are either the customer's own address or a
+        "street and number, suburb, zipcode" address. A vehicle, when given,
+        must be available and still have room for the weight; reserved is
+        weight already promised to that vehicle by shipments not stored yet.
+        """
+        customer = self._require(self.customer_store, customer_id, "customer")
+        origin = self._shipment_address(origin, customer)
+        destination = self._shipment_address(destination, customer)
+        weight = self._clean(clean_weight, weight)
+        if vehicle_id:
+            self._check_vehicle(vehicle_id, weight + reserved)
+        return Shipment(customer_id=customer_id, origin=origin, destination=destination,
+                        weight=weight, vehicle_id=vehicle_id or None)
+
+    def _check_vehicle(self, vehicle_id, weight, carried=0):
+        """Check a vehicle can take weight more kg, once carried kg of its load are taken off"""
+        vehicle = self._require(self.vehicle_store, vehicle_id, "vehicle")
+        if not carried and vehicle.status == "Full":
+            raise ServiceError(f"Vehicle {vehicle_id} is full")
+        if not carried and vehicle.status != "Available":
+            raise ServiceError(f"Vehicle {vehicle_id} is not available")
+        room = self.ledger.room(vehicle) + carried
+        if room < weight:
+            if vehicle.capacity < weight:
+                raise ServiceError(f"Vehicle {vehicle_id} cannot carry {weight} kg")
+            raise ServiceError(f"Vehicle {vehicle_id} has only {max(room, 0):g} kg of room left")
+
+    @staticmethod
+    def _shipment_address(address, customer):
+        if str(address).lower() == str(customer.address).lower():
+            return customer.address
+        return LogisticsService._clean(clean_shipment_address, address)
+
+    @atomic
+    def create_shipment(self, customer_id, origin, destination, weight, vehicle_id=None):
+        """Create a shipment for a customer and return it"""
+        shipment = self.build_shipment(customer_id, origin, destination, weight, vehicle_id)
+        self.shipment_store.add(shipment)
+        if shipment.vehicle_id:
+            self._load_vehicles({shipment.vehicle_id: shipment.weight})
+
+        # Update customer's shipment list
+        customer = self.customer_store.find(customer_id)
+        customer.shipment_ids.append(shipment.id)
+        self.customer_store.update(customer_id, customer)
+        self._track(shipment)
+        return shipment
+
+    @atomic
+    def create_shipments(self, shipments):
+        """Store several shipments built with build_shipment at once"""
+        ids = self.shipment_store.add_many(shipments)
+
+        # Update each customer's shipment list and each vehicle's load once
+        shipment_ids = {}
+        weights = {}
+        for shipment in shipments:
+            shipment_ids.setdefault(shipment.customer_id, []).append(shipment.id)
+            if shipment.vehicle_id:
+                weights[shipment.vehicle_id] = weights.get(shipment.vehicle_id, 0) + shipment.weight
+        self._load_vehicles(weights)
+        with self.customer_store.batch():
+            for customer_id, new_ids in shipment_ids.items():
+                customer = self.customer_store.find(customer_id)
+                customer.shipment_ids.extend(new_ids)
+                self.customer_store.update(customer_id, customer)
+        self._track_all(shipments)
+        return ids
+
+    def get_shipment(self, shipment_id):
+        """Return the shipment with the given ID, or None"""
+        return self.shipment_store.find(shipment_id)
+
+    def shipments_in_region(self, state=None, suburb=None, postcode=None, end="destination"):
+        """Return the shipments whose destination (or origin, with end="origin") is in the region"""
+        if end not in ("origin", "destination"):
+            raise ValueError("end must be 'origin' or 'destination'")
+        return [shipment for shipment in self.shipment_store.iter_all()
+                if getattr(shipment, end) is not None
+                and getattr(shipment, end).in_region(state, suburb, postcode)]
+
+    @atomic
+    def update_shipment(self, shipment_id, weight=None, vehicle_id=None):
+        """Change the weight of a shipment or move it to another vehicle and return it
+
+        Pass vehicle_id="" to take the shipment off its vehicle.
+        """
+        shipment = self._require(self.shipment_store, shipment_id, "shipment")
+        new_weight = shipment.weight if weight is None else self._clean(clean_weight, weight)
+        new_vehicle_id = shipment.vehicle_id if vehicle_id is None else vehicle_id or None
+        in_transit = shipment.status != "Delivered"
+        if new_vehicle_id and new_vehicle_id != shipment.vehicle_id:
+            self._check_vehicle(new_vehicle_id, new_weight)
+        elif new_vehicle_id and new_weight != shipment.weight and in_transit:
+            # The vehicle already carrying it must still have room, without its old weight
+            if self.vehicle_store.find(new_vehicle_id):
+                self._check_vehicle(new_vehicle_id, new_weight, carried=shipment.weight)
+        weights = {}
+        if in_transit:
+            if shipment.vehicle_id:
+                weights[shipment.vehicle_id] = -shipment.weight
+            if new_vehicle_id:
+                weights[new_vehicle_id] = weights.get(new_vehicle_id, 0) + new_weight
+        shipment.weight = new_weight
+        shipment.vehicle_id = new_vehicle_id
+        self.shipment_store.update(shipment_id, shipment)
+        self._load_vehicles(weights)
+
+        # Weight and vehicle both change the estimate, the vehicle also the tracking record
+        self.eta_cache.invalidate((shipment_id,))
+        record = self.tracking.get(shipment_id)
+        self._track(shipment, record.status_code if record else None)
+        return shipment
+
+    @consistent
+    def plan_assignments(self):
+        """Work out vehicles for every shipment that has none, without changing anything
+
+        Each available vehicle can take the room it has left in the capacity
+        ledger. Returns ({shipment ID: vehicle ID}, [IDs of the shipments no
+        vehicle has room for]).
+        """
+        unassigned = [(shipment.id, shipment.weight) for shipment in self.shipment_store.iter_all()
+                      if not shipment.vehicle_id and shipment.status != "Delivered"]
+        capacity_index = CapacityIndex(self.ledger.available.remaining.items())
+        return pack_best_fit_decreasing(unassigned, capacity_index)
+
+    @atomic
+    def assign_vehicles(self, assignments=None):
+        """Put shipments on vehicles, as planned by plan_assignments when none are given
+
+        Only shipments still waiting for a vehicle are assigned, and each
+        vehicle is checked as in update_shipment. A plan can go stale before
+        it is carried out (another operator assigns or delivers a shipment,
+        or fills a vehicle), so the assignments no longer possible are
+        skipped. Returns the {shipment ID: vehicle ID} assignments carried out.
+        """
+        if assignments is None:
+            assignments, _ = self.plan_assignments()
+        carried_out = {}
+        shipments = []
+        weights = {}
+        for shipment_id, vehicle_id in assignments.items():
+            shipment = self._require(self.shipment_store, shipment_id, "shipment")
+            if shipment.vehicle_id or shipment.status == "Delivered":
+                continue
+            try:
+                # Shipments put on the vehicle earlier in the batch take room too
+                self._check_vehicle(vehicle_id, weights.get(vehicle_id, 0) + shipment.weight)
+            except ServiceError:
+                continue
+            carried_out[shipment_id] = vehicle_id
+            shipments.append(shipment)
+            weights[vehicle_id] = weights.get(vehicle_id, 0) + shipment.weight
+
+        with self.shipment_store.batch():
+            for shipment in shipments:
+                shipment.vehicle_id = carried_out[shipment.id]
+                self.shipment_store.update(shipment.id, shipment)
+        self._load_vehicles(weights)
+
+        # The vehicle type changes the estimate and the tracking record
+        self.eta_cache.invalidate(carried_out)
+        for shipment in shipments:
+            record = self.tracking.get(shipment.id)
+            self._track(shipment, record.status_code if record else None)
+        return carried_out
+
+    def generate_status(self, shipment_id):
+        """Generate a status message based on shipment ID."""
+        return self.generate_statuses([shipment_id])[0]
+
+    def generate_statuses(self, shipment_ids):
+        """Return the status message of every shipment ID in the list
+
+        Codes of tracked shipments were cached when they were created; the
+        others are computed together in one batch.
+        """
+        records = [self.tracking.get(shipment_id) for shipment_id in shipment_ids]
+        missing = [shipment_id for shipment_id, record in zip(shipment_ids, records)
+                   if record is None]
+        computed = iter(shipment_status_codes(missing))
+        return [SHIPMENT_STATUS_MESSAGES[record.status_code if record else next(computed)]
+                for record in records]
+
+    def get_customer_name(self, customer_id):
+        """Get customer name by ID."""
+        customer = self.customer_store.find(customer_id)
+        return customer.name if customer else "Unknown"
+
+    def get_vehicle_type(self, vehicle_id):
+        """Get vehicle type by ID."""
+        if not vehicle_id:
+            return "Not assigned"
+        vehicle = self.vehicle_store.find(vehicle_id)
+        return vehicle.type if vehicle else "Not assigned"
+
+    def get_delivery_status(self, shipment):
+        """Get delivery status information for a shipment."""
+        if not shipment.delivery_id:
+            return None
+
+        delivery = self.delivery_store.find(shipment.delivery_id)
+        if not delivery:
+            return None
+
+        if delivery.status == "Delivered":
+            return {
+                "status": "Your shipment has been delivered",
+                "date_type": "Delivery Date",
+                "date": delivery.delivery_date
+            }
+        else:
+            return {
+                "status": delivery.status,
+                "date_type": "Scheduled Date",
+                "date": delivery.delivery_date
+            }
+
+    @consistent
+    def track(self, shipment_id):
+        """Return the TrackingRecord of a shipment from the tracking view
+
+        Its date_type and date are None until the shipment has a delivery,
+        and stage is the shipment status once it is past "Pending".
+        """
+        record = self.tracking.get(shipment_id)
+        if record is None:
+            raise ServiceError(f"No shipment found with ID: {shipment_id}")
+        return record
+
+    def _track_all(self, shipments):
+        """Put the tracking records of many shipments in the view, with one status batch"""
+        shipments = list(shipments)
+        codes = shipment_status_codes([shipment.id for shipment in shipments])
+        for shipment, status_code in zip(shipments, codes):
+            self._track(shipment, status_code)
+
+    def _track(self, shipment, status_code=None):
+        """Work out the tracking record of a shipment and put it in the view"""
+        if status_code is None:
+            status_code = shipment_status_codes([shipment.id])[0]
+        record = TrackingRecord(shipment, self.get_customer_name(shipment.customer_id),
+                                self.get_vehicle_type(shipment.vehicle_id), status_code)
+        delivery_info = self.get_delivery_status(shipment)
+        if delivery_info:
+            record.status = delivery_info["status"]
+            record.date_type = delivery_info["date_type"]
+            record.date = delivery_info["date"]
+        elif shipment.status != "Pending":
+            record.stage = shipment.status
+        self.tracking.put(record)
+
+    def calendar(self, state=None):
+        """Return the BusinessCalendar of a state (national holidays only for None)"""
+        calendar = self._calendars.get(state)
+        if calendar is None:
+            rules = self.holiday_rules.get("AU", ()) + self.holiday_rules.get(state, ())
+            calendar = self._calendars[state] = BusinessCalendar(rules)
+        return calendar
+
+    def transit_days(self, shipment):
+        """Return the number of working days a shipment takes to arrive."""
+        # Determine transit days based on various factors
+        transit_days = 2  # Base transit time
+
+        # Factor 1: Weight impact
+        if shipment.weight > 100:
+            transit_days += 2
+        elif shipment.weight > 50:
+            transit_days += 1
+
+        # Factor 2: Vehicle type impact
+        vehicle = self.vehicle_store.find(shipment.vehicle_id) if shipment.vehicle_id else None
+        if vehicle:
+            vehicle_delays = {
+                'Motorcycle': -1,  # Faster for small packages
+                'Van': 0,
+                'Truck': 1,
+                'Cargo Ship': 5,
+                'Airplane': -2  # Fastest
+            }
+            transit_days += vehicle_delays.get(vehicle.type, 0)
+
+        # Factor 3: Delay simulation (weather, traffic, etc.), drawn from a
+        # hash of the shipment ID so the same shipment always gets the same delay
+        random_delay = zlib.crc32(shipment.id.encode("utf-8")) % 3
+        transit_days += random_delay
+
+        # Factor 4: Shipment ID based variation (consistent for same ID)
+        id_factor = sum(ord(char) for char in shipment.id) % 3
+        transit_days += id_factor
+
+        # Ensure minimum 1 day transit
+        return max(1, transit_days)
+
+    def calculate_simulated_delivery_date(self, shipment):
+        """Calculate a simulated delivery date based on shipment properties."""
+        # Working days from today, skipping weekends and the public holidays
+        # of the destination state
+        base_date = datetime.date.today()
+        cached = self.eta_cache.for_date(base_date)
+        estimate = cached.get(shipment.id)
+        if estimate is None:
+            calendar = self.calendar(shipment.destination.state)
+            estimate = calendar.add_business_days(base_date, self.transit_days(shipment))
+            estimate = cached[shipment.id] = estimate.strftime('%Y-%m-%d')
+        return estimate
+
+    def estimate_delivery_dates(self, shipments):
+        """Return {shipment ID: simulated delivery date} for many shipments at once
+
+        Cached estimates are reused. The other shipments are grouped by
+        destination state and each group is handled by one batch call of its
+        calendar (numpy.busday_offset when available).
+        """
+        base_date = datetime.date.today()
+        cached = self.eta_cache.for_date(base_date)
+        estimates = {}
+        by_state = {}
+        for shipment in shipments:
+            estimate = cached.get(shipment.id)
+            if estimate is None:
+                by_state.setdefault(shipment.destination.state, []).append(shipment)
+            else:
+                estimates[shipment.id] = estimate
+        for state, group in by_state.items():
+            dates = self.calendar(state).add_business_days_batch(
+                base_date, [self.transit_days(shipment) for shipment in group])
+            for shipment, estimate in zip(group, dates):
+                estimates[shipment.id] = cached[shipment.id] = estimate
+        return estimates
+
+    def get_simulated_delivery_info(self, shipment, estimated_date=None):
+        """Get simulated delivery information for display."""
+        # If there's already a delivery record, use it
+        if shipment.delivery_id:
+            return self.get_delivery_status(shipment)
+
+        # Generate simulated delivery date (unless it was estimated in a batch)
+        if estimated_date is None:
+            estimated_date = self.calculate_simulated_delivery_date(shipment)
+
+        # Determine status based on current date and estimated delivery
+        current_date = datetime.datetime.now().date()
+        delivery_date = datetime.date.fromisoformat(estimated_date)
+
+        if current_date > delivery_date:
+            # Past delivery date - mark as delivered
+            return {
+                "status": "Your shipment has been delivered",
+                "date_type": "Delivery Date",
+                "date": estimated_date
+            }
+        elif current_date == delivery_date:
+            return {
+                "status": "Out for delivery today",
+                "date_type": "Expected Delivery",
+                "date": estimated_date
+            }
+        else:
+            days_until = (delivery_date - current_date).days
+            if days_until == 1:
+                status = "Arriving tomorrow"
+            else:
+                status = f"In transit - arriving in {days_until} days"
+
+            return {
+                "status": status,
+                "date_type": "Estimated Delivery",
+                "date": estimated_date
+            }
+
+    def list_shipments(self):
+        """Return every shipment with its customer, vehicle and delivery information
+
+        Each entry is a dictionary with the keys id, customer, origin,
+        destination, weight, vehicle, status, date_type, date and stage.
+        """
+        return list(self.iter_shipments())
+
+    def iter_shipments(self, chunk_size=500):
+        """Yield the list_shipments entries lazily, a chunk of shipments at a time
+
+        Delivery estimates are worked out in one batch per chunk.
+        """
+        shipments = self.shipment_store.iter_all(chunk_size)
+        for chunk in iter(lambda: list(itertools.islice(shipments, chunk_size)), []):
+            with self.reading():
+                entries = self._shipment_entries(chunk)
+            yield from entries
+
+    def _shipment_entries(self, shipments):
+        estimates = self.estimate_delivery_dates(
+            [shipment for shipment in shipments if not shipment.delivery_id])
+        listing = []
+        for shipment in shipments:
+            # Customer and vehicle names come from the tracking view
+            record = self.tracking.get(shipment.id)
+            entry = {
+                "id": shipment.id,
+                "customer": record.customer,
+                "origin": shipment.origin,
+                "destination": shipment.destination,
+                "weight": shipment.weight,
+                "vehicle": record.vehicle,
+                "date_type": None,
+                "date": None,
+                "stage": None,
+            }
+            delivery_info = self.get_simulated_delivery_info(shipment, estimates.get(shipment.id))
+            if delivery_info:
+                entry.update(delivery_info)
+            else:
+                # Fallback to original status generation
+                entry["status"] = self.generate_status(shipment.id)
+                if shipment.status != "Pending":
+                    entry["stage"] = shipment.status
+            listing.append(entry)
+        return listing
+
+    # --- Deliveries ---
+
+    @atomic
+    def mark_delivered(self, shipment_id):
+        """Mark a shipment as delivered now and return its Delivery"""
+        shipment = self._require(self.shipment_store, shipment_id, "shipment")
+
+        # Check if already delivered
+        delivery = self.delivery_store.find(shipment.delivery_id) if shipment.delivery_id else None
+        if delivery and delivery.status == "Delivered":
+            raise ServiceError(f"This shipment has already been delivered on {delivery.delivery_date}")
+
+        # Automatically capture current date and time
+        delivery_date = datetime.datetime.now().strftime("%d/%m/%Y %H:%M")
+
+        # Create or update delivery record
+        if delivery:
+            delivery.status = "Delivered"
+            delivery.delivery_date = delivery_date
+            self.delivery_store.update(delivery.id, delivery)
+        else:
+            delivery = Delivery(shipment_id=shipment_id, delivery_date=delivery_date,
+                                status="Delivered")
+            shipment.delivery_id = self.delivery_store.add(delivery)
+
+        # Update shipment status; the vehicle has room for its weight again
+        was_delivered = shipment.status == "Delivered"
+        shipment.status = "Delivered"
+        self.shipment_store.update(shipment_id, shipment)
+        if shipment.vehicle_id and not was_delivered:
+            self._load_vehicles({shipment.vehicle_id: -shipment.weight})
+        self.eta_cache.invalidate((shipment_id,))
+        if self.tracking.get(shipment_id):
+            self.tracking.set_delivery(shipment_id, "Your shipment has been delivered",
+                                       "Delivery Date", delivery_date)
+        else:
+            self._track(shipment)
+        return delivery
+
+    @consistent
+    def delivery_status(self, shipment_id):
+        """Return (shipment, customer name, delivery or None) for a shipment"""
+        shipment = self._require(self.shipment_store, shipment_id, "shipment")
+        delivery = self.delivery_store.find(shipment.delivery_id) if shipment.delivery_id else None
+        return shipment, self.get_customer_name(shipment.customer_id), delivery
+
+    @staticmethod
+    def _require(store, item_id, name):
+        item = store.find(item_id)
+        if not item:
+            raise ServiceError(f"No {name} found with ID: {item_id}")
+        return item
+
+    @staticmethod
+    def _clean(clean, value):
+        """Return clean(value), raising ServiceError instead of ValueError"""
+        try:
+            return clean(value)
+        except ValueError as error:
+            raise ServiceError(str(error)) from None
+
+
 '''
 ** @author Jael **
 '''
@@ -276,9 +3612,9 @@ class FleetMenu(Menu):
     It inherits basic menu functionality from the Menu class.
     """
 
-    def __init__(self, vehicle_store):
+    def __init__(self, service):
         super().__init__("Fleet Management")
-        self.vehicle_store = vehicle_store  # Reference to the vehicle data store
+        self.service = service  # Business operations shared with the other front ends
         self.__status = "Available"
 
         # Add menu options
@@ -295,43 +3631,23 @@ class FleetMenu(Menu):
         # Get vehicle details from user
         # Validate vehicle type
         while True:
-            vehicle_type = input("Enter vehicle type: ").title()
-            if (re.match(r'^[a-zA-Z][a-zA-Z\s]*$', vehicle_type)
-                and len(vehicle_type) >= 3):
+            try:
+                vehicle_type = clean_vehicle_type(read_input("Enter vehicle type: "))
                 break
-            else:
-                print(
-                    "Error: The vehicle type must contain only "
-                    "letters or spaces and be at least 3 characters long.")
+            except ValueError as error:
+                print(f"Error: {error}")
 
         # Validate capacity
         while True:
-            user_input = input("Enter vehicle capacity: ")
             try:
-                # First try to convert to float
-                capacity = float(user_input)
-
-                # Check if the value is positive
-                if capacity <= 0:
-                    print("Please validate your input, no zero values are allowed.")
-                    continue
-
-                # If it's actually an integer, convert it
-                if capacity.is_integer():
-                    capacity = int(capacity)
-
+                capacity = clean_capacity(read_input("Enter vehicle capacity: "))
                 break  # Valid input, exit the loop
+            except ValueError as error:
+                print(error)
 
-            except ValueError:
-                print("Please validate your input. Only numbers are allowed.")
-        status = self.__status
-
-        # Create new vehicle object
-        vehicle = Vehicle(type=vehicle_type, capacity=capacity, status=status)
-
-        # Add to data store
-        vehicle_id = self.vehicle_store.add(vehicle)
-        print(f"Vehicle added successfully with ID: {vehicle_id}")
+        # Create and store the new vehicle
+        vehicle = self.service.add_vehicle(vehicle_type, capacity, self.__status)
+        print(f"Vehicle added successfully with ID: {vehicle.id}")
         print("\033[92m Code by Jael\033[00m")
 
     def update_vehicle(self):
@@ -339,8 +3655,8 @@ class FleetMenu(Menu):
         print("\n=== Update Vehicle Information ===")
 
         # Get vehicle ID
-        vehicle_id = input("Enter vehicle ID to update: ")
-        vehicle = self.vehicle_store.find(vehicle_id)
+        vehicle_id = read_input("Enter vehicle ID to update: ")
+        vehicle = self.service.get_vehicle(vehicle_id)
 
         if not vehicle:
             print(f"No vehicle found with ID: {vehicle_id}")
@@ -352,40 +3668,26 @@ class FleetMenu(Menu):
 
         # Get updated information
         while True:
-            vehicle_type = input(f"Enter new type (or press Enter to keep '{vehicle.type}'): ").title() or vehicle.type
-            if (re.match(r'^[a-zA-Z][a-zA-Z\s]*$', vehicle_type)
-                and len(vehicle_type) >= 3):
+            try:
+                vehicle_type = clean_vehicle_type(
+                    read_input(f"Enter new type (or press Enter to keep '{vehicle.type}'): ") or vehicle.type)
                 break
-            else:
-                print(
-                    "Error: The vehicle type must contain only "
-                    "letters or spaces and be at least 3 characters long.")
+            except ValueError as error:
+                print(f"Error: {error}")
 
         # Validate capacity
         while True:
-            user_input = input(f"Enter new capacity (or press Enter to keep '{vehicle.capacity}'): ") or str(vehicle.capacity)
             try:
-                # First try to convert to float
-                capacity = float(user_input)
-                # Check if the value is positive
-                if capacity <= 0:
-                    print("Please validate your input, no zero values are allowed.")
-                    continue
-                # If it's actually an integer, convert it
-                if capacity.is_integer():
-                    capacity = int(capacity)
+                capacity = clean_capacity(
+                    read_input(f"Enter new capacity (or press Enter to keep '{vehicle.capacity}'): ")
+                    or vehicle.capacity)
                 break  # Valid input, exit the loop
-            except ValueError:
-                print("Please validate your input. Only numbers are allowed.")
-        status = input(f"Enter new status (or press Enter to keep '{vehicle.status}'): ") or vehicle.status
-
-        # Update vehicle object
-        vehicle.type = vehicle_type
-        vehicle.capacity = capacity
-        vehicle.status = status
+            except ValueError as error:
+                print(error)
+        status = read_input(f"Enter new status (or press Enter to keep '{vehicle.status}'): ") or vehicle.status
 
         # Update in data store
-        self.vehicle_store.update(vehicle_id, vehicle)
+        self.service.update_vehicle(vehicle_id, vehicle_type, capacity, status)
         print("Vehicle information updated successfully.")
         print("\033[92m Code by Jael\033[00m")
 
@@ -394,8 +3696,8 @@ class FleetMenu(Menu):
         print("\n=== Remove a Vehicle ===")
 
         # Get vehicle ID
-        vehicle_id = input("Enter vehicle ID to remove: ")
-        vehicle = self.vehicle_store.find(vehicle_id)
+        vehicle_id = read_input("Enter vehicle ID to remove: ")
+        vehicle = self.service.get_vehicle(vehicle_id)
 
         if not vehicle:
             print(f"No vehicle found with ID: {vehicle_id}")
@@ -407,178 +3709,77 @@ class FleetMenu(Menu):
 
 
         # Confirm removal
-        confirm = input("Are you sure you want to remove this vehicle? (y/n): ")
+        confirm = read_input("Are you sure you want to remove this vehicle? (y/n): ")
         if confirm.lower() == 'y':
-            self.vehicle_store.remove(vehicle_id)
+            self.service.remove_vehicle(vehicle_id)
             print("Vehicle removed successfully.")
             print("\033[92m Code by Jael\033[00m")
         else:
             print("Removal cancelled.")
 
-    def view_vehicles(self):
-        """Display all vehicles in the fleet."""
-        print("\n=== All Vehicles ===")
-
-        vehicles = self.vehicle_store.find_all()
-        if not vehicles:
-            print("No vehicles in the fleet.")
-            return
-
-        for vehicle in vehicles:
-            vehicle.display_info()
-            print("-" * 30)
-        print("\033[92m Code by Jael\033[00m")
-
-
-class CustomerMenu(Menu):
-    """Customer Management Menu derived from base Menu"""
-
-    def __init__(self, customer_store, shipment_store):
-        super().__init__("Customer Management")
-        self.customer_store = customer_store  # Reference to the customer data store
-        self.shipment_store = shipment_store  # Reference to the shipment data store
-
-        # Add menu options
-        self.add_option('1', 'Add a customer', self.add_customer)
-        self.add_option('2', 'Update customer information', self.update_customer)
-        self.add_option('3', 'Remove a customer', self.remove_customer)
-        self.add_option('4', 'View all customers', self.view_customers)
-        self.add_option('5', 'View a customer\'s shipments', self.view_customer_shipments)
-        self.add_option('6', 'Quit customer management', lambda: None)  # Just for display
-
-    def add_customer(self):
-        """Add a new customer."""
-        print("\n=== Add a New Customer ===")
-
-        # Get customer details from user
-        while True:
-            name = input("Enter customer name (first and last name): ").title()
-            # Check if name has at least two words
-            words = name.split()
-            if (re.match(r'^[a-zA-Z][a-zA-Z\s]*$', name)
-                    and len(words) >= 2
-                    and len(name) >= 6):
-                break
-            else:
-                print(
-                    "The customer name must contain at least two words "
-                    "(first and last name), only letters or spaces, "
-                    "and be at least 6 characters long.")
-
-        while True:
-            date_str = input("Enter birthday (dd-mm-yyyy): ")
-            try:
-                d = datetime.datetime.strptime(date_str, '%d-%m-%Y')
-                today = datetime.datetime.now()
-
-                # Check if date is in the future
-                if d > today:
-                    print("Birthday cannot be in the future!")
-                    continue
-
-                # Check if age is reasonable (not over 120 years)
-                age = today.year - d.year - ((today.month, today.day) < (d.month, d.day))
-                if age > 120:
-                    print("Please enter a valid birthday (age cannot exceed 120 years).")
-                    continue
-
-                if age < 18:
-                    print("You are under 18 years. You need to be over 18 years to use the program.")
-                    continue
-
-                break
-            except ValueError:
-                print("Invalid date format! Please use dd-mm-yyyy format.")
-
-        while True:
-            address = input("Enter Australian address: ").title().strip()
-
-            # Define the address pattern
-            address_pattern = r"""
-                ^
-                (?:(?:Unit|Apt|Apartment|Flat)\s*\d+[a-zA-Z]?[/\-\s]+)?  # Optional unit
-                \d+[a-zA-Z]?(?:\s*-\s*\d+[a-zA-Z]?)?                     # Street number
-                \s+
-                (?:[A-Za-z][A-Za-z']+(?:\s+[A-Za-z][A-Za-z']+)*)         # Street name
-                \s+
-                (?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Court|Ct|Place|Pl|Parade|Pde|Boulevard|Blvd|Terrace|Tce|Way|Highway|Hwy|Crescent|Cres|Circuit|Cct|Square|Sq|Close|Cl)\.?
-                \s*,?\s*
-                [A-Za-z][A-Za-z\s'-]+                                    # Suburb
-                \s+
-                (?:NSW|VIC|QLD|SA|WA|TAS|NT|ACT)                        # State
-                \s+
-                \d{4}                                                    # Postcode
-                $
-            """
-
-            # Check if address matches the pattern
-            if re.match(address_pattern, address, re.VERBOSE | re.IGNORECASE):
-                # Additional checks
-                parts = address.split()
-                if len(parts) >= 5:  # Minimum components
-                    break
-            else:
-                print(
-                    "Please enter a valid Australian address.\n"
-                    "Format: [Unit/]Number Street Name, Suburb STATE Postcode\n"
-                    "Example: 123 Smith Street, Surry Hills NSW 2000\n"
-                    "Example: Unit 5/123 Park Road, Melbourne VIC 3000"
-                )
-
-        # Email validation
-        while True:
-            email = input("Enter email address: ").strip().lower()
-
-            # Email pattern
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    def view_vehicles(self):
+        """Display all vehicles in the fleet."""
+        print("\n=== All Vehicles ===")
 
-            if re.match(email_pattern, email) and len(email) >= 6:
-                # Additional checks
-                if email.count('@') == 1 and not email.startswith('@') and not email.endswith('@'):
-                    break
+        self.browse(self.service.iter_vehicles, self.format_vehicle, "No vehicles in the fleet.")
+        print("\033[92m Code by Jael\033[00m")
 
-            print(
-                "Please enter a valid email address.\n"
-                "Format: username@domain.com\n"
-                "Example: john.smith@email.com"
-            )
+    @staticmethod
+    def format_vehicle(vehicle):
+        """Return the text of one vehicle in the listing."""
+        return f"{vehicle.format_info()}\n{'-' * 30}\n"
 
-        # Phone number validation (Australian format)
-        while True:
-            phone = input("Enter Australian phone number: ").strip()
 
-            # Remove spaces, dashes, and parentheses for validation
-            cleaned_phone = re.sub(r'[\s\-\(\)]', '', phone)
+class CustomerMenu(Menu):
+    """Customer Management Menu derived from base Menu"""
 
-            # Australian phone patterns
-            mobile_pattern = r'^(?:\+?61|0)4\d{8}$'  # Mobile: 04XX XXX XXX or +614XX XXX XXX
-            landline_pattern = r'^(?:\+?61|0)[2378]\d{8}$'  # Landline: 02/03/07/08 XXXX XXXX
+    def __init__(self, service):
+        super().__init__("Customer Management")
+        self.service = service  # Business operations shared with the other front ends
 
-            if re.match(mobile_pattern, cleaned_phone) or re.match(landline_pattern, cleaned_phone):
-                break
+        # Add menu options
+        self.add_option('1', 'Add a customer', self.add_customer)
+        self.add_option('2', 'Update customer information', self.update_customer)
+        self.add_option('3', 'Remove a customer', self.remove_customer)
+        self.add_option('4', 'View all customers', self.view_customers)
+        self.add_option('5', 'View a customer\'s shipments', self.view_customer_shipments)
+        self.add_option('6', 'Find a customer', self.find_customer)
+        self.add_option('7', 'Quit customer management', lambda: None)  # Just for display
 
-            print(
-                "Please enter a valid Australian phone number.\n"
-                "Mobile format: 04XX XXX XXX or +614XX XXX XXX\n"
-                "Landline format: (0X) XXXX XXXX or +61X XXXX XXXX\n"
-                "Examples: 0412 345 678, (02) 1234 5678, +61 412 345 678"
-            )
+    @staticmethod
+    def ask(prompt, clean, keep=None):
+        """Ask until clean() accepts the answer; an empty answer returns keep when given."""
+        while True:
+            answer = read_input(prompt)
+            if keep is not None and not answer.strip():
+                return keep
+            try:
+                return clean(answer)
+            except ValueError as error:
+                print(error)
+
+    def add_customer(self):
+        """Add a new customer."""
+        print("\n=== Add a New Customer ===")
 
-        # Create new customer object - Format the date as string
-        customer = Customer(name=name, birthday=d.strftime('%d-%m-%Y'),
-                            address=address, email=email, phone=phone)
+        # Get customer details from user
+        name = self.ask("Enter customer name (first and last name): ", clean_customer_name)
+        birthday = self.ask("Enter birthday (dd-mm-yyyy): ", clean_birthday)
+        address = self.ask("Enter Australian address: ", clean_au_address)
+        email = self.ask("Enter email address: ", clean_email)
+        phone = self.ask("Enter Australian phone number: ", clean_phone)
 
-        # Add to data store
-        customer_id = self.customer_store.add(customer)
-        print(f"Customer added successfully with ID: {customer_id}")
+        # Create and store the new customer
+        customer = self.service.add_customer(name, birthday, address, email, phone)
+        print(f"Customer added successfully with ID: {customer.id}")
 
     def update_customer(self):
         """Update an existing customer's information."""
         print("\n=== Update Customer Information ===")
 
         # Get customer ID
-        customer_id = input("Enter customer ID to update: ")
-        customer = self.customer_store.find(customer_id)
+        customer_id = read_input("Enter customer ID to update: ")
+        customer = self.service.get_customer(customer_id)
 
         if not customer:
             print(f"No customer found with ID: {customer_id}")
@@ -589,154 +3790,21 @@ class CustomerMenu(Menu):
         customer.display_info()
         print()
 
-        # Name validation
-        while True:
-            new_name = input(f"Enter new name (or press Enter to keep '{customer.name}'): ").title()
-
-            if not new_name:  # Keep existing name
-                new_name = customer.name
-                break
-
-            # Check if name has at least two words
-            words = new_name.split()
-            if (re.match(r'^[a-zA-Z][a-zA-Z\s]*$', new_name)
-                    and len(words) >= 2
-                    and len(new_name) >= 6):
-                break
-            else:
-                print(
-                    "The customer name must contain at least two words "
-                    "(first and last name), only letters or spaces, "
-                    "and be at least 6 characters long.")
-
-        # Birthday validation - USE dob attribute and format properly!
-        while True:
-            date_str = input(f"Enter new birthday dd-mm-yyyy (or press Enter to keep current): ")
-
-            if not date_str:  # Keep existing birthday
-                new_birthday = customer.dob  # Keep as string
-                break
-
-            try:
-                d = datetime.datetime.strptime(date_str, '%d-%m-%Y')
-                today = datetime.datetime.now()
-
-                # Check if date is in the future
-                if d > today:
-                    print("Birthday cannot be in the future!")
-                    continue
-
-                # Check if age is reasonable (not over 120 years)
-                age = today.year - d.year - ((today.month, today.day) < (d.month, d.day))
-                if age > 120:
-                    print("Please enter a valid birthday (age cannot exceed 120 years).")
-                    continue
-
-                if age < 18:
-                    print("You are under 18 years. You need to be over 18 years to use the program.")
-                    continue
-
-                new_birthday = d.strftime('%d-%m-%Y')  # Format as dd-mm-yyyy string
-                break
-            except ValueError:
-                print("Invalid date format! Please use dd-mm-yyyy format.")
-
-        # Address validation
-        while True:
-            new_address = input(f"Enter new address (or press Enter to keep current): ").title().strip()
-
-            if not new_address:  # Keep existing address
-                new_address = customer.address
-                break
-
-            # Define the address pattern
-            address_pattern = r"""
-                ^
-                (?:(?:Unit|Apt|Apartment|Flat)\s*\d+[a-zA-Z]?[/\-\s]+)?  # Optional unit
-                \d+[a-zA-Z]?(?:\s*-\s*\d+[a-zA-Z]?)?                     # Street number
-                \s+
-                (?:[A-Za-z][A-Za-z']+(?:\s+[A-Za-z][A-Za-z']+)*)         # Street name
-                \s+
-                (?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Court|Ct|Place|Pl|Parade|Pde|Boulevard|Blvd|Terrace|Tce|Way|Highway|Hwy|Crescent|Cres|Circuit|Cct|Square|Sq|Close|Cl)\.?
-                \s*,?\s*
-                [A-Za-z][A-Za-z\s'-]+                                    # Suburb
-                \s+
-                (?:NSW|VIC|QLD|SA|WA|TAS|NT|ACT)                        # State
-                \s+
-                \d{4}                                                    # Postcode
-                $
-            """
-
-            # Check if address matches the pattern
-            if re.match(address_pattern, new_address, re.VERBOSE | re.IGNORECASE):
-                # Additional checks
-                parts = new_address.split()
-                if len(parts) >= 5:  # Minimum components
-                    break
-            else:
-                print(
-                    "Please enter a valid Australian address.\n"
-                    "Format: [Unit/]Number Street Name, Suburb STATE Postcode\n"
-                    "Example: 123 Smith Street, Surry Hills NSW 2000\n"
-                    "Example: Unit 5/123 Park Road, Melbourne VIC 3000"
-                )
-
-        # Email validation
-        while True:
-            new_email = input(f"Enter new email (or press Enter to keep current): ").strip().lower()
-
-            if not new_email:  # Keep existing email
-                new_email = customer.email
-                break
-
-            # Email pattern
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-
-            if re.match(email_pattern, new_email) and len(new_email) >= 6:
-                # Additional checks
-                if new_email.count('@') == 1 and not new_email.startswith('@') and not new_email.endswith('@'):
-                    break
-
-            print(
-                "Please enter a valid email address.\n"
-                "Format: username@domain.com\n"
-                "Example: john.smith@email.com"
-            )
-
-        # Phone number validation (Australian format)
-        while True:
-            new_phone = input(f"Enter new Australian phone number (or press Enter to keep current): ").strip()
-
-            if not new_phone:  # Keep existing phone
-                new_phone = customer.phone
-                break
-
-            # Remove spaces, dashes, and parentheses for validation
-            cleaned_phone = re.sub(r'[\s\-\(\)]', '', new_phone)
-
-            # Australian phone patterns
-            mobile_pattern = r'^(?:\+?61|0)4\d{8}$'  # Mobile: 04XX XXX XXX or +614XX XXX XXX
-            landline_pattern = r'^(?:\+?61|0)[2378]\d{8}$'  # Landline: 02/03/07/08 XXXX XXXX
-
-            if re.match(mobile_pattern, cleaned_phone) or re.match(landline_pattern, cleaned_phone):
-                break
-
-            print(
-                "Please enter a valid Australian phone number.\n"
-                "Mobile format: 04XX XXX XXX or +614XX XXX XXX\n"
-                "Landline format: (0X) XXXX XXXX or +61X XXXX XXXX\n"
-                "Examples: 0412 345 678, (02) 1234 5678, +61 412 345 678"
-            )
-
-        # Update customer object
-        customer.name = new_name
-        customer.dob = new_birthday  # Store as formatted string
-        customer.address = new_address
-        customer.email = new_email
-        customer.phone = new_phone
+        # Each answer is validated; pressing Enter keeps the current value
+        new_name = self.ask(f"Enter new name (or press Enter to keep '{customer.name}'): ",
+                            clean_customer_name, customer.name)
+        new_birthday = self.ask(f"Enter new birthday dd-mm-yyyy (or press Enter to keep current): ",
+                                clean_birthday, customer.dob)
+        new_address = self.ask(f"Enter new address (or press Enter to keep current): ",
+                               clean_au_address, customer.address)
+        new_email = self.ask(f"Enter new email (or press Enter to keep current): ",
+                             clean_email, customer.email)
+        new_phone = self.ask(f"Enter new Australian phone number (or press Enter to keep current): ",
+                             clean_phone, customer.phone)
 
         # Update in data store
-        self.customer_store.update(customer_id, customer)
+        customer = self.service.update_customer(customer_id, new_name, new_birthday,
+                                                new_address, new_email, new_phone)
 
         print("\n✓ Customer information updated successfully!")
         print("\nUpdated information:")
@@ -747,8 +3815,8 @@ class CustomerMenu(Menu):
         print("\n=== Remove a Customer ===")
 
         # Get customer ID
-        customer_id = input("Enter customer ID to remove: ")
-        customer = self.customer_store.find(customer_id)
+        customer_id = read_input("Enter customer ID to remove: ")
+        customer = self.service.get_customer(customer_id)
 
         if not customer:
             print(f"No customer found with ID: {customer_id}")
@@ -764,34 +3832,50 @@ class CustomerMenu(Menu):
             print("Removing this customer will affect these shipments.")
 
         # Confirm removal
-        confirm = input("Are you sure you want to remove this customer? (y/n): ")
+        confirm = read_input("Are you sure you want to remove this customer? (y/n): ")
         if confirm.lower() == 'y':
-            self.customer_store.remove(customer_id)
+            self.service.remove_customer(customer_id)
             print("Customer removed successfully.")
         else:
             print("Removal cancelled.")
 
+    def find_customer(self):
+        """Find customers by the start of their name, their email or their phone number."""
+        print("\n=== Find a Customer ===")
+
+        query = read_input("Enter the start of a name, an email or a phone number: ").strip()
+        if not query:
+            print("Nothing to search for.")
+            return
+
+        customers = self.service.find_customers(query, self.page_size)
+        if not customers:
+            print(f"No customer found for: {query}")
+            return
+        print(f"{len(customers)} customer(s) found:\n")
+        print("".join(map(self.format_customer, customers)), end="")
+
     def view_customers(self):
         """Display all customers."""
         print("\n=== All Customers ===")
 
-        customers = self.customer_store.find_all()
-        if not customers:
-            print("No customers in the database.")
-            return
+        self.browse(self.service.iter_customers, self.format_customer,
+                    "No customers in the database.")
 
-        for customer in customers:
-            customer.display_info()
-            print(f"Number of shipments: {len(customer.shipment_ids)}")
-            print("-" * 30)
+    @staticmethod
+    def format_customer(customer):
+        """Return the text of one customer in the listing."""
+        return (f"{customer.format_info()}\n"
+                f"Number of shipments: {len(customer.shipment_ids)}\n"
+                f"{'-' * 30}\n")
 
     def view_customer_shipments(self):
         """View shipments for a specific customer."""
         print("\n=== View Customer's Shipments ===")
 
         # Get customer ID
-        customer_id = input("Enter customer ID: ")
-        customer = self.customer_store.find(customer_id)
+        customer_id = read_input("Enter customer ID: ")
+        customer = self.service.get_customer(customer_id)
 
         if not customer:
             print(f"No customer found with ID: {customer_id}")
@@ -803,8 +3887,7 @@ class CustomerMenu(Menu):
             print("No shipments found for this customer.")
             return
 
-        for shipment_id in customer.shipment_ids:
-            shipment = self.shipment_store.find(shipment_id)
+        for shipment_id, shipment in self.service.customer_shipments(customer_id):
             if shipment:
                 shipment.display_info(customer_name=customer.name)
                 print("-" * 30)
@@ -817,50 +3900,45 @@ class CustomerMenu(Menu):
 class ShipmentMenu(Menu):
     """Shipment Management Menu derived from base Menu"""
 
-    def __init__(self, shipment_store, customer_store, vehicle_store, delivery_store):
+    def __init__(self, service):
         super().__init__("Shipment Management")
-        self.shipment_store = shipment_store  # Reference to shipment data store
-        self.customer_store = customer_store  # Reference to customer data store
-        self.vehicle_store = vehicle_store  # Reference to vehicle data store
-        self.delivery_store = delivery_store  # Reference to delivery data store
+        self.service = service  # Business operations shared with the other front ends
 
         # Add menu options
         self.add_option('1', 'Create a new shipment', self.create_shipment)
         self.add_option('2', 'Track a shipment', self.track_shipment)
         self.add_option('3', 'View all shipments', self.view_shipments)
-        self.add_option('4', 'Quit shipment management', lambda: None)  # Just for display
+        self.add_option('4', 'Assign vehicles to unassigned shipments', self.assign_vehicles)
+        self.add_option('5', 'Quit shipment management', lambda: None)  # Just for display
 
     def validate_address(self, address_type):
         """Validate address format for origin or destination."""
         while True:
-            address = input(f"Please enter the {address_type} address.\n"
-                            "Please use: street and number, suburb, zipcode: ").lower()
-
-            pattern = (r'^([a-zA-Z0-9][a-zA-Z0-9\s\-]{2,}),'
-                       r'\s*([a-zA-Z][a-zA-Z\s-]{2,}),\s*([a-zA-Z0-9]{4,10})$')
-
-            match = re.match(pattern, address)
-            if match:
-                street, suburb, zipcode = match.groups()
-                print("Thank you for providing a valid format address!")
-                print(f"Street and number: {street}")
-                print(f"Suburb: {suburb}")
-                print(f"Zipcode: {zipcode}")
-                return address.title()
-            else:
-                print("Invalid address format. Please use: street and number, suburb, zipcode")
-                retry = input("Would you like to try again? (y/n): ")
+            address = read_input(f"Please enter the {address_type} address.\n"
+                                 "Please use: street and number, suburb, zipcode: ")
+            try:
+                street, suburb, zipcode = split_shipment_address(address)
+            except ValueError as error:
+                print(error)
+                retry = read_input("Would you like to try again? (y/n): ")
                 if retry.lower() != 'y':
                     print("Returning to Shipment Management menu...")
                     return None
+                continue
+
+            print("Thank you for providing a valid format address!")
+            print(f"Street and number: {street}")
+            print(f"Suburb: {suburb}")
+            print(f"Zipcode: {zipcode}")
+            return clean_shipment_address(address)
 
     def create_shipment(self):
         """Create a new shipment."""
         print("\n=== Create a New Shipment ===")
 
         # Get customer ID
-        customer_id = input("Enter customer ID: ")
-        customer = self.customer_store.find(customer_id)
+        customer_id = read_input("Enter customer ID: ")
+        customer = self.service.get_customer(customer_id)
 
         if not customer:
             print(f"No customer found with ID: {customer_id}")
@@ -873,7 +3951,7 @@ class ShipmentMenu(Menu):
         # Get shipment details
         # Validate origin address with option to use customer address
         print("\n=== Origin Address ===")
-        use_customer_address = input("Use customer address as origin? (y/n): ").lower()
+        use_customer_address = read_input("Use customer address as origin? (y/n): ").lower()
 
         if use_customer_address == 'y':
             origin = customer.address
@@ -886,7 +3964,7 @@ class ShipmentMenu(Menu):
         # Validate destination address with option to use customer address
         print("\n=== Destination Address ===")
         if use_customer_address != 'y':  # Only ask if origin wasn't customer address
-            use_customer_address_dest = input("Use customer address as destination? (y/n): ").lower()
+            use_customer_address_dest = read_input("Use customer address as destination? (y/n): ").lower()
 
             if use_customer_address_dest == 'y':
                 destination = customer.address
@@ -902,46 +3980,19 @@ class ShipmentMenu(Menu):
 
         # Weight validation
         while True:
-            weight_input = input("Please enter the weight of the package in kg: ").strip()
-
-            if not weight_input:
-                print("Weight cannot be empty. Please enter a valid weight.")
-                retry = input("Would you like to try again? (y/n): ")
-                if retry.lower() != 'y':
-                    print("Returning to Shipment Management menu...")
-                    return
-                continue
-
-            pattern = r'^\d+(\.\d+)?'
-            match = re.match(pattern, weight_input)
-
-            if match:
-                weight = float(weight_input)
-
-                if weight <= 0:
-                    print("Weight must be greater than zero. Please enter a positive weight.")
-                    retry = input("Would you like to try again? (y/n): ")
-                    if retry.lower() != 'y':
-                        print("Returning to Shipment Management menu...")
-                        return
-                    continue
-
-                if weight.is_integer():
-                    weight = int(weight)
-
+            try:
+                weight = clean_weight(read_input("Please enter the weight of the package in kg: "))
                 print(f"The weight typed is: {weight} kg.")
                 break
-            else:
-                print("This is not a valid input. Try again.\n"
-                      "Remember that only positive numbers are allowed")
-                retry = input("Would you like to try again? (y/n): ")
+            except ValueError as error:
+                print(error)
+                retry = read_input("Would you like to try again? (y/n): ")
                 if retry.lower() != 'y':
                     print("Returning to Shipment Management menu...")
                     return
 
-        # Get available vehicles that can carry the weight
-        vehicles = self.vehicle_store.find_all()
-        available_vehicles = [v for v in vehicles if v.status == "Available" and v.capacity >= weight]
+        # Get available vehicles with room left for the weight
+        available_vehicles = self.service.available_vehicles(weight)
 
         if not available_vehicles:
             print(f"No available vehicles can carry {weight} kg.")
@@ -952,9 +4003,10 @@ class ShipmentMenu(Menu):
             while True:
                 print(f"\n=== Available Vehicles (can carry {weight} kg) ===")
                 for i, vehicle in enumerate(available_vehicles):
-                    print(f"{i + 1}.- {vehicle.id} - {vehicle.type} (Capacity: {vehicle.capacity} kg)")
+                    print(f"{i + 1}.- {vehicle.id} - {vehicle.type} (Capacity: {vehicle.capacity} kg, "
+                          f"{self.service.remaining_capacity(vehicle.id):g} kg free)")
 
-                choice = input("\nPlease select a vehicle (enter number, vehicle ID, or press Enter to skip): ").strip()
+                choice = read_input("\nPlease select a vehicle (enter number, vehicle ID, or press Enter to skip): ").strip()
 
                 if not choice:
                     print("No vehicle assigned to this shipment.")
@@ -981,29 +4033,20 @@ class ShipmentMenu(Menu):
                         break
 
                 print("Invalid selection. Please try again.")
-                retry = input("Would you like to try again? (y/n): ")
+                retry = read_input("Would you like to try again? (y/n): ")
                 if retry.lower() != 'y':
                     print("No vehicle assigned to this shipment.")
                     vehicle_id = None
                     break
 
-        # Create new shipment
-        shipment = Shipment(
-            customer_id=customer_id,
-            origin=origin,
-            destination=destination,
-            weight=weight,
-            vehicle_id=vehicle_id
-        )
-
-        # Add to data store
-        shipment_id = self.shipment_store.add(shipment)
-
-        # Update customer's shipment list
-        customer.shipment_ids.append(shipment_id)
-        self.customer_store.update(customer_id, customer)
+        # Create and store the new shipment
+        try:
+            shipment = self.service.create_shipment(customer_id, origin, destination, weight, vehicle_id)
+        except ServiceError as error:
+            print(f"Error: {error}")
+            return
 
-        print(f"\nShipment created successfully with ID: {shipment_id}")
+        print(f"\nShipment created successfully with ID: {shipment.id}")
         print(f"Origin: {origin}")
         print(f"Destination: {destination}")
         print(f"Weight: {weight} kg")
@@ -1012,50 +4055,55 @@ class ShipmentMenu(Menu):
         else:
             print("No vehicle assigned")
 
+    def assign_vehicles(self):
+        """Assign vehicles to every shipment without one, packing the vehicles as full as possible."""
+        print("\n=== Assign Vehicles ===")
+
+        assignments, unplaced = self.service.plan_assignments()
+        if not assignments:
+            if unplaced:
+                print(f"No available vehicle has room for the {len(unplaced)} unassigned shipments.")
+            else:
+                print("Every shipment already has a vehicle.")
+            return
+
+        vehicles = {}
+        for vehicle_id in assignments.values():
+            vehicles[vehicle_id] = vehicles.get(vehicle_id, 0) + 1
+        print(f"{len(assignments)} shipments can be assigned to {len(vehicles)} vehicles:")
+        for vehicle_id, count in sorted(vehicles.items())[:self.page_size]:
+            print(f"  {vehicle_id}: {count} shipments")
+        if len(vehicles) > self.page_size:
+            print(f"  ... and {len(vehicles) - self.page_size} more vehicles")
+        if unplaced:
+            print(f"{len(unplaced)} shipments do not fit on any available vehicle "
+                  f"and will stay unassigned.")
+
+        confirm = read_input("Assign these vehicles? (y/n): ")
+        if confirm.lower() != 'y':
+            print("Assignment cancelled.")
+            return
+        assigned = self.service.assign_vehicles(assignments)
+        print(f"{len(assigned)} shipments assigned successfully.")
+        if len(assigned) < len(assignments):
+            print(f"{len(assignments) - len(assigned)} shipments were assigned, delivered or "
+                  f"no longer fit meanwhile and were left as they are.")
+
     def generate_status(self, shipment_id):
         """Generate a status message based on shipment ID."""
-        status_messages = {
-            0: "Your shipment is being processed",
-            1: "Your shipment is in transit",
-            2: "Your shipment is out for delivery",
-            3: "Your shipment is at the destination facility"
-        }
-        status_code = sum(ord(char) for char in shipment_id) % 4
-        return status_messages[status_code]
+        return self.service.generate_status(shipment_id)
 
     def get_customer_name(self, customer_id):
         """Get customer name by ID."""
-        customer = self.customer_store.find(customer_id)
-        return customer.name if customer else "Unknown"
+        return self.service.get_customer_name(customer_id)
 
     def get_vehicle_type(self, vehicle_id):
         """Get vehicle type by ID."""
-        if not vehicle_id:
-            return "Not assigned"
-        vehicle = self.vehicle_store.find(vehicle_id)
-        return vehicle.type if vehicle else "Not assigned"
+        return self.service.get_vehicle_type(vehicle_id)
 
     def get_delivery_status(self, shipment):
         """Get delivery status information for a shipment."""
-        if not shipment.delivery_id:
-            return None
-
-        delivery = self.delivery_store.find(shipment.delivery_id)
-        if not delivery:
-            return None
-
-        if delivery.status == "Delivered":
-            return {
-                "status": "Your shipment has been delivered",
-                "date_type": "Delivery Date",
-                "date": delivery.delivery_date
-            }
-        else:
-            return {
-                "status": delivery.status,
-                "date_type": "Scheduled Date",
-                "date": delivery.delivery_date
-            }
+        return self.service.get_delivery_status(shipment)
 
     def track_shipment(self):
         """Track a shipment's status."""
@@ -1065,7 +4113,7 @@ class ShipmentMenu(Menu):
         is_valid_format = lambda sid: len(sid) == 8 and sid.startswith("S")
 
         while True:
-            shipment_id = input("Please enter your Shipment ID (Sxxxxxxx): ").upper()
+            shipment_id = read_input("Please enter your Shipment ID (Sxxxxxxx): ").upper()
 
             # Validate inputs
             if not shipment_id:
@@ -1074,170 +4122,80 @@ class ShipmentMenu(Menu):
 
             if not is_valid_format(shipment_id):
                 print("Error: Invalid format. Use S + 7 characters (e.g., S1234567)")
-                if input("Try again? (y/n): ").lower() != 'y':
+                if read_input("Try again? (y/n): ").lower() != 'y':
                     return
                 continue
 
             # Find shipment
-            shipment = self.shipment_store.find(shipment_id)
-            if not shipment:
+            try:
+                tracking = self.service.track(shipment_id)
+            except ServiceError:
                 print(f"Shipment ID {shipment_id} not found.")
-                if input("Try again? (y/n): ").lower() != 'y':
+                if read_input("Try again? (y/n): ").lower() != 'y':
                     return
                 continue
 
             # Display information
             print(f"\n{'=' * 10} Shipment Tracking {'=' * 10}")
             print(f"ID: {shipment_id}")
-            print(f"Customer: {self.get_customer_name(shipment.customer_id)}")
-            print(f"Route: {shipment.origin} → {shipment.destination}")
-            print(f"Weight: {shipment.weight} kg")
-            print(f"Vehicle: {self.get_vehicle_type(shipment.vehicle_id)}")
+            print(f"Customer: {tracking.customer}")
+            print(f"Route: {tracking.origin} → {tracking.destination}")
+            print(f"Weight: {tracking.weight} kg")
+            print(f"Vehicle: {tracking.vehicle}")
 
             # Status display
-            delivery_info = self.get_delivery_status(shipment)
-            if delivery_info:
-                print(f"\nStatus: {delivery_info['status']}")
-                print(f"{delivery_info['date_type']}: {delivery_info['date']}")
-            else:
-                print(f"\nStatus: {self.generate_status(shipment_id)}")
-                if shipment.status != "Pending":
-                    print(f"Stage: {shipment.status}")
+            print(f"\nStatus: {tracking.status}")
+            if tracking.date_type:
+                print(f"{tracking.date_type}: {tracking.date}")
+            if tracking.stage:
+                print(f"Stage: {tracking.stage}")
 
-            input("\nPress Enter to continue...")
+            pause("\nPress Enter to continue...")
             return
 
     def calculate_simulated_delivery_date(self, shipment):
         """Calculate a simulated delivery date based on shipment properties."""
-        from datetime import timedelta
-        import random
-
-        # Base date (creation date or current date)
-        base_date = datetime.datetime.now()
-
-        # Determine transit days based on various factors
-        transit_days = 2  # Base transit time
-
-        # Factor 1: Weight impact
-        if shipment.weight > 100:
-            transit_days += 2
-        elif shipment.weight > 50:
-            transit_days += 1
-
-        # Factor 2: Vehicle type impact
-        vehicle = self.vehicle_store.find(shipment.vehicle_id) if shipment.vehicle_id else None
-        if vehicle:
-            vehicle_delays = {
-                'Motorcycle': -1,  # Faster for small packages
-                'Van': 0,
-                'Truck': 1,
-                'Cargo Ship': 5,
-                'Airplane': -2  # Fastest
-            }
-            transit_days += vehicle_delays.get(vehicle.type, 0)
-
-        # Factor 3: Random delay simulation (weather, traffic, etc.)
-        random_delay = random.randint(0, 2)
-        transit_days += random_delay
-
-        # Factor 4: Shipment ID based variation (consistent for same ID)
-        id_factor = sum(ord(char) for char in shipment.id) % 3
-        transit_days += id_factor
-
-        # Ensure minimum 1 day transit
-        transit_days = max(1, transit_days)
-
-        # Calculate delivery date, skipping weekends
-        delivery_date = base_date
-        days_added = 0
-
-        while days_added < transit_days:
-            delivery_date += timedelta(days=1)
-            # Skip weekends (5 = Saturday, 6 = Sunday)
-            if delivery_date.weekday() < 5:
-                days_added += 1
-
-        return delivery_date.strftime('%Y-%m-%d')
+        return self.service.calculate_simulated_delivery_date(shipment)
 
     def get_simulated_delivery_info(self, shipment):
         """Get simulated delivery information for display."""
-        # If there's already a delivery record, use it
-        if shipment.delivery_id:
-            return self.get_delivery_status(shipment)
-
-        # Generate simulated delivery date
-        estimated_date = self.calculate_simulated_delivery_date(shipment)
-
-        # Determine status based on current date and estimated delivery
-        current_date = datetime.datetime.now().date()
-        delivery_date = datetime.datetime.strptime(estimated_date, '%Y-%m-%d').date()
-
-        if current_date > delivery_date:
-            # Past delivery date - mark as delivered
-            return {
-                "status": "Your shipment has been delivered",
-                "date_type": "Delivery Date",
-                "date": estimated_date
-            }
-        elif current_date == delivery_date:
-            return {
-                "status": "Out for delivery today",
-                "date_type": "Expected Delivery",
-                "date": estimated_date
-            }
-        else:
-            days_until = (delivery_date - current_date).days
-            if days_until == 1:
-                status = "Arriving tomorrow"
-            else:
-                status = f"In transit - arriving in {days_until} days"
-
-            return {
-                "status": status,
-                "date_type": "Estimated Delivery",
-                "date": estimated_date
-            }
+        return self.service.get_simulated_delivery_info(shipment)
 
     def view_shipments(self):
         """Display all shipments with simulated delivery dates."""
         print("\n=== All Shipments ===")
 
-        shipments = self.shipment_store.find_all()
-        if not shipments:
-            print("No shipments in the database.")
-            return
-
-        for shipment in shipments:
-            # Display shipment info with consistent formatting
-            print(f"Shipment ID: {shipment.id}")
-            print(f"Customer: {self.get_customer_name(shipment.customer_id)}")
-            print(f"Origin: {shipment.origin}")
-            print(f"Destination: {shipment.destination}")
-            print(f"Weight: {shipment.weight} kg")
-            print(f"Vehicle: {self.get_vehicle_type(shipment.vehicle_id)}")
-
+        self.browse(self.service.iter_shipments, self.format_shipment,
+                    "No shipments in the database.")
+
+    @staticmethod
+    def format_shipment(shipment):
+        """Return the text of one shipment in the listing."""
+        # Display shipment info with consistent formatting
+        lines = [
+            f"Shipment ID: {shipment['id']}",
+            f"Customer: {shipment['customer']}",
+            f"Origin: {shipment['origin']}",
+            f"Destination: {shipment['destination']}",
+            f"Weight: {shipment['weight']} kg",
+            f"Vehicle: {shipment['vehicle']}",
             # Status and delivery date display
-            delivery_info = self.get_simulated_delivery_info(shipment)
-            if delivery_info:
-                print(f"Status: {delivery_info['status']}")
-                print(f"{delivery_info['date_type']}: {delivery_info['date']}")
-            else:
-                # Fallback to original status generation
-                print(f"Status: {self.generate_status(shipment.id)}")
-                if shipment.status != "Pending":
-                    print(f"Stage: {shipment.status}")
-
-            print("-" * 30)
+            f"Status: {shipment['status']}",
+        ]
+        if shipment['date_type']:
+            lines.append(f"{shipment['date_type']}: {shipment['date']}")
+        if shipment['stage']:
+            lines.append(f"Stage: {shipment['stage']}")
+        lines.append("-" * 30)
+        return "\n".join(lines) + "\n"
 
 
 class DeliveryMenu(Menu):
     """Delivery Management Menu derived from base Menu"""
 
-    def __init__(self, delivery_store, shipment_store, customer_store):
+    def __init__(self, service):
         super().__init__("Delivery Management")
-        self.delivery_store = delivery_store  # Reference to delivery data store
-        self.shipment_store = shipment_store  # Reference to shipment data store
-        self.customer_store = customer_store  # Reference to customer data store
+        self.service = service  # Business operations shared with the other front ends
 
         # Add menu options
         self.add_option('1', 'Mark Shipment delivery', self.mark_delivery)
@@ -1252,7 +4210,7 @@ class DeliveryMenu(Menu):
         is_valid_format = lambda sid: len(sid) == 8 and sid.startswith("S")
 
         while True:
-            shipment_id = input("Enter shipment ID to mark as delivered (or 'q' to quit): ").upper()
+            shipment_id = read_input("Enter shipment ID to mark as delivered (or 'q' to quit): ").upper()
 
             if shipment_id.lower() == 'q':
                 return
@@ -1262,51 +4220,23 @@ class DeliveryMenu(Menu):
                 print("Error: Invalid format. Use S + 7 characters (e.g., S1234567)")
                 continue
 
-            # Find shipment
-            shipment = self.shipment_store.find(shipment_id)
-            if not shipment:
-                print(f"Error: No shipment found with ID: {shipment_id}")
+            # Record the delivery with the current date and time
+            try:
+                delivery = self.service.mark_delivered(shipment_id)
+            except ServiceError as error:
+                print(f"Error: {error}")
                 continue
-
-            # Check if already delivered
-            if shipment.delivery_id:
-                delivery = self.delivery_store.find(shipment.delivery_id)
-                if delivery and delivery.status == "Delivered":
-                    print(f"Error: This shipment has already been delivered on {delivery.delivery_date}")
-                    continue
-
-            # Automatically capture current date and time
-            current_datetime = datetime.datetime.now()
-            delivery_date = current_datetime.strftime("%d/%m/%Y %H:%M")
-
-            # Create or update delivery record
-            if shipment.delivery_id:
-                delivery = self.delivery_store.find(shipment.delivery_id)
-                delivery.status = "Delivered"
-                delivery.delivery_date = delivery_date
-                self.delivery_store.update(delivery.id, delivery)
-            else:
-                delivery = Delivery(
-                    shipment_id=shipment_id,
-                    delivery_date=delivery_date,
-                    status="Delivered"
-                )
-                delivery_id = self.delivery_store.add(delivery)
-                shipment.delivery_id = delivery_id
-
-            # Update shipment status
-            shipment.status = "Delivered"
-            self.shipment_store.update(shipment_id, shipment)
+            shipment = self.service.get_shipment(shipment_id)
 
             # Display success message
             print("\n✓ DELIVERY CONFIRMATION")
             print("=" * 30)
             print(f"Shipment ID: {shipment_id}")
-            print(f"Date: {delivery_date}")
+            print(f"Date: {delivery.delivery_date}")
             print(f"Status: DELIVERED")
 
             # Get additional info
-            customer = self.customer_store.find(shipment.customer_id)
+            customer = self.service.get_customer(shipment.customer_id)
             if customer:
                 print(f"Customer: {customer.name}")
                 print(f"Address: {shipment.destination}")
@@ -1315,7 +4245,7 @@ class DeliveryMenu(Menu):
             print("Delivery recorded successfully!")
 
             # Ask if want to mark another delivery
-            another = input("\nMark another delivery? (y/n): ")
+            another = read_input("\nMark another delivery? (y/n): ")
             if another.lower() != 'y':
                 break
 
@@ -1324,23 +4254,18 @@ class DeliveryMenu(Menu):
         print("\n=== View Delivery Status ===")
 
         # Get shipment ID
-        shipment_id = input("Enter shipment ID: ")
-        shipment = self.shipment_store.find(shipment_id)
-
-        if not shipment:
-            print(f"No shipment found with ID: {shipment_id}")
+        shipment_id = read_input("Enter shipment ID: ")
+        try:
+            shipment, customer_name, delivery = self.service.delivery_status(shipment_id)
+        except ServiceError as error:
+            print(error)
             return
 
-        # Get customer info
-        customer = self.customer_store.find(shipment.customer_id)
-        customer_name = customer.name if customer else "Unknown"
-
         print(f"Shipment ID: {shipment.id}")
         print(f"Customer: {customer_name}")
         print(f"Status: {shipment.status}")
 
         if shipment.delivery_id:
-            delivery = self.delivery_store.find(shipment.delivery_id)
             if delivery:
                 print("\nDelivery Information:")
                 print(f"Delivery ID: {delivery.id}")
@@ -1352,6 +4277,158 @@ class DeliveryMenu(Menu):
             print("No delivery information available for this shipment.")
 
 
+class ImportReport:
+    """Counts and timing of one bulk import."""
+
+    def __init__(self, kind, path):
+        self.kind = kind
+        self.path = path
+        self.rows = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.kind.title()} from {self.path}: {self.rows} rows, "
+                f"{self.accepted} imported, {self.rejected} rejected "
+                f"in {self.seconds:.2f} s ({self.rows_per_second:,.0f} rows/sec)")
+
+
+class BulkImporter:
+    """Streams vehicles, customers or shipments from CSV or JSONL files into the stores
+
+    Rows are read one at a time and checked by the LogisticsService with the
+    same rules the menus enforce. Valid rows are written through the service
+    in batches; rejected rows are written straight away to a side file (JSON
+    lines with the line number, the reason and the original row). Only one
+    batch is held in memory at a time, whatever the size of the input.
+
+    Expected columns:
+        vehicles:  type, capacity[, status]
+        customers: name, birthday (dd-mm-yyyy), address, email, phone
+        shipments: customer_id, origin, destination, weight[, vehicle_id]
+    """
+
+    KINDS = ("vehicles", "customers", "shipments")
+
+    def __init__(self, service, batch_size=1000):
+        self.service = service
+        self.batch_size = batch_size
+        self._reserved = {}  # Vehicle ID -> weight of the shipment rows waiting in the batch
+
+    def import_file(self, kind, path, rejects_path=None):
+        """Import every row of a .csv or .jsonl file and return an ImportReport"""
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown import kind: {kind}")
+        validate = getattr(self, f"_validate_{kind[:-1]}")
+        write_batch = getattr(self, f"_write_{kind}")
+        rejects_path = rejects_path or f"{path}.rejects.jsonl"
+        report = ImportReport(kind, path)
+        start = time.perf_counter()
+
+        batch = []
+        with open(rejects_path, "w", encoding="utf-8") as rejects:
+            for line_number, row in self._read_rows(path):
+                report.rows += 1
+                try:
+                    if not isinstance(row, dict):
+                        raise ValueError("Not a JSON object")
+                    batch.append(validate(row))
+                except (ValueError, KeyError, TypeError) as error:
+                    report.rejected += 1
+                    rejects.write(json.dumps({"line": line_number, "reason": str(error),
+                                              "row": row}) + "\n")
+                    continue
+                if len(batch) >= self.batch_size:
+                    report.accepted += write_batch(batch)
+                    batch = []
+            if batch:
+                report.accepted += write_batch(batch)
+
+        report.seconds = time.perf_counter() - start
+        if not report.rejected:
+            os.remove(rejects_path)
+        return report
+
+    @staticmethod
+    def _read_rows(path):
+        """Yield (line number, row dictionary) from a CSV or JSON lines file
+
+        A JSON line that is not an object is yielded as it is (the text of the
+        line when it is not JSON at all), to be rejected like any invalid row.
+        """
+        with open(path, newline="", encoding="utf-8") as source:
+            if path.lower().endswith((".jsonl", ".ndjson")):
+                for line_number, line in enumerate(source, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        row = line.strip()
+                    yield line_number, row
+            elif path.lower().endswith(".csv"):
+                # Line 1 is the header
+                for line_number, row in enumerate(csv.DictReader(source), 2):
+                    yield line_number, row
+            else:
+                raise ValueError("Only .csv and .jsonl files can be imported")
+
+    # --- Validation (done by the service, same rules as the menus) ---
+
+    @staticmethod
+    def _text(row, field):
+        value = row.get(field)
+        if value is None or str(value).strip() == "":
+            raise ValueError(f"Missing {field}")
+        return str(value).strip()
+
+    def _validate_vehicle(self, row):
+        return self.service.build_vehicle(self._text(row, "type"), self._text(row, "capacity"),
+                                          row.get("status"))
+
+    def _validate_customer(self, row):
+        return self.service.build_customer(*(self._text(row, field) for field in
+                                             ("name", "birthday", "address", "email", "phone")))
+
+    def _validate_shipment(self, row):
+        vehicle_id = str(row.get("vehicle_id") or "").strip().upper() or None
+        # Rows of the batch not written yet already take room on their vehicles
+        reserved = self._reserved.get(vehicle_id, 0)
+        shipment = self.service.build_shipment(self._text(row, "customer_id").upper(),
+                                               self._text(row, "origin"),
+                                               self._text(row, "destination"),
+                                               self._text(row, "weight"), vehicle_id, reserved)
+        if vehicle_id:
+            self._reserved[vehicle_id] = reserved + shipment.weight
+        return shipment
+
+    # --- Batched writes ---
+
+    def _write_vehicles(self, vehicles):
+        return len(self.service.add_vehicles(vehicles))
+
+    def _write_customers(self, customers):
+        return len(self.service.add_customers(customers))
+
+    def _write_shipments(self, shipments):
+        self._reserved = {}
+        return len(self.service.create_shipments(shipments))
+
+
+# Secondary indexes kept by the data stores of the main menu
+STORE_INDEXES = {
+    "Vehicle": ("status",),
+    "Customer": (),
+    "Shipment": ("customer_id", "vehicle_id", "status"),
+    "Delivery": ("shipment_id", "status"),
+}
+
+
 class MainMenu(Menu):
     """Main Menu class for the Logistics Management System
 
@@ -1359,42 +4436,189 @@ class MainMenu(Menu):
     access all the different management areas.
     """
 
-    def __init__(self):
+    def __init__(self, data_dir=None, fsync_policy=FSYNC_ALWAYS, fsync_interval_ms=100,
+                 storage="wal", node="", shards=0):
         super().__init__("Logistics Management System")
 
-        # Initialize data stores
-        self.vehicle_store = DataStore()
-        self.customer_store = DataStore()
-        self.shipment_store = DataStore()
-        self.delivery_store = DataStore()
-
-        # Initialize submenu instances with data stores
-        self.fleet_menu = FleetMenu(self.vehicle_store)
-        self.customer_menu = CustomerMenu(self.customer_store, self.shipment_store)
-        self.shipment_menu = ShipmentMenu(self.shipment_store, self.customer_store,
-                                          self.vehicle_store, self.delivery_store)
-        self.delivery_menu = DeliveryMenu(self.delivery_store, self.shipment_store,
-                                          self.customer_store)
+        # One ID allocator for every store; the node keeps the IDs of several
+        # processes sharing the same data apart
+        id_allocator = IdAllocator(node)
+        # One lock for every store, so a change spanning several of them is atomic
+        lock = ReadWriteLock()
+
+        # Initialize data stores (persistent when a data directory is given)
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+            claim_node(data_dir, id_allocator.node)
+            # Also refuses sharded shipments opened without --shards
+            check_shard_count(data_dir, "shipments", shards)
+
+        def make_store(name, entity):
+            indexes = STORE_INDEXES[entity]
+            if shards and entity == "Shipment":
+                # Shipments split between worker processes. Only the storage
+                # is split: the service still makes every change under one
+                # lock and keeps its views of the shipments in this process
+                pool = ShardPool(shards, data_dir=data_dir, name=name, indexes=indexes,
+                                 fsync_policy=fsync_policy, fsync_interval_ms=fsync_interval_ms)
+                store = ShardedDataStore(pool, id_allocator=id_allocator, lock=lock)
+            elif not data_dir:
+                store = DataStore(indexes=indexes, id_allocator=id_allocator, lock=lock)
+            elif storage == "sqlite":
+                store = SQLiteDataStore(os.path.join(data_dir, "lms.db"), entity,
+                                        indexes=indexes, id_allocator=id_allocator, lock=lock)
+            else:
+                store = DataStore(os.path.join(data_dir, f"{name}.wal"),
+                                  fsync_policy=fsync_policy,
+                                  fsync_interval_ms=fsync_interval_ms,
+                                  indexes=indexes, id_allocator=id_allocator, lock=lock)
+            return metrics.instrument_store(store, entity)
+
+        self.vehicle_store = make_store("vehicles", "Vehicle")
+        self.customer_store = make_store("customers", "Customer")
+        self.shipment_store = make_store("shipments", "Shipment")
+        self.delivery_store = make_store("deliveries", "Delivery")
+
+        # Every change goes through the service, whatever the front end
+        self.service = LogisticsService(self.vehicle_store, self.customer_store,
+                                        self.shipment_store, self.delivery_store)
+
+        # Initialize submenu instances with the service
+        self.fleet_menu = FleetMenu(self.service)
+        self.customer_menu = CustomerMenu(self.service)
+        self.shipment_menu = ShipmentMenu(self.service)
+        self.delivery_menu = DeliveryMenu(self.service)
 
         # Add menu options
         self.add_option('1', 'Fleet Management', self.fleet_menu.execute)
         self.add_option('2', 'Customer Management', self.customer_menu.execute)
         self.add_option('3', 'Shipment Management', self.shipment_menu.execute)
         self.add_option('4', 'Delivery Management', self.delivery_menu.execute)
+        self.add_option('5', 'Metrics', self.show_metrics)
         self.add_option('0', 'Quit', lambda: None)  # Just for display
 
-
-def main():
+    @staticmethod
+    def show_metrics():
+        """Show how long the menu actions and store operations took, and save the metrics file."""
+        print("\n=== Metrics ===")
+        if not metrics.enabled:
+            print("Metrics are off. Start the program with --metrics FILE to collect them.")
+            return
+        print(f"{'Operation':<58} {'Count':>7} {'Mean ms':>9} {'p99 ms <=':>10}")
+        print("=" * 87)
+        for (metric, labels), histogram in sorted(metrics.histograms.items(), key=lambda item: item[0]):
+            if not histogram.count:
+                continue
+            name = " > ".join(str(value) for _, value in labels)
+            print(f"{name:<58} {histogram.count:>7} {histogram.total / histogram.count * 1000:>9.3f} "
+                  f"{histogram.quantile(0.99) * 1000:>10.3f}")
+        if metrics.path:
+            try:
+                print(f"\nMetrics written to {metrics.write()}")
+            except OSError as error:
+                print(f"Error: could not write {metrics.path}: {error}")
+
+    def close(self):
+        """Flush and close every data store."""
+        for store in (self.vehicle_store, self.customer_store,
+                      self.shipment_store, self.delivery_store):
+            store.close()
+
+
+def parse_arguments(argv=None):
+    """Parse the command line options of the program."""
+    parser = argparse.ArgumentParser(description="Logistics Management System")
+    parser.add_argument("--data-dir",
+                        help="keep the data in this directory so it survives a restart")
+    parser.add_argument("--storage", choices=("wal", "sqlite"), default="wal",
+                        help="how --data-dir is stored: write-ahead log files "
+                             "or an SQLite database (default: wal)")
+    parser.add_argument("--node", default="",
+                        help="1-2 letters or digits put in every new ID so several processes "
+                             "can create records in the same data without clashing")
+    parser.add_argument("--import", dest="imports", nargs=2, action="append",
+                        metavar=("KIND", "FILE"), default=[],
+                        help="import vehicles, customers or shipments from a .csv or "
+                             ".jsonl file and exit (can be repeated)")
+    parser.add_argument("--shards", type=int, default=0, metavar="N",
+                        help="keep the shipments in N worker processes, each with a share "
+                             "of them; a storage split, which does not make the menus faster "
+                             "(not with --storage sqlite)")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default=FSYNC_ALWAYS,
+                        help="when to force changes to disk (default: always)")
+    parser.add_argument("--fsync-interval-ms", type=int, default=100,
+                        help="milliseconds between syncs with --fsync interval")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="time the menu actions and store operations and write the "
+                             "latency histograms to FILE in the Prometheus text format on exit")
+    parser.add_argument("--script", metavar="FILE",
+                        help="read the answers from FILE ('-' for stdin), one per line, "
+                             "without prompts or pauses, and report the time of each command")
+    args = parser.parse_args(argv)
+    if args.shards < 0 or (args.shards and args.storage == "sqlite"):
+        parser.error("--shards needs a positive number and the wal storage")
+    return args
+
+
+def main(argv=None):
     """Main function to run the logistics management system.
 
     This is the starting point of the program. It creates the main menu and starts
     the interaction with the user.
     """
-    menu = MainMenu()
-    menu.execute()
+    args = parse_arguments(argv)
+    if args.metrics:
+        metrics.enable(args.metrics)
+    try:
+        menu = MainMenu(args.data_dir, args.fsync, args.fsync_interval_ms, args.storage,
+                        args.node, args.shards)
+    except ValueError as error:
+        # A bad or missing node, or shipments split into another number of shards
+        sys.exit(f"Error: {error}")
+    try:
+        if args.imports:
+            # Batch mode: import the files without showing the menu
+            importer = BulkImporter(menu.service)
+            try:
+                for kind, path in args.imports:
+                    print(importer.import_file(kind, path))
+            finally:
+                menu.close()
+            return
+        if args.script:
+            run_script(menu, args.script)
+            return
+        try:
+            menu.execute()
+        finally:
+            menu.close()
+    finally:
+        if metrics.enabled:
+            metrics.write()
     print("Thank you for using the Logistics Management System. Goodbye!")
     display_signature()
 
 
+def run_script(menu, path):
+    """Run the menus with the answers of a script file ('-' for stdin) and report the timings"""
+    global script_input
+    script = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    script_input = ScriptInput(script)
+    Menu.timings = {}
+    start = time.perf_counter()
+    try:
+        menu.execute()
+    except EOFError:
+        pass  # The script ended without quitting
+    finally:
+        elapsed = time.perf_counter() - start
+        script_input = None
+        if script is not sys.stdin:
+            script.close()
+        menu.close()
+    sys.stderr.write(format_timings(Menu.timings))
+    sys.stderr.write(f"Script finished in {elapsed:.3f} s\n")
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
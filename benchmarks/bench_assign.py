@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""
+Batch vehicle assignment benchmark for LMS
+
+Packs N unassigned shipments (100k by default) onto V available vehicles
+(5k by default) with the best-fit decreasing engine behind
+LogisticsService.assign_vehicles, and reports the time, the vehicles used,
+how full they are and how many shipments did not fit. For comparison, the
+same placement done with a linear scan over the vehicles (what choosing by
+hand from the whole list amounts to) is timed on a sample of shipments.
+
+Usage: python benchmarks/bench_assign.py [--shipments N] [--vehicles V]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LMS import (DataStore, Customer, Shipment, Vehicle, LogisticsService,  # noqa: E402
+                 CapacityIndex, STORE_INDEXES, pack_best_fit_decreasing)
+
+
+def make_service(shipments, vehicles, seed):
+    """Return a LogisticsService holding the vehicles and unassigned shipments."""
+    rng = random.Random(seed)
+    stores = [DataStore(indexes=STORE_INDEXES[entity])
+              for entity in ("Vehicle", "Customer", "Shipment", "Delivery")]
+    service = LogisticsService(*stores)
+    service.add_vehicles([Vehicle(type="Truck", capacity=rng.randint(500, 5000))
+                          for _ in range(vehicles)])
+    service.add_customers([Customer(name="Bench Customer", address="1 Smith Street, "
+                                    "Surry Hills NSW 2000")])
+    customer_id = service.list_customers()[0].id
+    service.create_shipments([Shipment(customer_id=customer_id, origin="1 High St, Sydney, 2000",
+                                       destination="2 Main Rd, Perth, 6000",
+                                       weight=round(rng.uniform(1, 200), 1))
+                              for _ in range(shipments)])
+    return service
+
+
+def linear_best_fit(items, remaining):
+    """Best-fit decreasing with a scan of every vehicle for each shipment."""
+    for item_id, weight in sorted(items, key=lambda item: item[1], reverse=True):
+        best = None
+        for vehicle_id, kg in remaining.items():
+            if weight <= kg and (best is None or kg < remaining[best]):
+                best = vehicle_id
+        if best is not None:
+            remaining[best] -= weight
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shipments", type=int, default=100_000,
+                        help="number of unassigned shipments (default: 100000)")
+    parser.add_argument("--vehicles", type=int, default=5_000,
+                        help="number of available vehicles (default: 5000)")
+    parser.add_argument("--scan-samples", type=int, default=1_000,
+                        help="shipments placed by the linear scan (default: 1000)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    args = parser.parse_args()
+
+    service = make_service(args.shipments, args.vehicles, args.seed)
+    items = [(shipment.id, shipment.weight) for shipment in service.shipment_store.find_all()]
+    capacities = [(vehicle.id, vehicle.capacity) for vehicle in service.list_vehicles()]
+    print(f"Shipments: {args.shipments:,}  Vehicles: {args.vehicles:,}\n")
+
+    start = time.perf_counter()
+    assignments, unplaced = service.plan_assignments()
+    plan = time.perf_counter() - start
+    start = time.perf_counter()
+    service.assign_vehicles(assignments)
+    apply = time.perf_counter() - start
+
+    # Placement alone, without reading the stores
+    start = time.perf_counter()
+    pack_best_fit_decreasing(items, CapacityIndex(capacities))
+    packing = time.perf_counter() - start
+
+    sample = items[:args.scan_samples]
+    start = time.perf_counter()
+    linear_best_fit(sample, dict(capacities))
+    scan = (time.perf_counter() - start) / len(sample)
+
+    capacity = dict(capacities)
+    weights = dict(items)
+    loads = {}
+    for shipment_id, vehicle_id in assignments.items():
+        loads[vehicle_id] = loads.get(vehicle_id, 0) + weights[shipment_id]
+    fill = sum(loads.values()) / sum(capacity[vehicle_id] for vehicle_id in loads)
+
+    print(f"{'Step':<28} {'Seconds':>9} {'us/shipment':>12}")
+    print("=" * 51)
+    for step, seconds in (("plan (read stores + pack)", plan),
+                          ("assign (write + tracking)", apply),
+                          ("packing only", packing)):
+        print(f"{step:<28} {seconds:>9.3f} {seconds / args.shipments * 1e6:>12.2f}")
+    print(f"{'linear scan (sampled)':<28} {scan * args.shipments:>9.3f} {scan * 1e6:>12.2f}")
+    print(f"\nAssigned {len(assignments):,} shipments to {len(loads):,} vehicles "
+          f"({fill:.1%} full), {len(unplaced):,} did not fit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""
+Concurrent client benchmark for the LMS service
+
+Runs 1, 8 and 32 client threads (by default) for a few seconds each against
+one LogisticsService whose stores share a ReadWriteLock, as in the main
+menu. Each client picks at random, like an operator at a desk would:
+  - track a shipment (60%)
+  - look up the delivery status of a shipment (15%)
+  - create a shipment (15%)
+  - record the delivery of a shipment (10%)
+
+It reports the operations per second, the p50 and p99 latency of reads and
+writes, and the reads that saw half of a change (a shipment marked delivered
+without its delivery record). Once the clients stop, every customer's
+shipment list, every delivered shipment and every vehicle load are checked
+against the stores.
+
+Usage: python benchmarks/bench_concurrency.py [--clients 1,8,32] [--seconds S]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LMS import (DataStore, IdAllocator, ReadWriteLock, LogisticsService,  # noqa: E402
+                 ServiceError, CapacityLedger, STORE_INDEXES)
+from generate_data import DataGenerator  # noqa: E402
+
+ENTITIES = ("Vehicle", "Customer", "Shipment", "Delivery")
+
+
+def make_service(args):
+    """Return a service loaded with generated data, its customer IDs and shipment IDs"""
+    lock = ReadWriteLock()
+    allocator = IdAllocator()
+    service = LogisticsService(*(DataStore(indexes=STORE_INDEXES[entity], id_allocator=allocator,
+                                           lock=lock) for entity in ENTITIES))
+    generator = DataGenerator(args.seed, places=2_000)
+    service.add_vehicles([service.build_vehicle(*row) for row in generator.vehicles(args.vehicles)])
+    customer_ids = service.add_customers([service.build_customer(*row)
+                                          for row in generator.customers(args.customers)])
+    shipments = [service.build_shipment(*row)
+                 for row in generator.shipments(args.shipments, customer_ids)]
+    service.create_shipments(shipments)
+    # Put them on the vehicles, so that deliveries give room back
+    service.assign_vehicles()
+    return service, customer_ids, [shipment.id for shipment in shipments], generator.places
+
+
+def client(service, number, args, customer_ids, shipment_ids, places, start, stop, results):
+    """Run random operations until stop is set; put (reads, writes, torn reads) in results"""
+    rng = random.Random(args.seed + number)
+    reads = []
+    writes = []
+    torn = 0
+    start.wait()
+    while not stop.is_set():
+        pick = rng.random()
+        shipment_id = rng.choice(shipment_ids)
+        began = time.perf_counter()
+        if pick < 0.60:
+            service.track(shipment_id)
+            reads.append(time.perf_counter() - began)
+        elif pick < 0.75:
+            shipment, _, delivery = service.delivery_status(shipment_id)
+            reads.append(time.perf_counter() - began)
+            if shipment.status == "Delivered" and (delivery is None or delivery.status != "Delivered"):
+                torn += 1
+        elif pick < 0.90:
+            shipment = service.create_shipment(rng.choice(customer_ids), rng.choice(places),
+                                               rng.choice(places), round(rng.uniform(1, 50), 1))
+            writes.append(time.perf_counter() - began)
+            shipment_ids.append(shipment.id)
+        else:
+            try:
+                service.mark_delivered(shipment_id)
+            except ServiceError:
+                pass  # Delivered already
+            writes.append(time.perf_counter() - began)
+    results[number] = (reads, writes, torn)
+
+
+def check_stores(service):
+    """Return the problems found in the stores once every client has stopped"""
+    problems = []
+    shipments = service.shipment_store.find_all()
+    owned = {}
+    for shipment in shipments:
+        owned.setdefault(shipment.customer_id, set()).add(shipment.id)
+        if shipment.status == "Delivered":
+            delivery = service.delivery_store.find(shipment.delivery_id)
+            if delivery is None or delivery.status != "Delivered":
+                problems.append(f"{shipment.id} is delivered without a delivery record")
+    for customer in service.customer_store.find_all():
+        if set(customer.shipment_ids) != owned.get(customer.id, set()):
+            problems.append(f"{customer.id} does not list its own shipments")
+    ledger = CapacityLedger()
+    for shipment in shipments:
+        if shipment.vehicle_id and shipment.status != "Delivered":
+            ledger.add(shipment.vehicle_id, shipment.weight)
+    for vehicle in service.vehicle_store.find_all():
+        if abs(ledger.load(vehicle.id) - service.ledger.load(vehicle.id)) > 1e-6:
+            problems.append(f"{vehicle.id} has the wrong load")
+    return problems
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", default="1,8,32",
+                        help="comma-separated numbers of client threads (default: 1,8,32)")
+    parser.add_argument("--seconds", type=float, default=5.0,
+                        help="time each number of clients runs for (default: 5)")
+    parser.add_argument("--vehicles", type=int, default=2_000, help="default: 2000")
+    parser.add_argument("--customers", type=int, default=10_000, help="default: 10000")
+    parser.add_argument("--shipments", type=int, default=50_000, help="default: 50000")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    args = parser.parse_args()
+
+    print(f"Vehicles: {args.vehicles:,}  Customers: {args.customers:,}  "
+          f"Shipments: {args.shipments:,}  Seconds: {args.seconds:g}\n")
+    print(f"{'Clients':>7} {'Ops/s':>10} {'Read p50 us':>12} {'Read p99 us':>12} "
+          f"{'Write p50 us':>13} {'Write p99 us':>13} {'Torn reads':>11} {'Checks':>8}")
+    print("=" * 93)
+    for clients in (int(value) for value in args.clients.split(",")):
+        service, customer_ids, shipment_ids, places = make_service(args)
+        start = threading.Barrier(clients + 1)
+        stop = threading.Event()
+        results = [None] * clients
+        threads = [threading.Thread(target=client, args=(service, number, args, customer_ids,
+                                                         shipment_ids, places, start, stop, results))
+                   for number in range(clients)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+
+        reads = [value for result in results for value in result[0]]
+        writes = [value for result in results for value in result[1]]
+        torn = sum(result[2] for result in results)
+        problems = check_stores(service)
+        print(f"{clients:>7} {(len(reads) + len(writes)) / elapsed:>10,.0f} "
+              f"{percentile(reads, 0.5) * 1e6:>12.1f} {percentile(reads, 0.99) * 1e6:>12.1f} "
+              f"{percentile(writes, 0.5) * 1e6:>13.1f} {percentile(writes, 0.99) * 1e6:>13.1f} "
+              f"{torn:>11} {'ok' if not problems else len(problems):>8}")
+        for problem in problems[:5]:
+            print(f"  {problem}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""
+FMS record table benchmark
+
+Compares the parallel lists FMS.py used to keep (membership test followed by
+list.index, and list.pop on every list) with the hash-indexed RecordTable
+that replaced them, on a table of 1M shipments by default.
+
+Usage: python benchmarks/bench_fms_table.py [--shipments N]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FMS import RecordTable  # noqa: E402
+
+COLUMNS = ("id", "origin", "destination", "weight", "vehicle", "status", "datetime")
+
+
+def make_rows(count):
+    """Build count shipment rows with FMS-style 15-character IDs."""
+    return [(f"A{i:014d}", "1 Main St, Sydney, 2000", "2 High St, Perth, 6000",
+             "12.5", "VTRUCK1", "pending", "2025-01-15 10:30:45") for i in range(count)]
+
+
+def time_per_operation(function, keys):
+    start = time.perf_counter()
+    for key in keys:
+        function(key)
+    return (time.perf_counter() - start) / len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shipments", type=int, default=1_000_000,
+                        help="number of shipments in the table (default: 1000000)")
+    parser.add_argument("--list-samples", type=int, default=200,
+                        help="operations timed on the slow list version (default: 200)")
+    parser.add_argument("--table-samples", type=int, default=100_000,
+                        help="operations timed on the record table (default: 100000)")
+    args = parser.parse_args()
+
+    rows = make_rows(args.shipments)
+    lists = [list(column) for column in zip(*rows)]
+    shipment_ids = lists[0]
+
+    start = time.perf_counter()
+    table = RecordTable("id", COLUMNS, rows=rows, counted=("vehicle",))
+    build = time.perf_counter() - start
+    print(f"Shipments: {args.shipments:,} (table built in {build:.2f} s)\n")
+
+    rng = random.Random(42)
+    list_keys = [shipment_ids[rng.randrange(args.shipments)] for _ in range(args.list_samples)]
+    table_keys = [shipment_ids[rng.randrange(args.shipments)] for _ in range(args.table_samples)]
+
+    def list_lookup(key):
+        if key in shipment_ids:
+            return lists[5][shipment_ids.index(key)]
+
+    def table_lookup(key):
+        if key in table:
+            return table.get(key, "status")
+
+    def list_remove(key):
+        index = shipment_ids.index(key)
+        for column in lists:
+            column.pop(index)
+
+    results = [
+        ("lookup", time_per_operation(list_lookup, list_keys),
+         time_per_operation(table_lookup, table_keys)),
+        ("remove", time_per_operation(list_remove, list_keys),
+         time_per_operation(table.remove, list(dict.fromkeys(table_keys)))),
+    ]
+
+    print(f"{'Operation':<10} {'Lists (us/op)':>15} {'Table (us/op)':>15} {'Speed-up':>10}")
+    print("=" * 53)
+    for name, list_time, table_time in results:
+        print(f"{name:<10} {list_time * 1e6:>15,.1f} {table_time * 1e6:>15,.3f} "
+              f"{list_time / table_time:>9,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
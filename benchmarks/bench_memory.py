@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+Memory benchmark for the LMS record classes
+
+Creates N customers and N shipments (1M by default), plus N vehicles, in a
+DataStore and reports the bytes used per record (object, field values and
+dictionary entry), both for the current __slots__ classes and for the
+previous dictionary-based layout (reproduced below for comparison). Field
+values are distinct per record, as they would be with real data.
+
+The "shared" shipment rows send the N shipments between P places (10k by
+default), as a real customer base does. Validation used to give every
+shipment its own copy of the address text; the canonical Address objects
+are shared by all the shipments that use the same place.
+
+Usage: python benchmarks/bench_memory.py [--records N] [--places P]
+"""
+import os
+import sys
+import gc
+import time
+import datetime
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import LMS  # noqa: E402
+from LMS import DataStore, Customer, Shipment, Vehicle  # noqa: E402
+
+
+class DictCustomer:
+    """Customer with a per-instance __dict__, as the class used to be."""
+
+    def __init__(self, customer_id=None, name=None, birthday=None,
+                 address=None, email=None, phone=None):
+        self.id = customer_id
+        self.name = name
+        self.dob = birthday
+        self.address = address
+        self.email = email
+        self.phone = phone
+        self.shipment_ids = []
+
+
+class DictShipment:
+    """Shipment with a per-instance __dict__, as the class used to be."""
+
+    def __init__(self, shipment_id=None, customer_id=None,
+                 origin=None, destination=None, weight=None, vehicle_id=None):
+        self.id = shipment_id
+        self.customer_id = customer_id
+        self.origin = origin
+        self.destination = destination
+        self.weight = weight
+        self.vehicle_id = vehicle_id
+        self.status = "Pending"
+        self.delivery_id = None
+
+
+class DictVehicle:
+    """Vehicle with a per-instance __dict__ and a date string formatted on creation."""
+
+    def __init__(self, vehicle_id=None, type=None, capacity=None, status="Available"):
+        self.id = vehicle_id
+        self.type = type
+        self.capacity = capacity
+        self.status = status
+        self.date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def make_vehicle(cls, i):
+    return cls(f"V{i:07d}", "Truck", 1000 + i % 5000)
+
+
+def make_customer(cls, i):
+    return cls(f"C{i:07d}", f"Customer Number{i}", "01-02-1990",
+               f"{i} Smith Street, Surry Hills NSW 2000",
+               f"customer{i}@example.com", f"04{i:08d}")
+
+
+def make_shipment(cls, i):
+    return cls(f"S{i:07d}", f"C{i:07d}", f"{i} High St, Sydney, 2000",
+               f"{i} Main Rd, Perth, 6000", 10.0 + i % 100, f"V{i % 5000:07d}")
+
+
+def make_shared_shipment(cls, i, places=10_000):
+    # A new string for every shipment, as clean_shipment_address() used to return
+    return cls(f"S{i:07d}", f"C{i:07d}", f"{i % places} high st, sydney, 2000".title(),
+               f"{i * 7 % places} main rd, perth, 6000".title(), 10.0 + i % 100, f"V{i % 5000:07d}")
+
+
+def measure(factory, cls, count):
+    """Return (bytes per record, seconds) for count records kept in a DataStore."""
+    LMS._canonical_address.cache_clear()  # Count the addresses each run creates
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = DataStore()
+    for i in range(count):
+        item = factory(cls, i)
+        store.data[item.id] = item  # Keep the IDs fixed so both layouts store the same strings
+    elapsed = time.perf_counter() - start
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    gc.collect()
+    return used / count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000,
+                        help="number of customers and of shipments (default: 1000000)")
+    parser.add_argument("--places", type=int, default=10_000,
+                        help="distinct addresses of the shared shipments (default: 10000)")
+    args = parser.parse_args()
+
+    def shared(cls, i):
+        return make_shared_shipment(cls, i, args.places)
+
+    print(f"Records per type: {args.records:,}\n")
+    print(f"{'Record':<10} {'Layout':<12} {'Bytes/record':>13} {'Build (s)':>10}")
+    print("=" * 48)
+    for name, factory, old_cls, new_cls in (
+            ("Vehicle", make_vehicle, DictVehicle, Vehicle),
+            ("Customer", make_customer, DictCustomer, Customer),
+            ("Shipment", make_shipment, DictShipment, Shipment),
+            ("Shared", shared, DictShipment, Shipment)):
+        for layout, cls in (("__dict__", old_cls), ("__slots__", new_cls)):
+            per_record, elapsed = measure(factory, cls, args.records)
+            print(f"{name:<10} {layout:<12} {per_record:>13,.0f} {elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+Sharded shipment store benchmark for LMS
+
+Loads N shipments (200k by default) into a ShardedDataStore split between
+1, 2 and 4 worker processes (by default), then runs one client process per
+shard for a few seconds on a mixed workload: 20% of the operations create a
+shipment and 80% track one (a find routed to the shard owning it). It
+reports the operations per second of all the clients together, the speedup
+over one shard, and the time of a scan and an aggregate fanned out to every
+shard (find_where and group_totals). The first row is a plain DataStore in
+this process, for comparison.
+
+The clients use the pool directly, the only way sharding adds throughput:
+LMS.py --shards runs every change through one LogisticsService under one
+lock, so there it only splits the storage. The speedup can only approach
+the number of shards when the machine has at least as many cores as shards
+plus clients.
+
+Usage: python benchmarks/bench_shards.py [--shards 1,2,4] [--shipments N] [--seconds S]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LMS import (DataStore, ShardPool, ShardedDataStore, IdAllocator, Shipment,  # noqa: E402
+                 STORE_INDEXES, group_totals)
+from generate_data import DataGenerator  # noqa: E402
+
+CREATE_SHARE = 0.2
+
+
+def make_shipments(generator, count):
+    """Return count new Shipment objects (not stored), for customers C0000000 to C00003E7"""
+    customer_ids = IdAllocator().allocate_block("C", 1_000)
+    return [Shipment(customer_id=customer_id, origin=origin, destination=destination,
+                     weight=float(weight))
+            for customer_id, origin, destination, weight, _ in
+            generator.shipments(count, customer_ids)]
+
+
+def run_workload(store, shipment_ids, shipments, seconds, seed):
+    """Create and track shipments until the time is up; return the number of operations"""
+    rng = random.Random(seed)
+    operations = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            if rng.random() < CREATE_SHARE:
+                store.add(shipments[operations % len(shipments)])
+            else:
+                store.find(rng.choice(shipment_ids))
+            operations += 1
+    return operations
+
+
+def client(pool, number, args, shipment_ids, ready, start, results):
+    """Client process: its own store on the shared shards, with its own ID prefix"""
+    store = ShardedDataStore(pool, client=number, id_allocator=IdAllocator(f"{number:02d}"))
+    shipments = make_shipments(DataGenerator(args.seed + number, places=2_000), 1_000)
+    ready.put(number)
+    start.wait()
+    results.put(run_workload(store, shipment_ids, shipments, args.seconds, args.seed + number))
+
+
+def timed(function, *arguments):
+    start = time.perf_counter()
+    function(*arguments)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shards", default="1,2,4",
+                        help="comma-separated numbers of shards (default: 1,2,4)")
+    parser.add_argument("--shipments", type=int, default=200_000,
+                        help="shipments loaded before the clients start (default: 200000)")
+    parser.add_argument("--seconds", type=float, default=5.0,
+                        help="time the clients run for (default: 5)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    args = parser.parse_args()
+
+    generator = DataGenerator(args.seed, places=20_000)
+    loaded = make_shipments(generator, args.shipments)
+    shipment_ids = IdAllocator().allocate_block("S", args.shipments)
+    print(f"Shipments: {args.shipments:,}  Seconds: {args.seconds:g}  Cores: {os.cpu_count()}\n")
+    print(f"{'Shards':>6} {'Clients':>8} {'Ops/s':>10} {'Speedup':>8} "
+          f"{'find_where s':>13} {'group_totals s':>15}")
+    print("=" * 65)
+
+    # A plain store in this process
+    store = DataStore(indexes=STORE_INDEXES["Shipment"])
+    store.add_many(loaded)
+    operations = run_workload(store, shipment_ids, make_shipments(generator, 1_000),
+                              args.seconds, args.seed)
+    print(f"{'-':>6} {1:>8} {operations / args.seconds:>10,.0f} {'':>8} "
+          f"{timed(store.find_by, 'status', 'Pending'):>13.3f} "
+          f"{timed(group_totals, store, 'status', 'weight'):>15.3f}")
+
+    first = None
+    for shards in (int(value) for value in args.shards.split(",")):
+        # Client 0 is this process; one client process per shard
+        pool = ShardPool(shards, clients=shards + 1, indexes=STORE_INDEXES["Shipment"])
+        store = ShardedDataStore(pool)
+        store.add_many(loaded)
+        scan = timed(lambda: store.find_where(status="Pending"))
+        aggregate = timed(store.group_totals, "status", "weight")
+
+        ready = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        start = multiprocessing.Event()
+        processes = [multiprocessing.Process(target=client, args=(pool, number, args, shipment_ids,
+                                                                  ready, start, results))
+                     for number in range(1, shards + 1)]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            ready.get()
+        start.set()
+        throughput = sum(results.get() for _ in processes) / args.seconds
+        for process in processes:
+            process.join()
+        store.close()
+
+        first = first or throughput
+        print(f"{shards:>6} {shards:>8} {throughput:>10,.0f} {throughput / first:>7.2f}x "
+              f"{scan:>13.3f} {aggregate:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""
+Status code benchmark for LMS and FMS shipments
+
+Times the per-character generator both programs used to run for every
+shipment listed (sum of ord() over the ID), next to the batch functions
+that replaced it, on 1M shipment IDs by default. The batch functions use
+NumPy when it is installed and a plain loop otherwise.
+
+Usage: python benchmarks/bench_status.py [--shipments N]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import FMS  # noqa: E402
+from LMS import IdAllocator, shipment_status_codes  # noqa: E402
+
+
+def timed(function, ids):
+    start = time.perf_counter()
+    codes = function(ids)
+    return time.perf_counter() - start, codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shipments", type=int, default=1_000_000,
+                        help="number of shipment IDs (default: 1000000)")
+    args = parser.parse_args()
+
+    lms_ids = IdAllocator().allocate_block("S", args.shipments)
+    fms_ids = [f"A{i * 7919:014d}" for i in range(args.shipments)]
+    print(f"Shipments: {args.shipments:,} (NumPy {'installed' if FMS.np else 'not installed'})\n")
+
+    print(f"{'Program':<8} {'Method':<20} {'Seconds':>9} {'IDs/sec':>14}")
+    print("=" * 54)
+    for program, ids, modulo, batch in (("LMS", lms_ids, 4, shipment_status_codes),
+                                        ("FMS", fms_ids, 3, FMS.status_codes)):
+        def per_character(ids):
+            return [sum(ord(char) for char in shipment_id) % modulo for shipment_id in ids]
+
+        baseline, expected = timed(per_character, ids)
+        elapsed, codes = timed(batch, ids)
+        if codes != expected:
+            raise SystemExit(f"{program}: batch status codes differ from the per-character loop")
+        for method, seconds in (("per character", baseline), ("batch", elapsed)):
+            print(f"{program:<8} {method:<20} {seconds:>9.3f} {len(ids) / seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
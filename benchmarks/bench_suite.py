@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark suite for the hot paths of LMS and FMS
+
+Runs every benchmark at 10k, 100k and 1M records by default, each one in a
+fresh Python process so its peak memory is its own, and reports operations
+per second, the p50 and p99 latency of one operation and the peak resident
+memory (RSS) of the process:
+  - lms.store.add / find / find_all: DataStore of shipments with the indexes
+    of the main menu (find_all latency is one call over the whole store)
+  - lms.vehicle_filter: LogisticsService.available_vehicles() on a fleet of
+    N vehicles, the list ShipmentMenu offers when a shipment is created
+  - lms.delivery_date: calculate_simulated_delivery_date() of N shipments
+  - lms.view_shipments: ShipmentMenu's listing of N shipments rendered page
+    by page (latency of one 20-record page, operations are records)
+  - fms.track / fms.record_delivery: FMS track_shipment() and
+    record_delivery() driven with scripted answers on a table of N shipments
+
+The results are written as JSON. When a baseline file exists (saved by an
+earlier run with --save-baseline) every result is compared with it, and the
+exit status is 1 if any benchmark is slower by more than the tolerance.
+
+Usage: python benchmarks/bench_suite.py [--sizes 10000,100000] [--benchmarks lms.store]
+                                        [--output results.json] [--save-baseline]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import contextlib
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import FMS  # noqa: E402
+from LMS import (DataStore, Customer, Shipment, Vehicle, LogisticsService,  # noqa: E402
+                 ShipmentMenu, Pager, STORE_INDEXES)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+ENTITIES = ("Vehicle", "Customer", "Shipment", "Delivery")
+VEHICLE_TYPES = ("Truck", "Van", "Motorcycle", "Airplane", "Cargo Ship")
+
+# Benchmark name -> function(size, rng) returning (latencies in seconds, operations, seconds)
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+def time_each(function, arguments):
+    """Call function on every argument; return (latencies, operations, total seconds)."""
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    for argument in arguments:
+        before = clock()
+        function(argument)
+        latencies.append(clock() - before)
+    return latencies, len(latencies), clock() - start
+
+
+def make_shipments(count, rng, customer_id="C0000000", vehicle_ids=(None,)):
+    """Return count shipments sent between 1000 places, as real data repeats addresses."""
+    return [Shipment(customer_id=customer_id,
+                     origin=f"{rng.randrange(1000)} High St, Sydney, 2000",
+                     destination=f"{rng.randrange(1000)} Main Rd, Perth, 6000",
+                     weight=round(rng.uniform(1, 200), 1),
+                     vehicle_id=rng.choice(vehicle_ids))
+            for _ in range(count)]
+
+
+def make_service(vehicles, shipments, rng):
+    """Return a LogisticsService with the vehicles and shipments, all kept in memory."""
+    service = LogisticsService(*(DataStore(indexes=STORE_INDEXES[entity]) for entity in ENTITIES))
+    service.add_vehicles([Vehicle(type=rng.choice(VEHICLE_TYPES), capacity=rng.randint(500, 5000))
+                          for _ in range(vehicles)])
+    customer = Customer(name="Bench Customer", address="1 Smith Street, Surry Hills NSW 2000")
+    service.add_customers([customer])
+    if shipments:
+        # One big vehicle per type carries everything, so no shipment is refused
+        carriers = service.add_vehicles([Vehicle(type=vehicle_type, capacity=10 ** 9)
+                                         for vehicle_type in VEHICLE_TYPES])
+        service.create_shipments(make_shipments(shipments, rng, customer.id, carriers))
+    return service
+
+
+@benchmark("lms.store.add")
+def store_add(size, rng):
+    store = DataStore(indexes=STORE_INDEXES["Shipment"])
+    return time_each(store.add, make_shipments(size, rng))
+
+
+@benchmark("lms.store.find")
+def store_find(size, rng):
+    store = DataStore(indexes=STORE_INDEXES["Shipment"])
+    ids = store.add_many(make_shipments(size, rng))
+    rng.shuffle(ids)
+    return time_each(store.find, ids)
+
+
+@benchmark("lms.store.find_all")
+def store_find_all(size, rng):
+    store = DataStore(indexes=STORE_INDEXES["Shipment"])
+    store.add_many(make_shipments(size, rng))
+    latencies, calls, seconds = time_each(lambda _: store.find_all(), range(10))
+    return latencies, calls * size, seconds
+
+
+@benchmark("lms.vehicle_filter")
+def vehicle_filter(size, rng):
+    service = make_service(size, 0, rng)
+    weights = [round(rng.uniform(1, 5000), 1) for _ in range(50)]
+    return time_each(service.available_vehicles, weights)
+
+
+@benchmark("lms.delivery_date")
+def delivery_date(size, rng):
+    service = make_service(0, size, rng)
+    return time_each(service.calculate_simulated_delivery_date, service.shipment_store.find_all())
+
+
+@benchmark("lms.view_shipments")
+def view_shipments(size, rng):
+    service = make_service(0, size, rng)
+    latencies = []
+    clock = time.perf_counter
+    with open(os.devnull, "w", encoding="utf-8") as output:
+        pager = Pager(service.iter_shipments(), ShipmentMenu.format_shipment, output=output)
+        start = clock()
+        while True:
+            before = clock()
+            if not pager.next_page():
+                break
+            latencies.append(clock() - before)
+        seconds = clock() - start
+    return latencies, size, seconds
+
+
+def fms_table(size):
+    """Make FMS use a table of size pending shipments, all on VTRUCK1."""
+    ids = [f"A{i * 7919:014d}" for i in range(size)]
+    FMS.shipments = FMS.RecordTable(
+        "id", ("id", "origin", "destination", "weight", "vehicle", "status", "datetime", "status_code"),
+        rows=[(shipment_id, "1 High St, Sydney, 2000", "2 Main Rd, Perth, 6000", "12.5",
+               "VTRUCK1", "pending", "2025-01-15 10:30:45", code)
+              for shipment_id, code in zip(ids, FMS.status_codes(ids))],
+        counted=("vehicle",))
+    FMS.build_capacity_ledger()
+    return ids
+
+
+def scripted(function):
+    """Return a function answering the questions of an FMS function with its argument."""
+    def run(answer):
+        FMS.script = iter((answer,))
+        function()
+    return run
+
+
+@benchmark("fms.track")
+def fms_track(size, rng):
+    ids = fms_table(size)
+    with open(os.devnull, "w", encoding="utf-8") as output, contextlib.redirect_stdout(output):
+        return time_each(scripted(FMS.track_shipment), rng.choices(ids, k=min(size, 100_000)))
+
+
+@benchmark("fms.record_delivery")
+def fms_record_delivery(size, rng):
+    ids = fms_table(size)
+    rng.shuffle(ids)
+    with open(os.devnull, "w", encoding="utf-8") as output, contextlib.redirect_stdout(output):
+        return time_each(scripted(FMS.record_delivery), ids[:100_000])
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_benchmark(name, size, seed):
+    """Run one benchmark in this process and return its result."""
+    latencies, operations, seconds = BENCHMARKS[name](size, random.Random(seed))
+    latencies.sort()
+    peak = peak_rss_mb()
+    return {
+        "benchmark": name,
+        "size": size,
+        "operations": operations,
+        "seconds": round(seconds, 6),
+        "ops_per_sec": round(operations / seconds, 1),
+        "p50_us": round(percentile(latencies, 0.50) * 1e6, 3),
+        "p99_us": round(percentile(latencies, 0.99) * 1e6, 3),
+        "peak_rss_mb": None if peak is None else round(peak, 1),
+    }
+
+
+def run_in_child(name, size, seed):
+    """Run one benchmark in a new process, so the peak memory is only its own."""
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name,
+                                "--sizes", str(size), "--seed", str(seed)],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise SystemExit(f"{name} at {size:,} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def compare(results, baseline, tolerance):
+    """Add the change against the baseline to every result; return the regressions."""
+    previous = {(result["benchmark"], result["size"]): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["benchmark"], result["size"]))
+        if before is None:
+            continue
+        result["baseline_ops_per_sec"] = before["ops_per_sec"]
+        result["change"] = round(result["ops_per_sec"] / before["ops_per_sec"] - 1, 4)
+        if result["change"] < -tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def print_table(results, stream):
+    stream.write(f"{'Benchmark':<22} {'Size':>9} {'Ops/sec':>13} {'p50 us':>10} {'p99 us':>10} "
+                 f"{'RSS MB':>8} {'vs base':>8}\n")
+    stream.write("=" * 86 + "\n")
+    for result in results:
+        change = f"{result['change']:+.1%}" if "change" in result else "-"
+        rss = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] is not None else "-"
+        stream.write(f"{result['benchmark']:<22} {result['size']:>9,} {result['ops_per_sec']:>13,.0f} "
+                     f"{result['p50_us']:>10.2f} {result['p99_us']:>10.2f} {rss:>8} {change:>8}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="comma-separated numbers of records (default: 10000,100000,1000000)")
+    parser.add_argument("--benchmarks", default="",
+                        help="comma-separated benchmark names or prefixes to run (default: all)")
+    parser.add_argument("--output", help="write the JSON results to this file (default: stdout)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline results to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="slowdown in ops/sec reported as a regression (default: 0.2)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    if args.child:
+        json.dump(run_benchmark(args.child, sizes[0], args.seed), sys.stdout)
+        return
+
+    prefixes = [prefix for prefix in args.benchmarks.split(",") if prefix]
+    names = [name for name in BENCHMARKS
+             if not prefixes or any(name.startswith(prefix) for prefix in prefixes)]
+    if not names:
+        raise SystemExit(f"No benchmark matches {args.benchmarks}; "
+                         f"choose among {', '.join(BENCHMARKS)}")
+
+    results = []
+    for size in sizes:
+        for name in names:
+            sys.stderr.write(f"{name} at {size:,} records...\n")
+            results.append(run_in_child(name, size, args.seed))
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": FMS.np is not None,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            file.write(text)
+
+    print_table(results, sys.stderr)
+    if regressions:
+        sys.stderr.write(f"\n{len(regressions)} regression(s) of more than {args.tolerance:.0%} "
+                         f"against {args.baseline}:\n")
+        for result in regressions:
+            sys.stderr.write(f"  {result['benchmark']} at {result['size']:,}: {result['change']:+.1%}\n")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
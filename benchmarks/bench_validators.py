@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+Validation rule benchmark for LMS and FMS
+
+Checks N values per rule (200k by default, a mix of valid and invalid
+inputs) with every rule of the LMS ValidatorRegistry and of the FMS
+VALIDATION_RULES, and reports validations per second:
+  - raising: calling the clean function in a try/except, one value at a
+    time, as the bulk importer does to get the reason of each rejection
+  - single: is_valid() on one value at a time
+  - mask: one mask() / valid_mask() call for the whole list
+
+Usage: python benchmarks/bench_validators.py [--values N]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import FMS  # noqa: E402
+from LMS import VALIDATORS  # noqa: E402
+
+# A valid and an invalid example of every rule
+LMS_SAMPLES = {
+    "vehicle_type": ("Truck", "T1"),
+    "capacity": ("1500", "-20"),
+    "customer_name": ("John Smith", "John"),
+    "birthday": ("15-03-1990", "1990-03-15"),
+    "au_address": ("123 Smith Street, Surry Hills NSW 2000", "123 Smith Street, Sydney"),
+    "email": ("john.smith@email.com", "john.smith@email"),
+    "phone": ("0412 345 678", "1234 5678"),
+    "shipment_address": ("12 High St, Sydney, 2000", "12 High St Sydney 2000"),
+    "weight": ("25.5", "heavy"),
+}
+FMS_SAMPLES = {
+    "address": ("123 Main St, Seattle, 98101", "123 Main St"),
+    "weight": ("67.8", "abc5"),
+    "vehicle_code": ("VTRUCK1", "TRUCK1"),
+    "vehicle_type": ("Truck", "Truck 2"),
+    "capacity": ("5000", "0"),
+}
+
+
+def make_values(valid, invalid, count, rng):
+    """Return count values, about a quarter of them invalid."""
+    return [invalid if rng.random() < 0.25 else valid for _ in range(count)]
+
+
+def rate(function, values):
+    start = time.perf_counter()
+    function(values)
+    return len(values) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--values", type=int, default=200_000,
+                        help="values checked per rule (default: 200000)")
+    args = parser.parse_args()
+    rng = random.Random(42)
+    print(f"Values per rule: {args.values:,}\n")
+
+    print(f"{'Program':<8} {'Rule':<18} {'Raising/s':>12} {'Single/s':>12} {'Mask/s':>12}")
+    print("=" * 66)
+    for name, (valid, invalid) in LMS_SAMPLES.items():
+        values = make_values(valid, invalid, args.values, rng)
+        clean = VALIDATORS.rules[name][0]
+
+        def raising(values):
+            for value in values:
+                try:
+                    clean(value)
+                except ValueError:
+                    pass
+
+        def single(values):
+            for value in values:
+                VALIDATORS.is_valid(name, value)
+
+        print(f"{'LMS':<8} {name:<18} {rate(raising, values):>12,.0f} {rate(single, values):>12,.0f} "
+              f"{rate(lambda values: VALIDATORS.mask(name, values), values):>12,.0f}")
+
+    for name, (valid, invalid) in FMS_SAMPLES.items():
+        values = make_values(valid, invalid, args.values, rng)
+
+        def single(values):
+            for value in values:
+                FMS.is_valid(name, value)
+
+        print(f"{'FMS':<8} {name:<18} {'-':>12} {rate(single, values):>12,.0f} "
+              f"{rate(lambda values: FMS.valid_mask(name, values), values):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+"""
+Write-ahead log benchmark for the LMS DataStore
+
+Measures how many add/update/remove operations per second a persistent
+DataStore sustains with each fsync policy, next to the in-memory store, and
+how long it takes to recover the data when the store is opened again.
+
+Usage: python benchmarks/bench_wal.py [--operations N]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LMS import DataStore, Vehicle, FSYNC_POLICIES  # noqa: E402
+
+
+def run_workload(store, operations):
+    """Add vehicles, update half of them and remove a quarter; return elapsed seconds."""
+    start = time.perf_counter()
+    ids = [store.add(Vehicle(type="Truck", capacity=1000 + i)) for i in range(operations)]
+    for vehicle_id in ids[::2]:
+        vehicle = store.find(vehicle_id)
+        vehicle.status = "On Delivery"
+        store.update(vehicle_id, vehicle)
+    for vehicle_id in ids[::4]:
+        store.remove(vehicle_id)
+    store.close()
+    return time.perf_counter() - start, operations + len(ids[::2]) + len(ids[::4])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=20000,
+                        help="number of vehicles to add (default: 20000)")
+    parser.add_argument("--interval-ms", type=int, default=100,
+                        help="fsync interval for the interval policy (default: 100)")
+    args = parser.parse_args()
+
+    print(f"{'Policy':<12} {'Ops':>8} {'Seconds':>9} {'Ops/sec':>11} {'Recovery (s)':>13}")
+    print("=" * 57)
+
+    elapsed, total = run_workload(DataStore(), args.operations)
+    print(f"{'memory':<12} {total:>8} {elapsed:>9.3f} {total / elapsed:>11,.0f} {'-':>13}")
+
+    for policy in FSYNC_POLICIES:
+        directory = tempfile.mkdtemp(prefix="lms-wal-")
+        try:
+            path = os.path.join(directory, "vehicles.wal")
+            store = DataStore(path, fsync_policy=policy, fsync_interval_ms=args.interval_ms)
+            elapsed, total = run_workload(store, args.operations)
+
+            start = time.perf_counter()
+            recovered = DataStore(path, fsync_policy=policy)
+            recovery = time.perf_counter() - start
+            recovered.close()
+
+            print(f"{policy:<12} {total:>8} {elapsed:>9.3f} {total / elapsed:>11,.0f} {recovery:>13.3f}")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
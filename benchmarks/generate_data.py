@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+
+"""
+Synthetic data generator for LMS and FMS
+
+Makes any number of vehicles, customers and shipments that pass the
+validators of the programs, from a seed (the same seed and counts always
+give the same data):
+  - customers with Australian street addresses (optional unit, street type,
+    suburb, state and the postcode of that suburb), 04/02/03/07/08 phone
+    numbers written the ways the menus accept, unique emails and birthdays
+    of adults
+  - "street and number, suburb, zipcode" shipment addresses, taken from a
+    pool of places so that many shipments share a pickup or drop-off point
+  - vehicle fleets where vans and utes are common and semi-trailers rare,
+    each type with its own capacity range
+  - shipment weights with many small parcels and a few heavy loads
+
+Rows are streamed in batches, so memory does not grow with the counts. They
+go either to CSV or JSON lines files in the format of `LMS.py --import`
+(import vehicles, customers, then shipments into an empty data directory),
+or straight into the LMS stores through the LogisticsService, or into the
+FMS tables.
+
+Usage: python benchmarks/generate_data.py [--program lms|fms] [--to csv|jsonl|store]
+       [--vehicles N] [--customers N] [--shipments N] [--seed S]
+"""
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import calendar
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import FMS  # noqa: E402
+from LMS import (MainMenu, IdAllocator, ID_ALPHABET, FSYNC_ON_CLOSE,  # noqa: E402
+                 VALIDATORS)
+
+# Suburb, state and postcode of the places addresses are made in
+SUBURBS = (
+    ("Surry Hills", "NSW", "2010"), ("Parramatta", "NSW", "2150"), ("Bondi", "NSW", "2026"),
+    ("Newtown", "NSW", "2042"), ("Chatswood", "NSW", "2067"), ("Penrith", "NSW", "2750"),
+    ("Newcastle", "NSW", "2300"), ("Wollongong", "NSW", "2500"), ("Dubbo", "NSW", "2830"),
+    ("Fitzroy", "VIC", "3065"), ("Carlton", "VIC", "3053"), ("Richmond", "VIC", "3121"),
+    ("St Kilda", "VIC", "3182"), ("Geelong", "VIC", "3220"), ("Ballarat", "VIC", "3350"),
+    ("Dandenong", "VIC", "3175"), ("Fortitude Valley", "QLD", "4006"),
+    ("South Brisbane", "QLD", "4101"), ("Southport", "QLD", "4215"), ("Cairns", "QLD", "4870"),
+    ("Toowoomba", "QLD", "4350"), ("Townsville", "QLD", "4810"), ("Glenelg", "SA", "5045"),
+    ("Norwood", "SA", "5067"), ("Mount Gambier", "SA", "5290"), ("Fremantle", "WA", "6160"),
+    ("Subiaco", "WA", "6008"), ("Joondalup", "WA", "6027"), ("Bunbury", "WA", "6230"),
+    ("Sandy Bay", "TAS", "7005"), ("Launceston", "TAS", "7250"), ("Darwin City", "NT", "0800"),
+    ("Alice Springs", "NT", "0870"), ("Braddon", "ACT", "2612"), ("Belconnen", "ACT", "2617"),
+)
+STREET_NAMES = (
+    "Smith", "High", "Park", "Church", "Victoria", "George", "King", "Queen", "Elizabeth",
+    "Station", "Railway", "Bridge", "Hill", "Forest", "Beach", "Ocean", "Wattle", "Banksia",
+    "Acacia", "Kingsford", "Macquarie", "Hunter", "Collins", "Flinders", "Bourke", "Lygon",
+    "Chapel", "Brunswick", "Oxford", "Crown", "Harbour", "River", "Mountain View", "Sunset",
+    "Green Valley", "Old Northern",
+)
+STREET_TYPES = ("Street", "St", "Road", "Rd", "Avenue", "Ave", "Lane", "Drive", "Court",
+                "Place", "Parade", "Boulevard", "Terrace", "Way", "Highway", "Crescent",
+                "Circuit", "Close")
+FIRST_NAMES = (
+    "Oliver", "Charlotte", "Jack", "Amelia", "William", "Isla", "Noah", "Olivia", "Thomas",
+    "Mia", "James", "Ava", "Lucas", "Grace", "Henry", "Chloe", "Leo", "Zoe", "Ethan", "Ruby",
+    "Liam", "Sophie", "Mason", "Emily", "Harper", "Lachlan", "Matilda", "Cooper", "Evie", "Aria",
+)
+LAST_NAMES = (
+    "Smith", "Jones", "Williams", "Brown", "Wilson", "Taylor", "Johnson", "White", "Martin",
+    "Anderson", "Thompson", "Nguyen", "Thomas", "Walker", "Harris", "Lee", "Ryan", "Robinson",
+    "Kelly", "King", "Davis", "Wright", "Evans", "Roberts", "Green", "Hall", "Wood", "Jackson",
+    "Clarke", "Patel",
+)
+EMAIL_DOMAINS = ("gmail.com", "outlook.com", "bigpond.com", "yahoo.com.au", "icloud.com",
+                 "optusnet.com.au")
+# Landline area code of each state
+AREA_CODES = {"NSW": "02", "ACT": "02", "VIC": "03", "TAS": "03", "QLD": "07",
+              "SA": "08", "WA": "08", "NT": "08"}
+
+# Vehicle type, share of the fleet, lowest and highest capacity (kg) and the
+# step capacities are rounded to
+VEHICLE_TYPES = (
+    ("Van", 40, 800, 1500, 50),
+    ("Truck", 20, 3000, 12000, 500),
+    ("Ute", 15, 500, 1000, 50),
+    ("Car", 10, 200, 500, 50),
+    ("Semi Trailer", 5, 20000, 34000, 1000),
+    ("Motorbike", 10, 20, 50, 5),
+)
+
+# Columns of the files written for each kind of row
+COLUMNS = {
+    "vehicles": ("type", "capacity"),
+    "customers": ("name", "birthday", "address", "email", "phone"),
+    "shipments": ("customer_id", "origin", "destination", "weight", "vehicle_id"),
+    "fms_vehicles": ("code", "type", "capacity", "available"),
+    "fms_shipments": ("id", "origin", "destination", "weight", "vehicle", "status", "datetime"),
+}
+
+CHUNK = 10_000  # Rows made at a time
+
+
+class DataGenerator:
+    """Makes rows of valid, realistic data from a seed
+
+    Every kind of row has its own random generator seeded from the seed and
+    the kind, so the customers made with a seed are the same whatever the
+    number of shipments asked for. Each method yields tuples in the order of
+    COLUMNS[kind].
+    """
+
+    def __init__(self, seed=42, places=20_000):
+        self.seed = seed
+        self.places = self._place_pool(places)
+
+    def _random(self, kind):
+        return random.Random(f"{self.seed}-{kind}")
+
+    def _place_pool(self, count):
+        """Return count distinct "street and number, suburb, zipcode" addresses"""
+        rng = self._random("places")
+        pool = {}
+        while len(pool) < count:
+            suburb, _, postcode = rng.choice(SUBURBS)
+            street = f"{rng.randint(1, 999)} {rng.choice(STREET_NAMES)} {rng.choice(STREET_TYPES)}"
+            text = f"{street}, {suburb}, {postcode}"
+            pool[text] = None
+        return list(pool)
+
+    def vehicles(self, count):
+        """Yield (type, capacity) rows with the fleet mix of VEHICLE_TYPES"""
+        rng = self._random("vehicles")
+        shares = [share for _, share, _, _, _ in VEHICLE_TYPES]
+        for start in range(0, count, CHUNK):
+            for kind, _, low, high, step in rng.choices(VEHICLE_TYPES, shares,
+                                                        k=min(CHUNK, count - start)):
+                # Most vehicles sit in the lower half of the range of their type
+                capacity = rng.triangular(low, high, low + (high - low) / 3)
+                yield kind, str(max(step, round(capacity / step) * step))
+
+    def customers(self, count):
+        """Yield (name, birthday, address, email, phone) rows; the email of each one is unique"""
+        rng = self._random("customers")
+        for number in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            suburb, state, postcode = rng.choice(SUBURBS)
+            street = f"{rng.randint(1, 999)} {rng.choice(STREET_NAMES)} {rng.choice(STREET_TYPES)}"
+            if rng.random() < 0.2:
+                street = f"Unit {rng.randint(1, 40)}/{street}"
+            yield (f"{first} {last}",
+                   f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.randint(1940, 2000)}",
+                   f"{street}, {suburb} {state} {postcode}",
+                   f"{first}.{last}{number}@{rng.choice(EMAIL_DOMAINS)}".lower(),
+                   self._phone(rng, state))
+
+    @staticmethod
+    def _phone(rng, state):
+        digits = f"{rng.randrange(10 ** 8):08d}"
+        pick = rng.random()
+        if pick < 0.5:
+            return f"04{digits[:2]} {digits[2:5]} {digits[5:]}"
+        if pick < 0.7:
+            return f"+61 4{digits[:2]} {digits[2:5]} {digits[5:]}"
+        return f"({AREA_CODES[state]}) {digits[:4]} {digits[4:]}"
+
+    def shipments(self, count, customer_ids, vehicle_ids=()):
+        """Yield (customer_id, origin, destination, weight, vehicle_id) rows
+
+        Origins and destinations are picked from the pool of places. Shipments
+        are left without a vehicle unless vehicle_ids is given.
+        """
+        rng = self._random("shipments")
+        for start in range(0, count, CHUNK):
+            size = min(CHUNK, count - start)
+            vehicles = rng.choices(vehicle_ids, k=size) if vehicle_ids else itertools.repeat("", size)
+            yield from zip(rng.choices(customer_ids, k=size), rng.choices(self.places, k=size),
+                           rng.choices(self.places, k=size), self._weights(rng, size), vehicles)
+
+    @staticmethod
+    def _weights(rng, count):
+        # Log-normal: half the parcels are under 12 kg, a few weigh hundreds
+        return [str(round(min(max(rng.lognormvariate(2.5, 1.0), 0.1), 2000), 1))
+                for _ in range(count)]
+
+    def fms_vehicles(self, count):
+        """Yield (code, type, capacity, available) rows with unique V + 6 character codes"""
+        for number, (kind, capacity) in enumerate(self.vehicles(count)):
+            code = []
+            for _ in range(6):
+                number, remainder = divmod(number, 36)
+                code.append(ID_ALPHABET[remainder])
+            yield "V" + "".join(reversed(code)), kind, capacity, True
+
+    def fms_shipments(self, count, vehicle_codes, delivered=0.9):
+        """Yield (id, origin, destination, weight, vehicle, status, datetime) rows
+
+        A share of the shipments (delivered) is history that no longer takes
+        room on its vehicle. Creation times go forward from 2024-01-01.
+        """
+        rng = self._random("fms_shipments")
+        moment = calendar.timegm((2024, 1, 1, 0, 0, 0))
+        number = 10 ** 13  # Far from the IDs the program makes from hashes
+        for start in range(0, count, CHUNK):
+            size = min(CHUNK, count - start)
+            for origin, destination, weight, vehicle in zip(
+                    rng.choices(self.places, k=size), rng.choices(self.places, k=size),
+                    self._weights(rng, size), rng.choices(vehicle_codes, k=size)):
+                number += 1
+                moment += rng.randint(1, 60)
+                yield (f"A{number:014d}", origin, destination, weight, vehicle,
+                       "delivered" if rng.random() < delivered else "pending",
+                       time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(moment)))
+
+
+def batched(rows, size):
+    """Yield lists of up to size rows"""
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def write_rows(path, kind, rows):
+    """Write rows to a .csv or .jsonl file with the columns of kind; return the row count"""
+    columns = COLUMNS[kind]
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as target:
+        if path.endswith(".csv"):
+            writer = csv.writer(target)
+            writer.writerow(columns)
+            for batch in batched(rows, CHUNK):
+                writer.writerows(batch)
+                count += len(batch)
+        else:
+            for batch in batched(rows, CHUNK):
+                target.write("".join(json.dumps(dict(zip(columns, row))) + "\n" for row in batch))
+                count += len(batch)
+    return count
+
+
+def load_lms(service, generator, vehicles, customers, shipments, batch_size=10_000):
+    """Stream the rows into the stores through the service; yield (kind, rows, seconds)
+
+    Rows are checked by the service's build methods, as imported rows are.
+    """
+    start = time.perf_counter()
+    for batch in batched(generator.vehicles(vehicles), batch_size):
+        service.add_vehicles([service.build_vehicle(*row) for row in batch])
+    yield "vehicles", vehicles, time.perf_counter() - start
+
+    start = time.perf_counter()
+    customer_ids = []
+    for batch in batched(generator.customers(customers), batch_size):
+        customer_ids.extend(service.add_customers([service.build_customer(*row) for row in batch]))
+    yield "customers", customers, time.perf_counter() - start
+
+    start = time.perf_counter()
+    for batch in batched(generator.shipments(shipments, customer_ids), batch_size):
+        service.create_shipments([service.build_shipment(*row) for row in batch])
+    yield "shipments", shipments, time.perf_counter() - start
+
+
+def load_fms(generator, vehicles, shipments, batch_size=10_000):
+    """Stream the rows into the FMS tables; yield (kind, rows, seconds)"""
+    start = time.perf_counter()
+    codes = []
+    for code, kind, capacity, available in generator.fms_vehicles(vehicles):
+        FMS.vehicles.add({"code": code, "type": kind, "capacity": capacity, "available": available})
+        codes.append(code)
+    yield "fms_vehicles", vehicles, time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = COLUMNS["fms_shipments"]
+    for batch in batched(generator.fms_shipments(shipments, codes), batch_size):
+        status_codes = FMS.status_codes([row[0] for row in batch])
+        for row, status_code in zip(batch, status_codes):
+            record = dict(zip(columns, row))
+            record["status_code"] = status_code
+            FMS.shipments.add(record)
+    FMS.build_capacity_ledger()
+    yield "fms_shipments", shipments, time.perf_counter() - start
+
+
+def check_sample(generator, size=10_000):
+    """Return the LMS and FMS rules that rejected any value of a sample; an empty list when all pass"""
+    customers = list(generator.customers(size))
+    vehicles = list(generator.vehicles(size))
+    places = generator.places[:size]
+    weights = [row[3] for row in generator.shipments(size, ["C0000000"])]
+    checks = [
+        ("customer_name", [row[0] for row in customers]),
+        ("birthday", [row[1] for row in customers]),
+        ("au_address", [row[2] for row in customers]),
+        ("email", [row[3] for row in customers]),
+        ("phone", [row[4] for row in customers]),
+        ("vehicle_type", [row[0] for row in vehicles]),
+        ("capacity", [row[1] for row in vehicles]),
+        ("shipment_address", places),
+        ("weight", weights),
+    ]
+    failed = [f"LMS {rule}" for rule, values in checks if not all(VALIDATORS.mask(rule, values))]
+    fms_vehicles = list(generator.fms_vehicles(size))
+    fms_checks = [
+        ("address", places),
+        ("weight", weights),
+        ("vehicle_code", [row[0] for row in fms_vehicles]),
+        ("vehicle_type", [row[1] for row in fms_vehicles]),
+        ("capacity", [row[2] for row in fms_vehicles]),
+    ]
+    failed += [f"FMS {rule}" for rule, values in fms_checks if not all(FMS.valid_mask(rule, values))]
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--program", choices=("lms", "fms"), default="lms",
+                        help="program the data is for (default: lms)")
+    parser.add_argument("--to", choices=("csv", "jsonl", "store"), default="csv",
+                        help="write files, or load the stores of the program (default: csv)")
+    parser.add_argument("--vehicles", type=int, default=5_000, help="default: 5000")
+    parser.add_argument("--customers", type=int, default=50_000, help="default: 50000 (LMS only)")
+    parser.add_argument("--shipments", type=int, default=1_000_000, help="default: 1000000")
+    parser.add_argument("--places", type=int, default=20_000,
+                        help="distinct shipment addresses (default: 20000)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    parser.add_argument("--output-dir", default="generated",
+                        help="directory of the csv or jsonl files (default: generated)")
+    parser.add_argument("--data-dir",
+                        help="LMS data directory to load; the stores stay in memory without it")
+    parser.add_argument("--storage", choices=("wal", "sqlite"), default="wal",
+                        help="LMS storage of the data directory (default: wal)")
+    parser.add_argument("--shipment-file",
+                        help="FMS memory-mapped shipment file to load instead of memory")
+    parser.add_argument("--check", action="store_true",
+                        help="check a sample of every field with the validators first")
+    args = parser.parse_args()
+    if args.program == "lms" and args.customers < 1 and args.shipments:
+        parser.error("LMS shipments need at least one customer")
+    if args.program == "fms" and args.vehicles < 1 and args.shipments:
+        parser.error("FMS shipments need at least one vehicle")
+    generator = DataGenerator(args.seed, args.places)
+
+    if args.check:
+        failed = check_sample(generator)
+        if failed:
+            print("Rejected by the validators: " + ", ".join(failed))
+            sys.exit(1)
+        print("A sample of every field passes the validators\n")
+
+    if args.to == "store" and args.program == "lms":
+        menu = MainMenu(args.data_dir, fsync_policy=FSYNC_ON_CLOSE, storage=args.storage)
+        stores = (menu.vehicle_store, menu.customer_store, menu.shipment_store,
+                  menu.delivery_store)
+        # A snapshot every few thousand rows would rewrite the whole store each
+        # time; take a single one once everything is loaded
+        for store in stores:
+            store.snapshot_every = 0
+        try:
+            steps = list(load_lms(menu.service, generator, args.vehicles, args.customers,
+                                  args.shipments))
+            for store in stores:
+                store.compact()
+        finally:
+            menu.close()
+    elif args.to == "store":
+        if args.shipment_file:
+            FMS.use_shipment_file(args.shipment_file)
+        steps = list(load_fms(generator, args.vehicles, args.shipments))
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+        prefix = "" if args.program == "lms" else "fms_"
+        path = os.path.join(args.output_dir, "{}." + args.to)
+        steps = []
+
+        def write(kind, rows):
+            start = time.perf_counter()
+            count = write_rows(path.format(kind), kind, rows)
+            steps.append((kind, count, time.perf_counter() - start))
+
+        if args.program == "lms":
+            write("vehicles", generator.vehicles(args.vehicles))
+            write("customers", generator.customers(args.customers))
+            # The IDs the customers get when imported into an empty data directory
+            customer_ids = IdAllocator().allocate_block("C", args.customers)
+            write("shipments", generator.shipments(args.shipments, customer_ids))
+        else:
+            codes = [row[0] for row in generator.fms_vehicles(args.vehicles)]
+            write(prefix + "vehicles", generator.fms_vehicles(args.vehicles))
+            write(prefix + "shipments", generator.fms_shipments(args.shipments, codes))
+        print(f"Files written to {args.output_dir}\n")
+
+    print(f"{'Rows':<14} {'Count':>11} {'Seconds':>9} {'Rows/min':>13}")
+    print("=" * 50)
+    for kind, count, seconds in steps:
+        print(f"{kind:<14} {count:>11,} {seconds:>9.2f} {count / seconds * 60 if seconds else 0:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()